@@ -14,20 +14,28 @@ Usage:
 """
 
 import argparse
+import json
+import os
 import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
 
-from src.pipeline import GitHubToSocialPipeline, GitHubMockupPipeline, quick_mockup
-from src.mockup.composer import MockupComposer, PLATFORM_PRESETS
-from src.mockup.video_mockup import quick_video_mockup
-from src.analysis.project_analyzer import ProjectAnalyzer
-from src.analysis.color_extractor import (
-    resolve_colors, get_available_palettes, PRESET_PALETTES
-)
+from src.mockup.presets import PLATFORM_PRESETS
+
+
+def _pillow_build() -> str:
+    """Describe the active Pillow build (Pillow-SIMD speeds up resize/blur)."""
+    import PIL
+    from src.analysis.color_extractor import PILLOW_SIMD
+
+    return f"{'Pillow-SIMD' if PILLOW_SIMD else 'Pillow'} {PIL.__version__}"
 
 
 def cmd_screenshot(args):
     """Generate mockup from a single screenshot."""
+    from src.pipeline import quick_mockup
+    from src.analysis.color_extractor import resolve_colors
+
     if not Path(args.screenshot).exists():
         print(f"Error: Screenshot not found: {args.screenshot}")
         return 1
@@ -46,6 +54,7 @@ def cmd_screenshot(args):
     if args.platform:
         preset = PLATFORM_PRESETS.get(args.platform, {})
         print(f"Platform: {args.platform} ({preset.get('size', 'custom')})")
+    print(f"Imaging: {_pillow_build()}")
 
     output_path = quick_mockup(
         screenshot_path=args.screenshot,
@@ -62,6 +71,8 @@ def cmd_screenshot(args):
 
 def cmd_project(args):
     """Generate mockups from a project directory."""
+    from src.pipeline import GitHubToSocialPipeline
+
     if not Path(args.project).exists():
         print(f"Error: Project not found: {args.project}")
         return 1
@@ -88,6 +99,8 @@ def cmd_project(args):
 
 def cmd_analyze(args):
     """Analyze a project and show information."""
+    from src.analysis.project_analyzer import ProjectAnalyzer
+
     if not Path(args.project).exists():
         print(f"Error: Project not found: {args.project}")
         return 1
@@ -139,6 +152,8 @@ def cmd_styles(args):
 
 def cmd_colors(args):
     """Show available color palettes."""
+    from src.analysis.color_extractor import PRESET_PALETTES
+
     print("\nAvailable Color Palettes:")
     print("=" * 40)
     for name, colors in PRESET_PALETTES.items():
@@ -173,6 +188,9 @@ def cmd_platforms(args):
 
 def cmd_video(args):
     """Generate video mockup from a screen recording."""
+    from src.mockup.video_mockup import quick_video_mockup
+    from src.analysis.color_extractor import resolve_colors
+
     if not Path(args.video).exists():
         print(f"Error: Video not found: {args.video}")
         return 1
@@ -203,17 +221,66 @@ def cmd_video(args):
         return 1
 
 
+# Screenshot file types picked up by batch mode (matched case-insensitively)
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg')
+
+# Minimum batch size before mockups are rendered in worker processes
+BATCH_PARALLEL_MIN = 4
+
+
+def _batch_worker(screenshot_path, output_path, style, device, colors, platform):
+    """Render one batch mockup (module-level so worker processes can pickle it)."""
+    from src.pipeline import quick_mockup
+
+    return quick_mockup(
+        screenshot_path=screenshot_path,
+        output_path=output_path,
+        background_style=style,
+        device=device,
+        colors=colors,
+        platform=platform
+    )
+
+
+def _palette_sidecar(output_dir: Path, screenshot: Path) -> Path:
+    """Path of the palette JSON saved next to a screenshot's mockup."""
+    return output_dir / f"{screenshot.stem}.palette.json"
+
+
+def _read_palette_sidecar(output_dir: Path, screenshot: Path):
+    """Load a saved palette if it is newer than the screenshot, else None."""
+    sidecar = _palette_sidecar(output_dir, screenshot)
+    try:
+        if sidecar.stat().st_mtime_ns <= screenshot.stat().st_mtime_ns:
+            return None
+        return [tuple(color) for color in json.loads(sidecar.read_text())]
+    except (OSError, ValueError, TypeError):
+        return None
+
+
+def _write_palette_sidecar(output_dir: Path, screenshot: Path, colors) -> None:
+    """Save a screenshot's palette so style-only reruns skip extraction."""
+    try:
+        _palette_sidecar(output_dir, screenshot).write_text(json.dumps(colors))
+    except OSError:
+        pass
+
+
 def cmd_batch(args):
     """Generate mockups from all screenshots in a folder."""
+    from src.analysis.color_extractor import resolve_colors, batch_resolve_colors
+
     folder = Path(args.folder)
     if not folder.exists():
         print(f"Error: Folder not found: {args.folder}")
         return 1
 
-    # Find all images
-    screenshots = []
-    for ext in ['*.png', '*.jpg', '*.jpeg', '*.PNG', '*.JPG', '*.JPEG']:
-        screenshots.extend(folder.glob(ext))
+    # Find all images in a single directory pass
+    with os.scandir(folder) as entries:
+        screenshots = sorted(
+            Path(entry.path) for entry in entries
+            if entry.is_file() and entry.name.lower().endswith(IMAGE_EXTENSIONS)
+        )
 
     if not screenshots:
         print(f"No screenshots found in {args.folder}")
@@ -226,6 +293,7 @@ def cmd_batch(args):
     if args.platform:
         preset = PLATFORM_PRESETS.get(args.platform, {})
         print(f"Platform: {args.platform} ({preset.get('size', 'custom')})")
+    print(f"Imaging: {_pillow_build()}")
     print()
 
     output_dir = Path(args.output) if args.output else folder / "mockups"
@@ -236,23 +304,48 @@ def cmd_batch(args):
     if args.colors:
         base_colors = resolve_colors(color_arg=args.colors)
 
-    generated = []
-    for i, screenshot in enumerate(screenshots):
-        print(f"[{i+1}/{len(screenshots)}] Processing {screenshot.name}...")
+    # Use base colors if specified, otherwise extract from each screenshot
+    if base_colors:
+        palettes = [base_colors] * len(screenshots)
+    else:
+        # Reuse palettes saved next to earlier mockups unless --no-cache
+        palettes = [
+            None if args.no_cache else _read_palette_sidecar(output_dir, screenshot)
+            for screenshot in screenshots
+        ]
+        missing = [i for i, colors in enumerate(palettes) if colors is None]
+        if missing:
+            print("Extracting colors...")
+            extracted = batch_resolve_colors(
+                [screenshots[i] for i in missing],
+                use_cache=not args.no_cache
+            )
+            for i, colors in zip(missing, extracted):
+                palettes[i] = colors
+                _write_palette_sidecar(output_dir, screenshots[i], colors)
+
+    tasks = []
+    for screenshot, colors in zip(screenshots, palettes):
         output_path = output_dir / f"{screenshot.stem}_mockup.png"
-
-        # Use base colors if specified, otherwise extract from each screenshot
-        colors = base_colors if base_colors else resolve_colors(screenshot_path=str(screenshot))
-
-        result = quick_mockup(
-            screenshot_path=str(screenshot),
-            output_path=str(output_path),
-            background_style=args.style,
-            device=args.device,
-            colors=colors,
-            platform=args.platform
-        )
-        generated.append(result)
+        tasks.append((
+            str(screenshot), str(output_path),
+            args.style, args.device, colors, args.platform
+        ))
+
+    if len(tasks) < BATCH_PARALLEL_MIN:
+        # Small batches aren't worth the worker start-up cost
+        generated = []
+        for i, task in enumerate(tasks):
+            print(f"[{i+1}/{len(tasks)}] Processing {Path(task[0]).name}...")
+            generated.append(_batch_worker(*task))
+    else:
+        with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+            futures = [executor.submit(_batch_worker, *task) for task in tasks]
+            names = {future: Path(task[0]).name for future, task in zip(futures, tasks)}
+            for i, future in enumerate(as_completed(futures)):
+                future.result()
+                print(f"[{i+1}/{len(tasks)}] Finished {names[future]}")
+            generated = [future.result() for future in futures]
 
     print(f"\nGenerated {len(generated)} mockups in {output_dir}")
     for path in generated:
@@ -263,6 +356,8 @@ def cmd_batch(args):
 
 def cmd_github(args):
     """Full pipeline: Clone GitHub repo → Build → Capture → Generate mockups."""
+    from src.pipeline import GitHubMockupPipeline
+
     print(f"\nGitHub to Mockup Pipeline")
     print(f"Repository: {args.repo}")
     print(f"Style: {args.style}")
@@ -441,6 +536,11 @@ def main():
         choices=["twitter", "twitter4", "instagram", "square", "story", "wide"],
         help="Platform preset for optimal sizing (twitter, twitter4, instagram, etc.)"
     )
+    batch_parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Re-extract colors instead of reusing saved palettes"
+    )
     batch_parser.set_defaults(func=cmd_batch)
 
     # GitHub command (full pipeline)
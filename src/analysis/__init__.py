@@ -1,4 +1,16 @@
-from .color_extractor import ColorExtractor
-from .project_analyzer import ProjectAnalyzer
+from importlib import import_module
 
 __all__ = ['ColorExtractor', 'ProjectAnalyzer']
+
+# Exports are imported on first access, so loading one submodule
+# (e.g. project_analyzer) doesn't drag in NumPy and the color extractor
+_EXPORTS = {
+    'ColorExtractor': '.color_extractor',
+    'ProjectAnalyzer': '.project_analyzer',
+}
+
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        return getattr(import_module(_EXPORTS[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -3,13 +3,60 @@ Color extraction from screenshots and app assets.
 Pulls dominant colors to generate matching backgrounds.
 """
 
-from PIL import Image
-from colorthief import ColorThief
+import PIL
+from PIL import Image, UnidentifiedImageError
 from typing import List, Tuple, Optional
 from pathlib import Path
-import colorsys
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import functools
+import hashlib
 import io
+import json
+import os
 import re
+import struct
+
+try:
+    import numba
+except ImportError:  # Optional: JIT kernel for nearest-center assignment
+    numba = None
+
+
+# Pixel budget for palette clustering
+SAMPLE_SIZE = 10000
+THUMBNAIL_SIZE = (256, 256)
+# JPEG decode target; draft() decodes at the smallest DCT scale covering this
+DRAFT_SIZE = (512, 512)
+ICON_DRAFT_SIZE = (128, 128)
+KMEANS_ITERATIONS = 20
+ASSIGN_TILE = 100000
+# Pixels left out of clustering, as ColorThief did: alpha below
+# ALPHA_THRESHOLD, or every channel above WHITE_THRESHOLD
+ALPHA_THRESHOLD = 125
+WHITE_THRESHOLD = 250
+
+# On-disk palette cache, keyed by file content hash.
+# Bump RULE_VERSION whenever the extraction algorithm changes.
+PALETTE_CACHE_PATH = Path.home() / ".cache" / "screenshot-to-ios-mockup" / "palettes.json"
+RULE_VERSION = "4"
+# Most recently stored palettes kept on disk; older ones are dropped on flush
+PALETTE_CACHE_MAX_ENTRIES = 1000
+_palette_cache = None
+# Palettes stored by this process since the last flush, oldest first
+_palette_cache_new = {}
+
+# Errors that mean an image file is missing, unreadable, or not an image
+IMAGE_ERRORS = (OSError, EOFError, ValueError, UnidentifiedImageError, Image.DecompressionBombError)
+
+
+def _check_pillow_simd() -> bool:
+    """Pillow-SIMD publishes versions like '9.0.0.post1'; stock Pillow doesn't."""
+    return ".post" in PIL.__version__
+
+
+# Pillow-SIMD speeds up decode/resize, which dominates palette extraction
+PILLOW_SIMD = _check_pillow_simd()
 
 
 # Preset color palettes
@@ -76,19 +123,24 @@ PRESET_PALETTES = {
     ],
 }
 
+# Freeze presets so callers can't mutate the shared palettes,
+# and index them by lowercase name for direct lookup
+PRESET_PALETTES = {name: tuple(colors) for name, colors in PRESET_PALETTES.items()}
+_LC_PRESETS = {name.lower(): colors for name, colors in PRESET_PALETTES.items()}
+
+
+HEX_COLOR_PATTERN = re.compile(r'^[0-9a-fA-F]{6}$')
+
 
 def parse_hex_color(hex_str: str) -> Tuple[int, int, int]:
     """Parse a hex color string to RGB tuple."""
     hex_str = hex_str.strip().lstrip('#')
     if len(hex_str) == 3:
-        hex_str = ''.join([c * 2 for c in hex_str])
-    if len(hex_str) != 6:
+        hex_str = hex_str[0] * 2 + hex_str[1] * 2 + hex_str[2] * 2
+    if not HEX_COLOR_PATTERN.match(hex_str):
         raise ValueError(f"Invalid hex color: {hex_str}")
-    return (
-        int(hex_str[0:2], 16),
-        int(hex_str[2:4], 16),
-        int(hex_str[4:6], 16)
-    )
+    r, g, b = bytes.fromhex(hex_str)
+    return (r, g, b)
 
 
 def parse_color_string(color_str: str) -> List[Tuple[int, int, int]]:
@@ -96,8 +148,9 @@ def parse_color_string(color_str: str) -> List[Tuple[int, int, int]]:
     color_str = color_str.strip().lower()
 
     # Check if it's a preset palette name
-    if color_str in PRESET_PALETTES:
-        return PRESET_PALETTES[color_str]
+    preset = _LC_PRESETS.get(color_str)
+    if preset:
+        return list(preset)
 
     # Otherwise parse as comma-separated hex codes
     colors = []
@@ -106,7 +159,7 @@ def parse_color_string(color_str: str) -> List[Tuple[int, int, int]]:
         if part:
             colors.append(parse_hex_color(part))
 
-    return colors if colors else PRESET_PALETTES["vibrant"]
+    return colors if colors else list(PRESET_PALETTES["vibrant"])
 
 
 def get_available_palettes() -> List[str]:
@@ -147,13 +200,16 @@ def resolve_colors(
     # 3. Try screenshot colors
     if screenshot_path:
         try:
-            extractor = ColorExtractor(image_path=screenshot_path)
-            return extractor.get_complementary_colors()
-        except:
-            pass
+            st = os.stat(screenshot_path)
+        except OSError:
+            st = None
+        if st is not None:
+            colors = _resolve_from_screenshot(screenshot_path, st.st_mtime_ns, st.st_size)
+            if colors:
+                return list(colors)
 
     # 4. Default fallback
-    return PRESET_PALETTES["vibrant"]
+    return list(PRESET_PALETTES["vibrant"])
 
 
 def extract_colors_from_app_icon(project_path: str) -> Optional[List[Tuple[int, int, int]]]:
@@ -180,23 +236,182 @@ def extract_colors_from_app_icon(project_path: str) -> Optional[List[Tuple[int,
         for path in project.glob(pattern):
             if path.is_file():
                 try:
-                    img = Image.open(path)
-                    size = img.size[0] * img.size[1]
+                    width, height = _probe_image_size(path)
+                    size = width * height
                     # Prefer larger icons for better color extraction
                     if size > largest_size:
                         largest_size = size
                         icon_path = path
-                except:
+                except IMAGE_ERRORS:
                     continue
 
     if not icon_path:
         return None
 
     try:
-        extractor = ColorExtractor(image_path=str(icon_path))
-        return extractor.get_palette(4)
-    except:
+        # Read the winning icon once; the same bytes feed the hash and the decode
+        data = icon_path.read_bytes()
+        key = _palette_cache_key_for_bytes(data, "palette", 4)
+        colors = _palette_cache_get(key)
+        if colors:
+            return colors
+        icon = Image.open(io.BytesIO(data))
+        icon.draft('RGB', ICON_DRAFT_SIZE)  # Speeds up JPEG icons; no-op for PNG
+        icon.load()
+        extractor = ColorExtractor(image=icon)
+        colors = extractor.get_palette(4)
+        _palette_cache_put(key, colors)
+        return colors
+    except IMAGE_ERRORS:
+        return None
+
+
+@functools.lru_cache(maxsize=256)
+def _resolve_from_screenshot(path: str, mtime_ns: int, size: int) -> Optional[Tuple[Tuple[int, int, int], ...]]:
+    """
+    Complementary colors for a screenshot, memoized per (path, mtime_ns, size)
+    so edited files are re-extracted.
+    Unreadable files memoize as None so they aren't decoded again.
+    """
+    try:
+        key = _palette_cache_key(path, "complementary", 4)
+        colors = _palette_cache_get(key)
+        if not colors:
+            colors = ColorExtractor(image_path=path).get_complementary_colors()
+            _palette_cache_put(key, colors)
+        return tuple(colors)
+    except IMAGE_ERRORS:
+        return None
+
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+
+def _probe_image_size(path: Path) -> Tuple[int, int]:
+    """
+    Read image dimensions without decoding.
+    PNGs are read straight from the IHDR chunk (first 24 bytes); anything
+    else falls back to Pillow's lazy header parse.
+    """
+    with open(path, 'rb') as f:
+        header = f.read(24)
+    if len(header) == 24 and header[:8] == PNG_SIGNATURE and header[12:16] == b"IHDR":
+        return struct.unpack(">II", header[16:24])
+    with Image.open(path) as img:
+        return img.size
+
+
+def _palette_cache_key(path: str, kind: str, color_count: int) -> str:
+    """Build a cache key from the file's content hash and extraction settings."""
+    return _palette_cache_key_for_bytes(Path(path).read_bytes(), kind, color_count)
+
+
+def _palette_cache_key_for_bytes(data: bytes, kind: str, color_count: int) -> str:
+    """Build a cache key from already-read file contents."""
+    digest = hashlib.sha256(data).hexdigest()
+    return f"{RULE_VERSION}:{kind}:{color_count}:{digest}"
+
+
+def _read_palette_cache_file() -> dict:
+    """Read the on-disk palette cache, or an empty one if missing or corrupt."""
+    try:
+        cache = json.loads(PALETTE_CACHE_PATH.read_text())
+    except (OSError, ValueError):
+        return {}
+    return cache if isinstance(cache, dict) else {}
+
+
+def _load_palette_cache() -> dict:
+    """Load the on-disk palette cache once per process."""
+    global _palette_cache
+    if _palette_cache is None:
+        _palette_cache = _read_palette_cache_file()
+    return _palette_cache
+
+
+def _palette_cache_get(key: str) -> Optional[List[Tuple[int, int, int]]]:
+    """Look up a cached palette."""
+    colors = _load_palette_cache().get(key)
+    if not colors:
         return None
+    return [tuple(color) for color in colors]
+
+
+def _palette_cache_put(key: str, colors: List[Tuple[int, int, int]], flush: bool = True) -> None:
+    """Store a palette and (unless batching) write the cache back to disk."""
+    value = [list(color) for color in colors]
+    _load_palette_cache()[key] = value
+    _palette_cache_new.pop(key, None)
+    _palette_cache_new[key] = value
+    if flush:
+        _palette_cache_flush()
+
+
+def _palette_cache_flush() -> None:
+    """
+    Merge the palettes stored since the last flush into the cache on disk.
+    The file is re-read first so palettes other processes stored meanwhile
+    (e.g. parallel render workers) aren't dropped. Entries are kept oldest
+    first and only the newest PALETTE_CACHE_MAX_ENTRIES are written.
+    """
+    global _palette_cache
+    cache = _read_palette_cache_file()
+    for key, value in _palette_cache_new.items():
+        cache.pop(key, None)
+        cache[key] = value
+    _palette_cache_new.clear()
+    if len(cache) > PALETTE_CACHE_MAX_ENTRIES:
+        cache = dict(list(cache.items())[-PALETTE_CACHE_MAX_ENTRIES:])
+    _palette_cache = cache
+    try:
+        PALETTE_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        # Write then rename so concurrent runs never see a partial file
+        tmp_path = PALETTE_CACHE_PATH.with_suffix(f".{os.getpid()}.tmp")
+        tmp_path.write_text(json.dumps(cache))
+        os.replace(tmp_path, PALETTE_CACHE_PATH)
+    except OSError:
+        pass
+
+
+def batch_resolve_colors(paths: List[str],
+                         use_cache: bool = True) -> List[List[Tuple[int, int, int]]]:
+    """
+    Resolve screenshot colors for many files at once.
+
+    Hashing, decoding and downsampling run in a thread pool (Pillow and
+    hashlib release the GIL for those), clustering runs on the calling
+    thread, and the palette cache is written once at the end. Unreadable
+    files fall back to the "vibrant" preset, like resolve_colors.
+    With use_cache=False every file is re-extracted (results are still stored).
+
+    Returns one palette per path, in order.
+    """
+    paths = [str(path) for path in paths]
+    _load_palette_cache()
+
+    def prepare(path: str):
+        key = _palette_cache_key(path, "complementary", 4)
+        cached = _palette_cache_get(key) if use_cache else None
+        if cached:
+            return key, cached, None
+        extractor = ColorExtractor(image_path=path)
+        extractor._load_pixels()
+        return key, None, extractor
+
+    results = []
+    with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+        for future in [executor.submit(prepare, path) for path in paths]:
+            try:
+                key, colors, extractor = future.result()
+                if extractor is not None:
+                    colors = extractor.get_complementary_colors()
+                    _palette_cache_put(key, colors, flush=False)
+            except IMAGE_ERRORS:
+                colors = list(PRESET_PALETTES["vibrant"])
+            results.append(colors)
+
+    _palette_cache_flush()
+    return results
 
 
 class ColorExtractor:
@@ -207,48 +422,56 @@ class ColorExtractor:
         self.image = image
         self._dominant_color = None
         self._palette = None
+        self._pixels = None
+        self._unique = None
     
     def get_dominant_color(self) -> Tuple[int, int, int]:
         """Get the single most dominant color."""
         if self._dominant_color:
             return self._dominant_color
         
-        ct = self._get_color_thief()
-        self._dominant_color = ct.get_color(quality=1)
+        # Largest of a handful of clusters, as ColorThief did
+        self._dominant_color = self.get_palette(5)[0]
         return self._dominant_color
     
     def get_palette(self, color_count: int = 6) -> List[Tuple[int, int, int]]:
-        """Get a palette of dominant colors."""
+        """Get a palette of dominant colors, most common first."""
         if self._palette and len(self._palette) >= color_count:
             return self._palette[:color_count]
         
-        ct = self._get_color_thief()
-        self._palette = ct.get_palette(color_count=color_count, quality=1)
+        pixels = self._load_pixels()
+        sample = pixels
+        if len(pixels) > SAMPLE_SIZE:
+            rng = np.random.default_rng(0)
+            sample = pixels[rng.integers(0, len(pixels), SAMPLE_SIZE)]
+        
+        # Cluster distinct colors, weighted by how often each occurs
+        colors, weights = _unique_colors(sample)
+        centers, _ = _kmeans(colors.astype(np.float32), color_count, weights=weights)
+        
+        # Weight clusters by every pixel, not just the sample
+        counts = self._assign_full(centers)
+        order = np.argsort(-counts, kind='stable')
+        self._palette = [
+            tuple(int(v) for v in center)
+            for center in centers[order].round().clip(0, 255)
+        ]
         return self._palette
     
     def get_complementary_colors(self) -> List[Tuple[int, int, int]]:
         """Generate complementary colors for backgrounds."""
         palette = self.get_palette(4)
-        complementary = []
         
-        for color in palette:
-            # Convert to HSV
-            r, g, b = [x / 255.0 for x in color]
-            h, s, v = colorsys.rgb_to_hsv(r, g, b)
-            
-            # Create lighter, desaturated version for backgrounds
-            # Reduce saturation, increase value for softer look
-            new_s = max(0.1, s * 0.4)
-            new_v = min(1.0, v * 1.3 + 0.2)
-            
-            new_r, new_g, new_b = colorsys.hsv_to_rgb(h, new_s, new_v)
-            complementary.append((
-                int(new_r * 255),
-                int(new_g * 255),
-                int(new_b * 255)
-            ))
+        # Convert the whole palette to HSV at once
+        hsv = _rgb_to_hsv(np.asarray(palette, dtype=np.float64) / 255.0)
+        
+        # Create lighter, desaturated version for backgrounds
+        # Reduce saturation, increase value for softer look
+        hsv[:, 1] = np.maximum(0.1, hsv[:, 1] * 0.4)
+        hsv[:, 2] = np.minimum(1.0, hsv[:, 2] * 1.3 + 0.2)
         
-        return complementary
+        rgb = (_hsv_to_rgb(hsv) * 255).astype(np.int64)
+        return [tuple(int(v) for v in color) for color in rgb]
     
     def get_background_gradient_colors(self) -> Tuple[Tuple[int, int, int], Tuple[int, int, int]]:
         """Get two colors suitable for a gradient background."""
@@ -274,15 +497,195 @@ class ColorExtractor:
             int(b + (255 - b) * factor)
         )
     
-    def _get_color_thief(self) -> ColorThief:
-        """Get ColorThief instance from path or image."""
+    def _assign_full(self, centers: np.ndarray) -> np.ndarray:
+        """Count how many loaded pixels fall nearest to each center."""
+        if self._unique is None:
+            self._unique = _unique_colors(self._load_pixels())
+        colors, weights = self._unique
+        
+        labels = _nearest_center(colors, centers.round().astype(np.int32))
+        return np.bincount(labels, weights=weights, minlength=len(centers))
+    
+    def _load_pixels(self) -> np.ndarray:
+        """Load the image as a downsampled Nx3 uint8 pixel array."""
+        if self._pixels is not None:
+            return self._pixels
+        
         if self.image_path:
-            return ColorThief(self.image_path)
+            img = Image.open(self.image_path)
+            # JPEGs can decode straight to a reduced size; no-op for PNG
+            img.draft('RGB', DRAFT_SIZE)
         elif self.image:
-            # Save image to bytes buffer for ColorThief
-            buffer = io.BytesIO()
-            self.image.save(buffer, format='PNG')
-            buffer.seek(0)
-            return ColorThief(buffer)
+            img = self.image
         else:
             raise ValueError("Either image_path or image must be provided")
+        
+        # Palette modes only resample with NEAREST, so expand those first,
+        # keeping any transparency for the filter below
+        if img.mode not in ('RGB', 'RGBA'):
+            has_alpha = 'A' in img.getbands() or 'transparency' in img.info
+            img = img.convert('RGBA' if has_alpha else 'RGB')
+        
+        # Downsample before building the array so a full-resolution copy is
+        # never made (resize leaves the caller's image untouched)
+        scale = min(1.0, THUMBNAIL_SIZE[0] / img.width, THUMBNAIL_SIZE[1] / img.height)
+        if scale < 1.0:
+            size = (max(1, round(img.width * scale)), max(1, round(img.height * scale)))
+            img = img.resize(size, Image.Resampling.BILINEAR)
+        
+        pixels = np.asarray(img, dtype=np.uint8).reshape(-1, len(img.getbands()))
+        
+        # Skip mostly transparent and near-white pixels, as ColorThief did;
+        # if that leaves nothing, use every pixel
+        keep = ~(pixels[:, :3] > WHITE_THRESHOLD).all(axis=1)
+        if pixels.shape[1] == 4:
+            keep &= pixels[:, 3] >= ALPHA_THRESHOLD
+        rgb = pixels[:, :3]
+        if keep.any():
+            rgb = rgb[keep]
+        
+        self._pixels = np.ascontiguousarray(rgb)
+        return self._pixels
+
+
+def _rgb_to_hsv(rgb: np.ndarray) -> np.ndarray:
+    """Vectorized colorsys.rgb_to_hsv over an Nx3 array of floats in [0, 1]."""
+    r, g, b = rgb[:, 0], rgb[:, 1], rgb[:, 2]
+    maxc = rgb.max(axis=1)
+    minc = rgb.min(axis=1)
+    delta = maxc - minc
+    gray = delta == 0
+    
+    with np.errstate(divide='ignore', invalid='ignore'):
+        s = np.where(maxc > 0, delta / maxc, 0.0)
+        rc = (maxc - r) / delta
+        gc = (maxc - g) / delta
+        bc = (maxc - b) / delta
+    
+    h = np.where(r == maxc, bc - gc, np.where(g == maxc, 2.0 + rc - bc, 4.0 + gc - rc))
+    h = np.where(gray, 0.0, (h / 6.0) % 1.0)
+    s = np.where(gray, 0.0, s)
+    return np.stack([h, s, maxc], axis=1)
+
+
+def _hsv_to_rgb(hsv: np.ndarray) -> np.ndarray:
+    """Vectorized colorsys.hsv_to_rgb over an Nx3 array of floats in [0, 1]."""
+    h, s, v = hsv[:, 0], hsv[:, 1], hsv[:, 2]
+    i = (h * 6.0).astype(np.int64)
+    f = h * 6.0 - i
+    p = v * (1.0 - s)
+    q = v * (1.0 - s * f)
+    t = v * (1.0 - s * (1.0 - f))
+    i = i % 6
+    
+    # (r, g, b) for each of the six hue sectors
+    sectors = [(v, t, p), (q, v, p), (p, v, t), (p, q, v), (t, p, v), (v, p, q)]
+    conditions = [i == n for n in range(6)]
+    rgb = np.stack([
+        np.select(conditions, [sector[c] for sector in sectors])
+        for c in range(3)
+    ], axis=1)
+    return np.where((s == 0)[:, None], v[:, None], rgb)
+
+
+def _unique_colors(pixels: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Collapse an Nx3 uint8 pixel array to its distinct colors and their counts."""
+    packed = (
+        (pixels[:, 0].astype(np.uint32) << 16)
+        | (pixels[:, 1].astype(np.uint32) << 8)
+        | pixels[:, 2]
+    )
+    uniq, counts = np.unique(packed, return_counts=True)
+    colors = np.stack([(uniq >> 16) & 0xFF, (uniq >> 8) & 0xFF, uniq & 0xFF], axis=1)
+    return colors.astype(np.uint8), counts
+
+
+def _nearest_center(colors: np.ndarray, centers: np.ndarray) -> np.ndarray:
+    """Label each color with its nearest center, in bounded tiles."""
+    if numba is not None:
+        return _nearest_center_jit(colors.astype(np.int32), centers.astype(np.int32))
+    
+    labels = np.empty(len(colors), dtype=np.intp)
+    
+    for start in range(0, len(colors), ASSIGN_TILE):
+        tile = colors[start:start + ASSIGN_TILE].astype(np.int32)
+        d2 = ((tile[:, None, :] - centers[None, :, :]) ** 2).sum(axis=2)
+        labels[start:start + ASSIGN_TILE] = d2.argmin(axis=1)
+    
+    return labels
+
+
+if numba is not None:
+    # Serial on purpose: numba's parallel threading layers (TBB in particular)
+    # can hang at exit once cmd_batch has forked its worker processes
+    @numba.njit(fastmath=True, cache=True)
+    def _nearest_center_jit(colors, centers):
+        """Compiled nearest-center search, one pixel per iteration."""
+        n = colors.shape[0]
+        k = centers.shape[0]
+        labels = np.empty(n, np.intp)
+        for i in range(n):
+            best = 0
+            best_d = 1 << 30
+            for j in range(k):
+                dr = colors[i, 0] - centers[j, 0]
+                dg = colors[i, 1] - centers[j, 1]
+                db = colors[i, 2] - centers[j, 2]
+                d = dr * dr + dg * dg + db * db
+                if d < best_d:
+                    best_d = d
+                    best = j
+            labels[i] = best
+        return labels
+
+
+def _kmeans(samples: np.ndarray,
+            k: int,
+            weights: np.ndarray = None,
+            iterations: int = KMEANS_ITERATIONS,
+            seed: int = 0) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Cluster Nx3 float32 samples with k-means++ seeding and Lloyd iterations.
+    Optional per-sample weights let deduplicated colors stand in for the
+    pixels they represent.
+
+    Returns (centers, labels). Fewer than k centers come back when the
+    samples hold fewer than k distinct colors.
+    """
+    rng = np.random.default_rng(seed)
+    if weights is None:
+        weights = np.ones(len(samples))
+    weights = weights.astype(np.float64)
+    
+    # k-means++ seeding
+    first = rng.choice(len(samples), p=weights / weights.sum())
+    centers = [samples[first]]
+    d2 = ((samples - samples[first]) ** 2).sum(axis=1)
+    for _ in range(1, k):
+        score = d2 * weights
+        total = score.sum()
+        if total <= 0:
+            break
+        idx = rng.choice(len(samples), p=score / total)
+        centers.append(samples[idx])
+        d2 = np.minimum(d2, ((samples - samples[idx]) ** 2).sum(axis=1))
+    centers = np.array(centers, dtype=np.float32)
+    
+    for _ in range(iterations):
+        labels = ((samples[:, None, :] - centers[None, :, :]) ** 2).sum(axis=2).argmin(axis=1)
+        counts = np.bincount(labels, weights=weights, minlength=len(centers))
+        sums = np.stack([
+            np.bincount(labels, weights=samples[:, c] * weights, minlength=len(centers))
+            for c in range(3)
+        ], axis=1)
+        # Empty clusters keep their previous position
+        filled = counts > 0
+        updated = centers.copy()
+        updated[filled] = sums[filled] / counts[filled, None]
+        if np.allclose(updated, centers, atol=0.5):
+            centers = updated
+            break
+        centers = updated
+    
+    labels = ((samples[:, None, :] - centers[None, :, :]) ** 2).sum(axis=2).argmin(axis=1)
+    return centers, labels
@@ -5,10 +5,68 @@ about what to screenshot and how to present it.
 
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from collections import Counter
+import fnmatch
+import functools
+import itertools
 import json
+import mmap
+import os
 import re
 
+try:
+    import orjson
+except ImportError:  # Optional: faster parsing of package.json / asset catalogs
+    orjson = None
+
+
+# Directories that never decide anything about a project but can hold
+# huge numbers of files; scans don't descend into them (nor into any
+# hidden directory)
+EXCLUDE_DIRS = frozenset({
+    'node_modules', '.git', 'build', 'Pods', 'DerivedData',
+    '.venv', 'venv', '__pycache__',
+})
+
+# README "Features" section heading and its bullet points
+FEATURES_HEADING_RE = re.compile(r'\s*#+\s*Features?\s*$', re.IGNORECASE)
+BULLET_RE = re.compile(r'\s*[-*]\s*(.+)')
+
+# Quoted six-digit hex colors in web configs (bytes, so files can be mmap'd)
+HEX_COLOR_RE = re.compile(rb'["\']#([0-9a-fA-F]{6})["\']')
+
+# Extensions (lowercase, no dot) that count as screenshots
+IMAGE_EXTENSIONS = frozenset({'png', 'jpg', 'jpeg', 'webp', 'gif'})
+
+
+def _has_image_extension(name: str) -> bool:
+    """Check a file name against IMAGE_EXTENSIONS (dotfiles have no extension)."""
+    stem, dot, ext = name.rpartition('.')
+    return bool(dot and stem) and ext.lower() in IMAGE_EXTENSIONS
+
+
+def _dir_has_image(path: str) -> bool:
+    """Return True on the first image file in a directory, False if it has none or is missing."""
+    try:
+        with os.scandir(path) as it:
+            return any(e.is_file() and _has_image_extension(e.name) for e in it)
+    except OSError:
+        return False
+
+
+def _load_json_bytes(path) -> object:
+    """Parse a JSON file from its raw bytes, skipping a separate text decode."""
+    with open(path, 'rb') as f:
+        data = f.read()
+    return orjson.loads(data) if orjson else json.loads(data)
+
+
+@functools.lru_cache(maxsize=None)
+def _load_json_cached(path_str: str, mtime_ns: int):
+    """Parse a JSON file once per (path, mtime). Callers must not mutate the result."""
+    return _load_json_bytes(path_str)
+
 
 @dataclass
 class ProjectInfo:
@@ -24,6 +82,17 @@ class ProjectInfo:
     recent_changes: List[str]
 
 
+@dataclass
+class ScanResult:
+    """Everything the local analysis needs from one walk of the project tree."""
+    indicator_hits: Dict[str, List[str]] = field(default_factory=dict)  # type -> relpaths
+    ext_counts: Counter = field(default_factory=Counter)  # lowercase extension, no dot
+    screenshot_dirs: List[Path] = field(default_factory=list)  # SCREENSHOT_PATHS order
+    color_files: List[Path] = field(default_factory=list)
+    readme: Optional[Path] = None
+    package_json: Optional[Path] = None
+
+
 class ProjectAnalyzer:
     """
     Analyzes projects to understand what they are and how to present them.
@@ -49,6 +118,13 @@ class ProjectAnalyzer:
         ],
     }
     
+    # All indicator patterns as one regex with a named group per project type;
+    # match.lastgroup names the type, alternatives are tried in dict order
+    _INDICATOR_UNION_RE = re.compile('|'.join(
+        '(?P<%s>%s)' % (project_type, '|'.join(fnmatch.translate(p) for p in patterns))
+        for project_type, patterns in PROJECT_INDICATORS.items()
+    ))
+    
     # Common screenshot locations
     SCREENSHOT_PATHS = [
         'screenshots', 'Screenshots', 'assets/screenshots',
@@ -56,20 +132,40 @@ class ProjectAnalyzer:
         'fastlane/screenshots', 'metadata/screenshots'
     ]
     
+    # SCREENSHOT_PATHS in the form the scan compares against (os.sep separators)
+    _SCREENSHOT_RELPATHS = tuple(os.path.normpath(p) for p in SCREENSHOT_PATHS)
+    _SCREENSHOT_RELPATH_SET = frozenset(_SCREENSHOT_RELPATHS)
+    
     # Color extraction from common config files
     COLOR_SOURCES = {
         'ios': ['Assets.xcassets/*/Contents.json', '*.xcassets/AccentColor.colorset/Contents.json'],
         'web': ['tailwind.config.js', 'tailwind.config.ts', 'theme.json', 'styles/variables.css'],
     }
     
+    # Files the scan picks up at the project root
+    README_NAMES = ['README.md', 'README.txt', 'README']
+    TAILWIND_CONFIGS = ['tailwind.config.js', 'tailwind.config.ts']
+    
     def __init__(self, project_path: str = None, github_repo: str = None):
         self.project_path = Path(project_path) if project_path else None
         self.github_repo = github_repo  # format: "owner/repo"
+        self._scan_result = None
+        self._info = None
+        self._info_mtime = None
     
     def analyze(self) -> ProjectInfo:
         """Analyze the project and return structured information."""
         if self.project_path:
-            return self._analyze_local()
+            # Reuse the previous result while the project root is unchanged
+            try:
+                mtime = self.project_path.stat().st_mtime_ns
+            except OSError:
+                mtime = None
+            if self._info is None or mtime is None or mtime != self._info_mtime:
+                self._scan_result = None
+                self._info = self._analyze_local()
+                self._info_mtime = mtime
+            return self._info
         elif self.github_repo:
             return self._analyze_github()
         else:
@@ -118,14 +214,100 @@ class ProjectAnalyzer:
         if not self.project_path:
             return "unknown"
         
-        for project_type, patterns in self.PROJECT_INDICATORS.items():
-            for pattern in patterns:
-                matches = list(self.project_path.glob(f"**/{pattern}"))
-                if matches:
-                    return project_type
+        # Cheap check first: when the root alone shows the highest-priority
+        # type, nothing deeper in the tree can change the answer
+        if self._scan_result is None:
+            top_type = next(iter(self.PROJECT_INDICATORS))
+            try:
+                with os.scandir(self.project_path) as it:
+                    for entry in it:
+                        match = self._INDICATOR_UNION_RE.match(entry.name)
+                        if match and match.lastgroup == top_type:
+                            return top_type
+            except OSError:
+                pass
+        
+        # The first type in PROJECT_INDICATORS order that matched anywhere wins
+        hits = self._scan().indicator_hits
+        for project_type in self.PROJECT_INDICATORS:
+            if hits.get(project_type):
+                return project_type
         
         return "unknown"
     
+    def _scan(self) -> ScanResult:
+        """
+        Walk the project tree once, collecting everything _analyze_local needs.
+        
+        Directories in EXCLUDE_DIRS and hidden directories are not
+        descended into. The result is cached on the analyzer.
+        """
+        if self._scan_result is not None:
+            return self._scan_result
+        
+        scan = ScanResult()
+        if not self.project_path:
+            self._scan_result = scan
+            return scan
+        
+        root_names = set(self.README_NAMES) | set(self.TAILWIND_CONFIGS) | {'package.json'}
+        found_screenshot_dirs = set()
+        root_files = {}
+        
+        stack = ['']
+        while stack:
+            rel_dir = stack.pop()
+            dir_name = os.path.basename(rel_dir)
+            is_screenshot_dir = rel_dir in self._SCREENSHOT_RELPATH_SET
+            try:
+                with os.scandir(os.path.join(self.project_path, rel_dir)) as it:
+                    for entry in it:
+                        name = entry.name
+                        relpath = os.path.join(rel_dir, name)
+                        
+                        match = self._INDICATOR_UNION_RE.match(name)
+                        if match:
+                            scan.indicator_hits.setdefault(match.lastgroup, []).append(relpath)
+                        
+                        # DirEntry reuses the d_type from readdir, no stat needed
+                        if entry.is_dir(follow_symlinks=False):
+                            if name not in EXCLUDE_DIRS and not name.startswith('.'):
+                                stack.append(relpath)
+                            continue
+                        
+                        # The walk doesn't follow symlinks, so probe a linked
+                        # screenshot folder directly
+                        if relpath in self._SCREENSHOT_RELPATH_SET and entry.is_dir():
+                            if _dir_has_image(entry.path):
+                                found_screenshot_dirs.add(relpath)
+                            continue
+                        
+                        stem, dot, ext = name.rpartition('.')
+                        ext = ext.lower() if dot and stem else ''
+                        if ext:
+                            scan.ext_counts[ext] += 1
+                        
+                        if not rel_dir and name in root_names:
+                            root_files[name] = Path(entry.path)
+                        elif name == 'Contents.json' and dir_name == 'AccentColor.colorset':
+                            scan.color_files.append(Path(entry.path))
+                        
+                        if is_screenshot_dir and ext in IMAGE_EXTENSIONS:
+                            found_screenshot_dirs.add(rel_dir)
+            except OSError:
+                pass
+        
+        scan.screenshot_dirs = [
+            self.project_path / rel for rel in self._SCREENSHOT_RELPATHS
+            if rel in found_screenshot_dirs
+        ]
+        scan.color_files.extend(root_files[n] for n in self.TAILWIND_CONFIGS if n in root_files)
+        scan.readme = next((root_files[n] for n in self.README_NAMES if n in root_files), None)
+        scan.package_json = root_files.get('package.json')
+        
+        self._scan_result = scan
+        return scan
+    
     def _detect_language(self, project_type: str) -> str:
         """Detect primary programming language."""
         language_map = {
@@ -140,52 +322,52 @@ class ProjectAnalyzer:
         
         # Try to detect from files
         if self.project_path:
-            extensions = {}
-            for f in self.project_path.rglob("*"):
-                if f.is_file() and f.suffix:
-                    ext = f.suffix.lower()
-                    extensions[ext] = extensions.get(ext, 0) + 1
-            
-            # Map extensions to languages
+            # Map extensions to languages, earlier entries take precedence
             ext_to_lang = {
-                '.swift': 'Swift',
-                '.kt': 'Kotlin',
-                '.java': 'Java',
-                '.ts': 'TypeScript',
-                '.tsx': 'TypeScript',
-                '.js': 'JavaScript',
-                '.jsx': 'JavaScript',
-                '.py': 'Python',
-                '.rs': 'Rust',
-                '.go': 'Go',
+                'swift': 'Swift',
+                'kt': 'Kotlin',
+                'java': 'Java',
+                'ts': 'TypeScript',
+                'tsx': 'TypeScript',
+                'js': 'JavaScript',
+                'jsx': 'JavaScript',
+                'py': 'Python',
+                'rs': 'Rust',
+                'go': 'Go',
             }
             
+            ext_counts = self._scan().ext_counts
             for ext, lang in ext_to_lang.items():
-                if ext in extensions:
+                if ext in ext_counts:
                     return lang
         
         return "unknown"
     
+    def _load_package_json(self) -> Optional[dict]:
+        """Load the root package.json, parsed once per file version."""
+        package_json = self._scan().package_json
+        if package_json is None:
+            return None
+        try:
+            data = _load_json_cached(str(package_json), package_json.stat().st_mtime_ns)
+        except:
+            return None
+        return data if isinstance(data, dict) else None
+    
     def _get_project_name(self) -> str:
         """Get the project name."""
         if not self.project_path:
             return "Unknown"
         
         # Try package.json
-        package_json = self.project_path / "package.json"
-        if package_json.exists():
-            try:
-                with open(package_json) as f:
-                    data = json.load(f)
-                    if "name" in data:
-                        return data["name"]
-            except:
-                pass
+        data = self._load_package_json()
+        if data and "name" in data:
+            return data["name"]
         
         # Try xcodeproj
-        xcodeproj = list(self.project_path.glob("*.xcodeproj"))
-        if xcodeproj:
-            return xcodeproj[0].stem
+        for relpath in self._scan().indicator_hits.get('ios', []):
+            if relpath.endswith('.xcodeproj') and os.sep not in relpath:
+                return Path(relpath).stem
         
         # Fall back to directory name
         return self.project_path.name
@@ -196,32 +378,24 @@ class ProjectAnalyzer:
             return None
         
         # Try package.json
-        package_json = self.project_path / "package.json"
-        if package_json.exists():
+        data = self._load_package_json()
+        if data and "description" in data:
+            return data["description"]
+        
+        # Try README first line/paragraph
+        readme = self._scan().readme
+        if readme:
             try:
-                with open(package_json) as f:
-                    data = json.load(f)
-                    if "description" in data:
-                        return data["description"]
+                # Read line by line so only the head of the file is decoded
+                with open(readme, encoding='utf-8', errors='replace') as f:
+                    # Get first paragraph after title
+                    for line in f:
+                        line = line.strip()
+                        if line and not line.startswith('#') and not line.startswith('!'):
+                            return line[:200]
             except:
                 pass
         
-        # Try README first line/paragraph
-        for readme_name in ["README.md", "README.txt", "README"]:
-            readme = self.project_path / readme_name
-            if readme.exists():
-                try:
-                    with open(readme) as f:
-                        content = f.read()
-                        # Get first paragraph after title
-                        lines = content.split('\n')
-                        for line in lines:
-                            line = line.strip()
-                            if line and not line.startswith('#') and not line.startswith('!'):
-                                return line[:200]
-                except:
-                    pass
-        
         return None
     
     def _extract_colors(self, project_type: str) -> List[Tuple[int, int, int]]:
@@ -243,17 +417,18 @@ class ProjectAnalyzer:
         colors = []
         
         # Look for AccentColor
-        for asset_path in self.project_path.rglob("AccentColor.colorset/Contents.json"):
+        for asset_path in self._scan().color_files:
+            if asset_path.name != "Contents.json":
+                continue
             try:
-                with open(asset_path) as f:
-                    data = json.load(f)
-                    for color_data in data.get("colors", []):
-                        if "color" in color_data:
-                            components = color_data["color"].get("components", {})
-                            r = self._parse_color_component(components.get("red", "0"))
-                            g = self._parse_color_component(components.get("green", "0"))
-                            b = self._parse_color_component(components.get("blue", "0"))
-                            colors.append((r, g, b))
+                data = _load_json_bytes(asset_path)
+                for color_data in data.get("colors", []):
+                    if "color" in color_data:
+                        components = color_data["color"].get("components", {})
+                        r = self._parse_color_component(components.get("red", "0"))
+                        g = self._parse_color_component(components.get("green", "0"))
+                        b = self._parse_color_component(components.get("blue", "0"))
+                        colors.append((r, g, b))
             except:
                 pass
         
@@ -264,21 +439,19 @@ class ProjectAnalyzer:
         colors = []
         
         # Try tailwind config
-        for config_name in ["tailwind.config.js", "tailwind.config.ts"]:
-            config_path = self.project_path / config_name
-            if config_path.exists():
-                try:
-                    with open(config_path) as f:
-                        content = f.read()
-                        # Simple regex for hex colors
-                        hex_colors = re.findall(r'["\']#([0-9a-fA-F]{6})["\']', content)
-                        for hex_color in hex_colors[:6]:
-                            r = int(hex_color[0:2], 16)
-                            g = int(hex_color[2:4], 16)
-                            b = int(hex_color[4:6], 16)
-                            colors.append((r, g, b))
-                except:
-                    pass
+        for config_path in self._scan().color_files:
+            if config_path.name not in self.TAILWIND_CONFIGS:
+                continue
+            try:
+                # Scan the mapped file directly: no full read or decode, and
+                # matching stops after the first 6 colors
+                with open(config_path, 'rb') as f, \
+                        mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    for match in itertools.islice(HEX_COLOR_RE.finditer(mm), 6):
+                        r, g, b = bytes.fromhex(match.group(1).decode())
+                        colors.append((r, g, b))
+            except:
+                pass
         
         return colors
     
@@ -299,13 +472,10 @@ class ProjectAnalyzer:
         if not self.project_path:
             return None
         
-        for screenshot_dir in self.SCREENSHOT_PATHS:
-            path = self.project_path / screenshot_dir
-            if path.exists() and path.is_dir():
-                # Check if it has image files
-                images = list(path.glob("*.png")) + list(path.glob("*.jpg")) + list(path.glob("*.jpeg"))
-                if images:
-                    return str(path)
+        # The scan keeps only SCREENSHOT_PATHS that contain images, in order
+        screenshot_dirs = self._scan().screenshot_dirs
+        if screenshot_dirs:
+            return str(screenshot_dirs[0])
         
         return None
     
@@ -317,24 +487,26 @@ class ProjectAnalyzer:
             return features
         
         # Try README
-        for readme_name in ["README.md", "README.txt"]:
-            readme = self.project_path / readme_name
-            if readme.exists():
-                try:
-                    with open(readme) as f:
-                        content = f.read()
-                        # Look for "Features" section
-                        features_match = re.search(
-                            r'#+\s*Features?\s*\n([\s\S]*?)(?=\n#|\Z)',
-                            content,
-                            re.IGNORECASE
-                        )
-                        if features_match:
+        readme = self._scan().readme
+        if readme:
+            try:
+                with open(readme, encoding='utf-8', errors='replace') as f:
+                    # Stream until the "Features" section ends or has 5 bullets
+                    in_features = False
+                    for line in f:
+                        if not in_features:
+                            in_features = bool(FEATURES_HEADING_RE.match(line))
+                        elif line.startswith('#'):
+                            break
+                        else:
                             # Extract bullet points
-                            bullets = re.findall(r'[-*]\s*(.+)', features_match.group(1))
-                            features.extend(bullets[:5])
-                except:
-                    pass
+                            bullet = BULLET_RE.match(line)
+                            if bullet:
+                                features.append(bullet.group(1))
+                                if len(features) == 5:
+                                    break
+            except:
+                pass
         
         return features
     
@@ -1,3 +1,16 @@
-from .ios_simulator import IOSSimulatorCapture
+from importlib import import_module
 
 __all__ = ['IOSSimulatorCapture']
+
+# Exports are imported on first access, so importing the package doesn't
+# load the simulator tooling until it's used (src.pipeline likewise imports
+# it only where it sets up a capture)
+_EXPORTS = {
+    'IOSSimulatorCapture': '.ios_simulator',
+}
+
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        return getattr(import_module(_EXPORTS[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -4,13 +4,92 @@ Builds and runs iOS apps in the simulator to capture screenshots.
 """
 
 import subprocess
+import functools
 import json
+import os
+import plistlib
 import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Optional, Dict
+from typing import Callable, List, Optional, Dict, Tuple, Union
 from dataclasses import dataclass
 
 
+# Lines of xcodebuild output kept for the error message when a build fails
+BUILD_LOG_TAIL = 200
+
+# How long to wait for a launched app's process, and how often to check
+LAUNCH_TIMEOUT = 10.0
+LAUNCH_POLL_INTERVAL = 0.2
+# Extra time after the process appears for the first frame to render
+LAUNCH_SETTLE = 1.0
+
+# Resolved device name -> UDID, so warm runs skip the full simctl listing
+DEVICE_CACHE_PATH = Path.home() / "Library" / "Caches" / "screenshot-to-ios-mockup" / "devices.json"
+
+
+def _load_device_cache() -> dict:
+    """Load the device cache (name, lowercased -> udid)."""
+    try:
+        cache = json.loads(DEVICE_CACHE_PATH.read_text())
+    except (OSError, ValueError):
+        return {}
+    return cache if isinstance(cache, dict) else {}
+
+
+def _save_device_cache(cache: dict) -> None:
+    """Write the device cache, ignoring failures."""
+    try:
+        DEVICE_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        # Write then rename so concurrent runs never see a partial file
+        tmp_path = DEVICE_CACHE_PATH.with_suffix(f".{os.getpid()}.tmp")
+        tmp_path.write_text(json.dumps(cache))
+        os.replace(tmp_path, DEVICE_CACHE_PATH)
+    except OSError:
+        pass
+
+
+def _entries_with_suffix(dir_path: Union[str, Path], *suffixes: str) -> Dict[str, List[Path]]:
+    """
+    List a directory once and group entries by suffix.
+    
+    Returns:
+        Dict mapping each suffix to the matching paths (empty if the
+        directory is missing)
+    """
+    found = {suffix: [] for suffix in suffixes}
+    try:
+        with os.scandir(dir_path) as it:
+            for entry in it:
+                for suffix in suffixes:
+                    if entry.name.endswith(suffix):
+                        found[suffix].append(Path(entry.path))
+                        break
+    except OSError:
+        pass
+    return found
+
+
+def _classify_root(dir_path: Path) -> Tuple[List[Path], List[Path]]:
+    """Return the (workspaces, projects) at the top of an Xcode project directory."""
+    found = _entries_with_suffix(dir_path, ".xcworkspace", ".xcodeproj")
+    return found[".xcworkspace"], found[".xcodeproj"]
+
+
+@functools.lru_cache(maxsize=64)
+def _load_plist(path_str: str, mtime_ns: int) -> dict:
+    """Parse a plist once per (path, mtime). Callers must not mutate the result."""
+    with open(path_str, 'rb') as f:
+        return plistlib.load(f)
+
+
+def _find_built_app(build_dir: str) -> Optional[Path]:
+    """Return the first .app bundle in a build products directory."""
+    apps = _entries_with_suffix(build_dir, ".app")[".app"]
+    return apps[0] if apps else None
+
+
 @dataclass
 class SimulatorDevice:
     """Represents an iOS Simulator device."""
@@ -30,16 +109,36 @@ class IOSSimulatorCapture:
     def __init__(self,
                  project_path: str,
                  device_name: str = "iPhone 17 Pro Max",
-                 output_dir: str = None):
+                 output_dir: str = None,
+                 max_workers: int = 4):
         self.project_path = Path(project_path).resolve()  # Convert to absolute path
         self.device_name = device_name
         self.output_dir = Path(output_dir).resolve() if output_dir else self.project_path / "screenshots"
+        self.max_workers = max_workers  # Threads for independent xcrun/filesystem calls
+        # String forms of the paths passed to every subprocess call
+        self._project_path_str = str(self.project_path)
+        self._output_dir_str = str(self.output_dir)
+        self._build_dir_str = os.path.join(self._project_path_str, "build")
+        self._output_dir_ready = False
         self._device = None
+        self._project_info = None
+        self._devices = None  # Last full device listing
+        self._device_index = None  # Lowercased name -> first available device
     
-    def get_available_devices(self) -> List[SimulatorDevice]:
-        """Get list of available simulator devices."""
+    def get_available_devices(self, search: str = None) -> List[SimulatorDevice]:
+        """
+        Get list of available simulator devices.
+        
+        Args:
+            search: Optional simctl search term (e.g. a UDID) to list only matching devices
+        """
+        if search:
+            cmd = ["xcrun", "simctl", "list", "-j", "devices", search]
+        else:
+            cmd = ["xcrun", "simctl", "list", "devices", "-j"]
+        
         result = subprocess.run(
-            ["xcrun", "simctl", "list", "devices", "-j"],
+            cmd,
             capture_output=True,
             text=True
         )
@@ -60,21 +159,72 @@ class IOSSimulatorCapture:
                     is_available=device.get("isAvailable", False)
                 ))
         
+        if not search:
+            self._devices = devices
+            self._device_index = {}
+            for device in devices:
+                if device.is_available:
+                    self._device_index.setdefault(device.name.lower(), device)
+        
         return devices
     
-    def find_device(self, name: str = None) -> Optional[SimulatorDevice]:
-        """Find a simulator device by name."""
+    def find_device(self,
+                    name: str = None,
+                    devices: List[SimulatorDevice] = None) -> Optional[SimulatorDevice]:
+        """
+        Find a simulator device by name, optionally in an already fetched device list.
+        
+        Without a device list, this process's last full listing is reused
+        if there is one. Otherwise a UDID cached from an earlier run is
+        checked first with a single-device listing; the full listing only
+        runs on a cache miss or when the cached device is gone or unavailable.
+        """
         target_name = name or self.device_name
-        devices = self.get_available_devices()
+        key = target_name.lower()
+        
+        if devices is None and self._devices is not None:
+            return self._match_device(key, self._devices, self._device_index)
+        
+        if devices is None:
+            cache = _load_device_cache()
+            udid = cache.get(key)
+            if udid:
+                for device in self.get_available_devices(search=udid):
+                    if device.udid == udid and device.is_available and key in device.name.lower():
+                        return device
+            
+            devices = self.get_available_devices()
+            match = self._match_device(key, devices, self._device_index)
+            if match and match.is_available and cache.get(key) != match.udid:
+                cache[key] = match.udid
+                _save_device_cache(cache)
+            return match
+        
+        return self._match_device(key, devices)
+    
+    def _match_device(self,
+                      key: str,
+                      devices: List[SimulatorDevice],
+                      index: Dict[str, SimulatorDevice] = None) -> Optional[SimulatorDevice]:
+        """
+        Pick the device named key (lowercase), preferring available ones.
+        
+        An exact name hit in index wins; otherwise the first device whose
+        name contains key.
+        """
+        if index:
+            device = index.get(key)
+            if device:
+                return device
         
         # Prefer available devices
         for device in devices:
-            if target_name.lower() in device.name.lower() and device.is_available:
+            if key in device.name.lower() and device.is_available:
                 return device
         
         # Fall back to any matching device
         for device in devices:
-            if target_name.lower() in device.name.lower():
+            if key in device.name.lower():
                 return device
         
         return None
@@ -96,8 +246,14 @@ class IOSSimulatorCapture:
             if result.returncode != 0 and "already booted" not in result.stderr.lower():
                 raise RuntimeError(f"Failed to boot simulator: {result.stderr}")
             
-            # Wait for boot
-            time.sleep(3)
+            # Wait for boot: bootstatus blocks until SpringBoard is up
+            status = subprocess.run(
+                ["xcrun", "simctl", "bootstatus", device.udid, "-b"],
+                capture_output=True,
+                text=True
+            )
+            if status.returncode != 0:
+                time.sleep(3)
         
         self._device = device
         return device
@@ -110,9 +266,15 @@ class IOSSimulatorCapture:
                 ["xcrun", "simctl", "shutdown", device.udid],
                 capture_output=True
             )
+            # Device states changed; list again on the next lookup
+            self._devices = None
+            self._device_index = None
     
     def detect_project_type(self) -> Dict:
-        """Detect the type of iOS project and build settings."""
+        """Detect the type of iOS project and build settings (cached after the first call)."""
+        if self._project_info is not None:
+            return self._project_info
+        
         project_info = {
             "type": None,
             "project_file": None,
@@ -120,14 +282,15 @@ class IOSSimulatorCapture:
             "scheme": None
         }
         
+        # One pass over the project root, classifying entries by suffix
+        workspaces, projects = _classify_root(self.project_path)
+        
         # Check for workspace (common with CocoaPods/SPM)
-        workspaces = list(self.project_path.glob("*.xcworkspace"))
         if workspaces:
             project_info["workspace_file"] = workspaces[0]
             project_info["type"] = "workspace"
         
         # Check for project file
-        projects = list(self.project_path.glob("*.xcodeproj"))
         if projects:
             project_info["project_file"] = projects[0]
             if not project_info["type"]:
@@ -136,34 +299,44 @@ class IOSSimulatorCapture:
         # Try to detect scheme
         if project_info["project_file"]:
             scheme_path = project_info["project_file"] / "xcshareddata" / "xcschemes"
-            if scheme_path.exists():
-                schemes = list(scheme_path.glob("*.xcscheme"))
-                if schemes:
-                    project_info["scheme"] = schemes[0].stem
+            schemes = _entries_with_suffix(scheme_path, ".xcscheme")[".xcscheme"]
+            if schemes:
+                project_info["scheme"] = schemes[0].stem
         
         # Fallback: use project name as scheme
         if not project_info["scheme"]:
             if project_info["project_file"]:
                 project_info["scheme"] = project_info["project_file"].stem
         
+        self._project_info = project_info
         return project_info
     
     def build_app(self, 
                  scheme: str = None,
-                 configuration: str = "Debug") -> str:
+                 configuration: str = "Debug",
+                 project_info: Dict = None,
+                 device: SimulatorDevice = None,
+                 on_output: Callable[[str], None] = None) -> str:
         """
         Build the iOS app for simulator.
         
+        Args:
+            scheme: Scheme to build (detected if omitted)
+            configuration: Build configuration
+            project_info: Result of detect_project_type(), if already known
+            device: Destination simulator, if already resolved
+            on_output: Called with each line of build output as it arrives
+        
         Returns:
             Path to the built .app bundle
         """
-        project_info = self.detect_project_type()
+        project_info = project_info or self.detect_project_type()
         scheme = scheme or project_info.get("scheme")
         
         if not scheme:
             raise RuntimeError("Could not detect scheme. Please provide scheme name.")
         
-        device = self.find_device()
+        device = device or self.find_device()
         if not device:
             raise RuntimeError(f"Could not find device: {self.device_name}")
         
@@ -181,7 +354,8 @@ class IOSSimulatorCapture:
             "-scheme", scheme,
             "-configuration", configuration,
             "-destination", f"platform=iOS Simulator,id={device.udid}",
-            "-derivedDataPath", str(self.project_path / "build"),
+            "-derivedDataPath", self._build_dir_str,
+            "-parallelizeTargets",
             "CODE_SIGN_IDENTITY=-",
             "CODE_SIGNING_REQUIRED=NO",
             "CODE_SIGNING_ALLOWED=NO",
@@ -190,24 +364,34 @@ class IOSSimulatorCapture:
         
         print(f"Building: {' '.join(cmd)}")
         
-        result = subprocess.run(
+        # Stream the log instead of buffering it all (it can run to tens of
+        # MB); only the tail is kept for reporting a failure
+        tail = deque(maxlen=BUILD_LOG_TAIL)
+        process = subprocess.Popen(
             cmd,
-            capture_output=True,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
             text=True,
-            cwd=self.project_path
+            bufsize=1,
+            cwd=self._project_path_str
         )
+        with process:
+            for line in process.stdout:
+                tail.append(line)
+                if on_output:
+                    on_output(line)
         
-        if result.returncode != 0:
-            raise RuntimeError(f"Build failed: {result.stderr}")
+        if process.returncode != 0:
+            raise RuntimeError(f"Build failed: {''.join(tail)}")
         
         # Find the built app
-        build_dir = self.project_path / "build" / "Build" / "Products" / f"{configuration}-iphonesimulator"
-        apps = list(build_dir.glob("*.app"))
+        build_dir = os.path.join(self._build_dir_str, "Build", "Products", f"{configuration}-iphonesimulator")
+        app = _find_built_app(build_dir)
         
-        if not apps:
+        if not app:
             raise RuntimeError("Could not find built app bundle")
         
-        return str(apps[0])
+        return str(app)
     
     def install_app(self, app_path: str, device: SimulatorDevice = None) -> None:
         """Install an app on the simulator."""
@@ -235,6 +419,32 @@ class IOSSimulatorCapture:
         if result.returncode != 0:
             raise RuntimeError(f"Failed to launch app: {result.stderr}")
     
+    def wait_for_app(self,
+                     bundle_id: str,
+                     device: SimulatorDevice = None,
+                     timeout: float = LAUNCH_TIMEOUT) -> bool:
+        """
+        Wait until the app's process is running on the simulator.
+        
+        Returns:
+            True if the process appeared before the timeout
+        """
+        device = device or self._device or self.find_device()
+        marker = f"UIKitApplication:{bundle_id}["
+        deadline = time.monotonic() + timeout
+        
+        while True:
+            result = subprocess.run(
+                ["xcrun", "simctl", "spawn", device.udid, "launchctl", "list"],
+                capture_output=True,
+                text=True
+            )
+            if result.returncode == 0 and marker in result.stdout:
+                return True
+            if time.monotonic() >= deadline:
+                return False
+            time.sleep(LAUNCH_POLL_INTERVAL)
+    
     def capture_screenshot(self, 
                           filename: str = None,
                           device: SimulatorDevice = None) -> str:
@@ -244,41 +454,62 @@ class IOSSimulatorCapture:
         Returns:
             Path to the captured screenshot
         """
+        output_path, process = self._start_screenshot(filename, device)
+        return self._finish_screenshot(output_path, process)
+    
+    def _start_screenshot(self,
+                          filename: str = None,
+                          device: SimulatorDevice = None) -> Tuple[str, subprocess.Popen]:
+        """Start 'simctl io screenshot' without waiting; returns (path, process)."""
         device = device or self._device or self.find_device()
         
         if not device:
             raise RuntimeError("No simulator device available")
         
-        self.output_dir.mkdir(parents=True, exist_ok=True)
+        if not self._output_dir_ready:
+            self.output_dir.mkdir(parents=True, exist_ok=True)
+            self._output_dir_ready = True
         
         if not filename:
             timestamp = int(time.time())
             filename = f"screenshot_{timestamp}.png"
         
-        output_path = self.output_dir / filename
+        output_path = os.path.join(self._output_dir_str, filename)
         
-        result = subprocess.run(
-            ["xcrun", "simctl", "io", device.udid, "screenshot", str(output_path)],
-            capture_output=True,
+        process = subprocess.Popen(
+            ["xcrun", "simctl", "io", device.udid, "screenshot", output_path],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
             text=True
         )
+        return output_path, process
+    
+    def _finish_screenshot(self, output_path: str, process: subprocess.Popen) -> str:
+        """Wait for a started screenshot and check that it succeeded."""
+        _, stderr = process.communicate()
         
-        if result.returncode != 0:
-            raise RuntimeError(f"Failed to capture screenshot: {result.stderr}")
+        if process.returncode != 0:
+            raise RuntimeError(f"Failed to capture screenshot: {stderr}")
         
-        return str(output_path)
+        return output_path
     
     def capture_sequence(self,
                         count: int = 3,
                         delay: float = 2.0,
-                        prefix: str = "screen") -> List[str]:
+                        prefix: str = "screen",
+                        on_capture: Callable[[str], None] = None) -> List[str]:
         """
         Capture a sequence of screenshots.
         
+        Captures start every `delay` seconds; the wait overlaps with the
+        previous capture instead of following it.
+        
         Args:
             count: Number of screenshots to capture
             delay: Delay between captures in seconds
             prefix: Filename prefix
+            on_capture: Called with each screenshot path once it is written,
+                so callers can process it while the next one is captured
         
         Returns:
             List of screenshot paths
@@ -287,46 +518,69 @@ class IOSSimulatorCapture:
         
         for i in range(count):
             filename = f"{prefix}_{i + 1}.png"
-            path = self.capture_screenshot(filename=filename)
-            screenshots.append(path)
+            next_start = time.monotonic() + delay
+            path, process = self._start_screenshot(filename=filename)
             
             if i < count - 1:
-                time.sleep(delay)
+                remaining = next_start - time.monotonic()
+                if remaining > 0:
+                    time.sleep(remaining)
+            
+            # Don't start the next capture until this one has been written
+            screenshots.append(self._finish_screenshot(path, process))
+            if on_capture:
+                on_capture(path)
         
         return screenshots
     
     def get_bundle_id_from_app(self, app_path: str) -> str:
         """Extract bundle ID from an app bundle."""
-        import plistlib
-        
         info_plist = Path(app_path) / "Info.plist"
         
-        if not info_plist.exists():
+        try:
+            mtime_ns = info_plist.stat().st_mtime_ns
+        except FileNotFoundError:
             raise RuntimeError(f"Info.plist not found in {app_path}")
         
-        with open(info_plist, 'rb') as f:
-            plist = plistlib.load(f)
+        plist = _load_plist(str(info_plist), mtime_ns)
         
         return plist.get("CFBundleIdentifier", "")
     
     def full_capture_flow(self,
                          scheme: str = None,
                          screenshot_count: int = 3,
-                         delay: float = 3.0) -> List[str]:
+                         delay: float = 3.0,
+                         on_capture: Callable[[str], None] = None) -> List[str]:
         """
         Complete flow: build, install, launch, and capture screenshots.
         
+        Args:
+            scheme: Scheme to build (detected if omitted)
+            screenshot_count: Number of screenshots to capture
+            delay: Delay between captures in seconds
+            on_capture: Called with each screenshot path once it is written
+        
         Returns:
             List of captured screenshot paths
         """
+        # Resolving the device (xcrun calls) and scanning the project are
+        # independent, so run them side by side
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            device_future = pool.submit(self.find_device)
+            project_info = self.detect_project_type()
+            device = device_future.result()
+        
+        if not device:
+            raise RuntimeError(f"Could not find device: {self.device_name}")
+        
         # Boot simulator
-        device = self.boot_simulator()
+        device = self.boot_simulator(device)
         print(f"Booted simulator: {device.name}")
         
         try:
             # Build app
             print("Building app...")
-            app_path = self.build_app(scheme=scheme)
+            app_path = self.build_app(scheme=scheme, project_info=project_info, device=device)
             print(f"Built: {app_path}")
             
             # Get bundle ID
@@ -342,13 +596,16 @@ class IOSSimulatorCapture:
             self.launch_app(bundle_id)
             
             # Wait for app to fully launch
-            time.sleep(3)
+            if not self.wait_for_app(bundle_id):
+                print("App process not detected yet, capturing anyway")
+            time.sleep(LAUNCH_SETTLE)
             
             # Capture screenshots
             print(f"Capturing {screenshot_count} screenshots...")
             screenshots = self.capture_sequence(
                 count=screenshot_count,
-                delay=delay
+                delay=delay,
+                on_capture=on_capture
             )
             
             print(f"Captured: {screenshots}")
@@ -1,4 +1,16 @@
-from .cloner import GitHubCloner
-from .analyzer import GitHubAnalyzer
+from importlib import import_module
 
 __all__ = ['GitHubCloner', 'GitHubAnalyzer']
+
+# Exports are imported on first access, so loading one submodule
+# (e.g. cloner) doesn't load the other
+_EXPORTS = {
+    'GitHubCloner': '.cloner',
+    'GitHubAnalyzer': '.analyzer',
+}
+
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        return getattr(import_module(_EXPORTS[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -3,14 +3,62 @@ GitHub repository analyzer.
 Analyzes repos via API/MCP to extract project info, colors, and recent changes.
 """
 
+import hashlib
+import itertools
 import json
+import os
 import re
+import subprocess
+import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
-from dataclasses import dataclass, field
+from dataclasses import asdict, dataclass, field
 
 
-@dataclass
+# Directories skipped (not descended into) when counting source files
+EXCLUDE_DIRS = frozenset({
+    '.git', 'node_modules', 'build', 'Pods', '.venv', '__pycache__', 'dist', '.next',
+})
+
+# owner/repo from a github.com/owner/repo URL, with or without .git
+GITHUB_URL_RE = re.compile(r'github\.com/([^/]+)/([^/]+?)(?:\.git)?/?$')
+# "**Description:** ..." line in CLAUDE.md-style docs, looked for in the
+# first DESCRIPTION_SEARCH_CHARS characters (it sits in the header)
+DESCRIPTION_RE = re.compile(r'\*\*Description:\*\*\s*(.+?)(?:\n|$)')
+DESCRIPTION_SEARCH_CHARS = 4096
+# Quoted six-digit hex colors in JS/TS configs
+HEX_COLOR_RE = re.compile(r'["\']#([0-9a-fA-F]{6})["\']')
+# Deletes hex digits; a string is all hex iff translating it leaves nothing
+_HEX_DIGITS_TABLE = str.maketrans('', '', '0123456789abcdefABCDEF')
+
+# Seconds to wait for each file when fetching one at a time
+FETCH_TIMEOUT = 10
+
+# analyze_local results, one file per (repo, clone path, HEAD commit); bump
+# ANALYSIS_CACHE_VERSION when the analysis output changes
+ANALYSIS_CACHE_DIR = Path.home() / ".cache" / "screenshot-to-ios-mockup" / "github"
+ANALYSIS_CACHE_VERSION = "2"
+
+# Language detection stops early once one extension holds this share of the
+# counted source files; checked every LANGUAGE_CHECK_INTERVAL files
+LANGUAGE_CHECK_INTERVAL = 500
+LANGUAGE_LEAD = 0.6
+
+# slots=True needs Python 3.10; older versions keep per-instance dicts
+_DATACLASS_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+
+def _list_dir(dir_path: str) -> Dict[str, os.DirEntry]:
+    """Entries of a directory by name; empty if it can't be read."""
+    try:
+        with os.scandir(dir_path) as it:
+            return {entry.name: entry for entry in it}
+    except OSError:
+        return {}
+
+
+@dataclass(**_DATACLASS_SLOTS)
 class GitHubProjectInfo:
     """Information about a GitHub project."""
     owner: str
@@ -54,6 +102,9 @@ class GitHubAnalyzer:
         'src/styles/theme.json',
     ]
     
+    # Docs checked for a description, in priority order
+    DOC_FILES = ['CLAUDE.md', 'README.md']
+    
     def __init__(self, owner: str, repo: str):
         self.owner = owner
         self.repo = repo
@@ -62,7 +113,7 @@ class GitHubAnalyzer:
     def from_url(cls, url: str) -> 'GitHubAnalyzer':
         """Create analyzer from a GitHub URL."""
         # Parse owner/repo from URL
-        match = re.search(r'github\.com/([^/]+)/([^/]+?)(?:\.git)?/?$', url)
+        match = GITHUB_URL_RE.search(url)
         if match:
             return cls(match.group(1), match.group(2))
         raise ValueError(f"Could not parse GitHub URL: {url}")
@@ -99,6 +150,59 @@ class GitHubAnalyzer:
             file_fetcher: Optional callable to fetch file contents
                          Signature: (path: str) -> str
         
+        Returns:
+            GitHubProjectInfo with extracted information
+        """
+        # A root listing is a one-level tree
+        tree_entries = [
+            {'path': item['name'], 'type': 'tree' if item['type'] == 'dir' else 'blob'}
+            for item in root_contents if item['type'] in ('dir', 'file')
+        ]
+        
+        blob_fetcher_batch = None
+        if file_fetcher:
+            # No batch endpoint: issue the single-file fetches concurrently so
+            # the round trips overlap
+            def blob_fetcher_batch(paths: List[str]) -> Dict[str, str]:
+                contents = {}
+                executor = ThreadPoolExecutor(max_workers=len(paths))
+                try:
+                    futures = {file_path: executor.submit(file_fetcher, file_path) for file_path in paths}
+                    for file_path, future in futures.items():
+                        try:
+                            contents[file_path] = future.result(timeout=FETCH_TIMEOUT)
+                        except Exception:
+                            pass
+                finally:
+                    # Don't block on a fetch that already timed out
+                    executor.shutdown(wait=False)
+                return contents
+        
+        info = self.analyze_from_tree(tree_entries, blob_fetcher_batch)
+        
+        # Only the root is known, so assume the usual shared colors location
+        if not info.color_config_path and any(
+                item['name'] == 'shared' and item['type'] == 'dir' for item in root_contents):
+            info.color_config_path = 'shared/constants/colors.json'
+        
+        return info
+    
+    def analyze_from_tree(self,
+                          tree_entries: List[Dict],
+                          blob_fetcher_batch=None) -> GitHubProjectInfo:
+        """
+        Analyze a repo from a recursive Git tree listing.
+        
+        The whole listing comes from one API call
+        (GET /repos/{owner}/{repo}/git/trees/{sha}?recursive=1), and the docs
+        and color config it points at are fetched in a single batch, e.g. one
+        GraphQL query with an object(expression: "HEAD:<path>") per file.
+        
+        Args:
+            tree_entries: Dicts with 'path' and 'type' ('blob' or 'tree')
+            blob_fetcher_batch: Optional callable to fetch several files at once
+                               Signature: (paths: List[str]) -> Dict[str, str]
+        
         Returns:
             GitHubProjectInfo with extracted information
         """
@@ -112,53 +216,128 @@ class GitHubAnalyzer:
         )
         
         # Detect project structure
-        dir_names = {item['name']: item for item in root_contents if item['type'] == 'dir'}
-        file_names = {item['name']: item for item in root_contents if item['type'] == 'file'}
+        dir_paths = {entry['path'] for entry in tree_entries if entry['type'] == 'tree'}
+        file_paths = {entry['path'] for entry in tree_entries if entry['type'] == 'blob'}
         
         # Check for iOS
-        if 'ios' in dir_names:
+        if 'ios' in dir_paths:
             info.has_ios = True
             info.ios_path = 'ios'
             info.project_type = 'ios'
         
         # Check for web
-        if 'web' in dir_names or 'package.json' in file_names:
+        if 'web' in dir_paths or 'package.json' in file_paths:
             info.has_web = True
-            info.web_path = 'web' if 'web' in dir_names else '.'
+            info.web_path = 'web' if 'web' in dir_paths else '.'
             if not info.has_ios:
                 info.project_type = 'web'
         
-        # Check for shared colors config
-        if 'shared' in dir_names:
-            info.color_config_path = 'shared/constants/colors.json'
+        # Check for a colors config
+        for color_path in self.COLOR_CONFIGS:
+            if color_path in file_paths:
+                info.color_config_path = color_path
+                break
+        
+        if not blob_fetcher_batch:
+            return info
+        
+        # Fetch everything needed in one round trip
+        doc_files = [doc_file for doc_file in self.DOC_FILES if doc_file in file_paths]
+        wanted = doc_files + ([info.color_config_path] if info.color_config_path else [])
+        if not wanted:
+            return info
+        
+        try:
+            contents = blob_fetcher_batch(wanted) or {}
+        except Exception:
+            contents = {}
         
         # Try to get description from CLAUDE.md or README
-        if file_fetcher:
-            for doc_file in ['CLAUDE.md', 'README.md']:
-                if doc_file in file_names:
-                    try:
-                        content = file_fetcher(doc_file)
-                        desc = self._extract_description(content)
-                        if desc:
-                            info.description = desc
-                            break
-                    except Exception:
-                        pass
+        for doc_file in doc_files:
+            content = contents.get(doc_file)
+            if content:
+                desc = self._extract_description(content)
+                if desc:
+                    info.description = desc
+                    break
+        
+        color_content = contents.get(info.color_config_path)
+        if color_content:
+            info.brand_colors = self._extract_colors_from_content(
+                info.color_config_path, color_content
+            )
         
         return info
     
-    def analyze_local(self, local_path: str) -> GitHubProjectInfo:
+    def analyze_local(self, local_path: str, use_cache: bool = True) -> GitHubProjectInfo:
         """
         Analyze a locally cloned repository.
         
+        Results are cached on disk by HEAD commit, so re-analyzing an
+        unchanged clone is a single JSON load. Clones with uncommitted
+        changes are always analyzed fresh.
+        
         Args:
             local_path: Path to the cloned repo
+            use_cache: If False, ignore and don't write the on-disk cache
         
         Returns:
             GitHubProjectInfo with extracted information
         """
-        path = Path(local_path)
+        cache_path = self._analysis_cache_path(local_path) if use_cache else None
+        if cache_path:
+            try:
+                data = json.loads(cache_path.read_text())
+                data['brand_colors'] = [tuple(color) for color in data['brand_colors']]
+                return GitHubProjectInfo(**data)
+            except (OSError, ValueError, KeyError, TypeError):
+                pass
         
+        info = self._analyze_local(Path(local_path))
+        
+        if cache_path:
+            try:
+                cache_path.parent.mkdir(parents=True, exist_ok=True)
+                # Write then rename so concurrent runs never see a partial file
+                tmp_path = cache_path.with_suffix(f".{os.getpid()}.tmp")
+                tmp_path.write_text(json.dumps(asdict(info)))
+                os.replace(tmp_path, cache_path)
+            except (OSError, TypeError, ValueError):
+                pass
+        
+        return info
+    
+    def _analysis_cache_path(self, local_path: str) -> Optional[Path]:
+        """Cache file for a clean checkout's HEAD, or None if it can't be cached."""
+        try:
+            head = subprocess.run(
+                ["git", "rev-parse", "HEAD"],
+                cwd=local_path,
+                capture_output=True,
+                text=True
+            )
+            if head.returncode != 0:
+                return None
+            
+            # HEAD doesn't describe uncommitted or untracked changes
+            status = subprocess.run(
+                ["git", "status", "--porcelain"],
+                cwd=local_path,
+                capture_output=True,
+                text=True
+            )
+            if status.returncode != 0 or status.stdout.strip():
+                return None
+        except OSError:
+            return None
+        
+        # Stored paths are absolute, so the clone location is part of the key
+        location = hashlib.sha256(os.path.abspath(local_path).encode()).hexdigest()[:12]
+        key = f"{self.owner}_{self.repo}_{location}_{head.stdout.strip()}_v{ANALYSIS_CACHE_VERSION}.json"
+        return ANALYSIS_CACHE_DIR / key
+    
+    def _analyze_local(self, path: Path) -> GitHubProjectInfo:
+        """Analyze a local checkout without consulting the cache."""
         info = GitHubProjectInfo(
             owner=self.owner,
             repo=self.repo,
@@ -168,38 +347,49 @@ class GitHubAnalyzer:
             project_type='unknown'
         )
         
+        # One listing of the root answers every top-level check
+        path_str = str(path)
+        top = _list_dir(path_str)
+        
         # Check for iOS project
-        ios_path = path / 'ios'
-        if ios_path.exists():
+        ios_path = os.path.join(path_str, 'ios')
+        if 'ios' in top and top['ios'].is_dir():
             info.has_ios = True
-            info.ios_path = str(ios_path)
+            info.ios_path = ios_path
             info.project_type = 'ios'
             
             # Find xcodeproj
-            xcodeprojs = list(ios_path.glob('*.xcodeproj'))
-            if xcodeprojs:
-                info.name = xcodeprojs[0].stem
+            for name in _list_dir(ios_path):
+                if name.endswith('.xcodeproj'):
+                    info.name = name[:-len('.xcodeproj')]
+                    break
         
         # Check for web project
-        web_path = path / 'web'
-        if web_path.exists() or (path / 'package.json').exists():
+        web_path = os.path.join(path_str, 'web')
+        has_web_dir = 'web' in top and top['web'].is_dir()
+        if has_web_dir or 'package.json' in top:
             info.has_web = True
-            info.web_path = str(web_path) if web_path.exists() else str(path)
+            info.web_path = web_path if has_web_dir else path_str
             if not info.has_ios:
                 info.project_type = 'web'
         
-        # Look for color config
+        # Look for color config, listing each candidate directory once
+        listings = {'': top}
         for color_path in self.COLOR_CONFIGS:
-            full_path = path / color_path
-            if full_path.exists():
-                info.color_config_path = str(full_path)
-                info.brand_colors = self._extract_colors_from_file(full_path)
+            dir_name, file_name = os.path.split(color_path)
+            if dir_name not in listings:
+                listings[dir_name] = _list_dir(os.path.join(path_str, dir_name))
+            if file_name in listings[dir_name]:
+                # Only the matching candidate becomes a Path
+                full_path = os.path.join(path_str, color_path)
+                info.color_config_path = full_path
+                info.brand_colors = self._extract_colors_from_file(Path(full_path))
                 break
         
         # Get description
-        for doc_file in ['CLAUDE.md', 'README.md']:
-            doc_path = path / doc_file
-            if doc_path.exists():
+        for doc_file in self.DOC_FILES:
+            if doc_file in top:
+                doc_path = os.path.join(path_str, doc_file)
                 try:
                     with open(doc_path, 'r') as f:
                         content = f.read()
@@ -218,15 +408,20 @@ class GitHubAnalyzer:
     def _extract_description(self, content: str) -> Optional[str]:
         """Extract project description from markdown content."""
         # Try to find description in CLAUDE.md format
-        match = re.search(r'\*\*Description:\*\*\s*(.+?)(?:\n|$)', content)
+        match = DESCRIPTION_RE.search(content, 0, DESCRIPTION_SEARCH_CHARS)
         if match:
             return match.group(1).strip()
         
-        # Try first paragraph after title
-        lines = content.split('\n')
+        # Try first paragraph after title, walking lines in place instead of
+        # splitting the whole document
         in_content = False
-        for line in lines:
-            line = line.strip()
+        start = 0
+        while start <= len(content):
+            end = content.find('\n', start)
+            if end == -1:
+                end = len(content)
+            line = content[start:end].strip()
+            start = end + 1
             if not line:
                 continue
             if line.startswith('#'):
@@ -239,75 +434,84 @@ class GitHubAnalyzer:
     
     def _extract_colors_from_file(self, file_path: Path) -> List[Tuple[int, int, int]]:
         """Extract colors from a color config file."""
+        try:
+            with open(file_path, 'r') as f:
+                content = f.read()
+        except Exception:
+            return []
+        
+        return self._extract_colors_from_content(file_path.name, content)
+    
+    def _extract_colors_from_content(self, file_name: str, content: str) -> List[Tuple[int, int, int]]:
+        """Extract colors from the text of a color config, by file extension."""
         colors = []
+        suffix = Path(file_name).suffix
         
         try:
-            if file_path.suffix == '.json':
-                with open(file_path, 'r') as f:
-                    data = json.load(f)
-                colors = self._extract_colors_from_json(data)
-            elif file_path.suffix in ['.js', '.ts']:
-                with open(file_path, 'r') as f:
-                    content = f.read()
+            if suffix == '.json':
+                colors = self._extract_colors_from_json(json.loads(content))
+            elif suffix in ['.js', '.ts']:
                 colors = self._extract_colors_from_js(content)
         except Exception:
             pass
         
         return colors[:6]  # Limit to 6 colors
     
-    def _extract_colors_from_json(self, data: dict, prefix: str = '') -> List[Tuple[int, int, int]]:
-        """Recursively extract hex colors from JSON data."""
+    def _extract_colors_from_json(self, data: dict, limit: int = 6) -> List[Tuple[int, int, int]]:
+        """
+        Extract hex colors from nested JSON data, depth first in key order.
+        
+        Args:
+            data: Parsed JSON object
+            limit: Stop once this many colors have been found
+        """
         colors = []
+        # One items() iterator per open dict; descending pauses the parent's
+        # iterator so colors come out in document order
+        stack = [iter(data.items())]
         
-        for key, value in data.items():
-            if key.startswith('_'):  # Skip comments
-                continue
-            
-            if isinstance(value, str) and value.startswith('#'):
-                rgb = self._hex_to_rgb(value)
-                if rgb:
-                    colors.append(rgb)
-            elif isinstance(value, dict):
-                colors.extend(self._extract_colors_from_json(value, f"{prefix}{key}."))
+        while stack:
+            for key, value in stack[-1]:
+                if key.startswith('_'):  # Skip comments
+                    continue
+                
+                if isinstance(value, str) and value.startswith('#'):
+                    rgb = self._hex_to_rgb(value)
+                    if rgb:
+                        colors.append(rgb)
+                        if len(colors) >= limit:
+                            return colors
+                elif isinstance(value, dict):
+                    stack.append(iter(value.items()))
+                    break
+            else:
+                stack.pop()
         
         return colors
     
-    def _extract_colors_from_js(self, content: str) -> List[Tuple[int, int, int]]:
-        """Extract hex colors from JavaScript/TypeScript content."""
-        colors = []
-        hex_pattern = r'["\']#([0-9a-fA-F]{6})["\']'
-        
-        for match in re.finditer(hex_pattern, content):
-            hex_color = match.group(1)
-            rgb = self._hex_to_rgb(f"#{hex_color}")
-            if rgb:
-                colors.append(rgb)
+    def _extract_colors_from_js(self, content: str, limit: int = 6) -> List[Tuple[int, int, int]]:
+        """
+        Extract hex colors from JavaScript/TypeScript content.
         
-        return colors
+        Args:
+            content: Source text
+            limit: Stop once this many colors have been found
+        """
+        # The pattern only captures valid hex digits, so each capture converts
+        # directly in one bytes.fromhex call
+        matches = itertools.islice(HEX_COLOR_RE.finditer(content), limit)
+        return [tuple(bytes.fromhex(match.group(1))) for match in matches]
     
     def _hex_to_rgb(self, hex_color: str) -> Optional[Tuple[int, int, int]]:
         """Convert hex color to RGB tuple."""
         hex_color = hex_color.lstrip('#')
-        if len(hex_color) == 6:
-            try:
-                return (
-                    int(hex_color[0:2], 16),
-                    int(hex_color[2:4], 16),
-                    int(hex_color[4:6], 16)
-                )
-            except ValueError:
-                return None
+        if len(hex_color) == 6 and not hex_color.translate(_HEX_DIGITS_TABLE):
+            r, g, b = bytes.fromhex(hex_color)
+            return (r, g, b)
         return None
     
     def _detect_language(self, path: Path) -> Optional[str]:
         """Detect primary programming language."""
-        extensions = {}
-        
-        for f in path.rglob('*'):
-            if f.is_file() and f.suffix and not any(p in str(f) for p in ['.git', 'node_modules', 'build', 'Pods']):
-                ext = f.suffix.lower()
-                extensions[ext] = extensions.get(ext, 0) + 1
-        
         ext_to_lang = {
             '.swift': 'Swift',
             '.kt': 'Kotlin',
@@ -318,9 +522,38 @@ class GitHubAnalyzer:
             '.py': 'Python',
         }
         
-        # Find most common extension that maps to a language
-        for ext, count in sorted(extensions.items(), key=lambda x: -x[1]):
-            if ext in ext_to_lang:
-                return ext_to_lang[ext]
+        # Walk with os.scandir, pruning excluded directories before descending
+        # and only counting extensions that map to a language
+        extensions = {}
+        total = 0
+        decided = False
+        stack = [str(path)]
+        while stack and not decided:
+            try:
+                with os.scandir(stack.pop()) as it:
+                    for entry in it:
+                        name = entry.name
+                        if entry.is_dir(follow_symlinks=False):
+                            if name not in EXCLUDE_DIRS:
+                                stack.append(entry.path)
+                            continue
+                        dot = name.rfind('.')
+                        if dot > 0:
+                            ext = name[dot:].lower()
+                            if ext in ext_to_lang and entry.is_file():
+                                extensions[ext] = extensions.get(ext, 0) + 1
+                                total += 1
+                                # One extension clearly dominates: the rest of
+                                # the tree won't change the answer
+                                if (total % LANGUAGE_CHECK_INTERVAL == 0
+                                        and max(extensions.values()) > LANGUAGE_LEAD * total):
+                                    decided = True
+                                    break
+            except OSError:
+                pass
         
-        return None
+        # Most common extension; only mapped extensions were counted, and
+        # ties go to the one seen first
+        if not extensions:
+            return None
+        return ext_to_lang[max(extensions, key=extensions.get)]
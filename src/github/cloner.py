@@ -3,15 +3,77 @@ GitHub repository cloner.
 Clones repos locally for building and screenshot capture.
 """
 
+import functools
+import os
 import subprocess
 import shutil
+import sys
 from pathlib import Path
-from typing import Optional
+from typing import Dict, List, Optional
 from dataclasses import dataclass
 import re
 
 
-@dataclass
+# owner/repo part of HTTPS and SSH GitHub URLs
+HTTPS_REPO_RE = re.compile(r'github\.com/([^/]+/[^/]+?)(?:\.git)?$')
+SSH_REPO_RE = re.compile(r'github\.com[:/]([^/]+/[^/]+?)(?:\.git)?$')
+
+# What GitHubAnalyzer.analyze_local reads, as non-cone sparse-checkout
+# patterns (anchored to the repo root with a leading /)
+METADATA_FILES = [
+    '/README.md', '/CLAUDE.md', '/package.json', '/web/package.json',
+    '/shared/constants/colors.json', '/src/constants/colors.json', '/constants/colors.json',
+    '/tailwind.config.js', '/tailwind.config.ts', '/src/styles/theme.json',
+    '/ios/*.xcodeproj/',
+]
+
+
+@functools.lru_cache(maxsize=512)
+def _parse_repo_cached(repo: str) -> tuple[Optional[str], str]:
+    """
+    Parse a repository identifier into URL and name (pure, so memoized).
+    
+    Returns:
+        Tuple of (clone_url, repo_name)
+    """
+    # Already a full URL
+    if repo.startswith("https://"):
+        # Extract repo name from URL
+        match = HTTPS_REPO_RE.search(repo)
+        if match:
+            full_name = match.group(1)
+            repo_name = full_name.split('/')[-1]
+            # Ensure .git suffix for cloning
+            if not repo.endswith('.git'):
+                repo = repo + '.git'
+            return repo, repo_name
+        return None, repo
+    
+    # SSH URL
+    if repo.startswith("git@"):
+        match = SSH_REPO_RE.search(repo)
+        if match:
+            full_name = match.group(1)
+            repo_name = full_name.split('/')[-1]
+            return repo, repo_name
+        return None, repo
+    
+    # owner/repo format
+    if '/' in repo and not repo.startswith('/'):
+        parts = repo.split('/')
+        if len(parts) == 2:
+            owner, name = parts
+            url = f"https://github.com/{owner}/{name}.git"
+            return url, name
+    
+    return None, repo
+
+
+# slots=True needs Python 3.10; older versions keep per-instance dicts
+_DATACLASS_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(frozen=True, **_DATACLASS_SLOTS)
 class CloneResult:
     """Result of a clone operation."""
     success: bool
@@ -91,7 +153,8 @@ class GitHubCloner:
         cmd = ["git", "clone"]
         
         if shallow:
-            cmd.extend(["--depth", "1"])
+            # One commit of one branch, without tag refs
+            cmd.extend(["--depth", "1", "--single-branch", "--no-tags"])
         
         if branch:
             cmd.extend(["--branch", branch])
@@ -138,6 +201,115 @@ class GitHubCloner:
                 error=str(e)
             )
     
+    def clone_metadata_only(self,
+                            repo: str,
+                            files_needed: List[str] = None,
+                            branch: str = None) -> CloneResult:
+        """
+        Clone just enough of a repository to analyze it.
+        
+        Uses a blobless, shallow, sparse clone: only the commit and trees are
+        fetched up front, and only files matching files_needed are
+        materialized, so the transfer barely depends on repository size.
+        The clone goes to <workspace>/<name>.meta and is always made fresh.
+        
+        Args:
+            repo: Repository identifier (same formats as clone())
+            files_needed: Sparse-checkout patterns. Defaults to METADATA_FILES
+            branch: Specific branch to clone (optional)
+        
+        Returns:
+            CloneResult with success status and local path
+        """
+        repo_url, repo_name = self._parse_repo(repo)
+        
+        if not repo_url:
+            return CloneResult(
+                success=False,
+                local_path=None,
+                repo_name=repo,
+                error=f"Could not parse repository: {repo}"
+            )
+        
+        local_path = self.workspace_dir / f"{repo_name}.meta"
+        if local_path.exists():
+            shutil.rmtree(local_path)
+        
+        cmd = ["git", "clone", "--filter=blob:none", "--sparse", "--depth", "1"]
+        if branch:
+            cmd.extend(["--branch", branch])
+        cmd.extend([repo_url, str(local_path)])
+        
+        print(f"Cloning metadata: {repo_url}")
+        
+        try:
+            result = subprocess.run(cmd, capture_output=True, text=True, timeout=300)
+            if result.returncode == 0:
+                # Non-cone mode so individual files and globs can be listed
+                result = subprocess.run(
+                    ["git", "sparse-checkout", "set", "--no-cone", *(files_needed or METADATA_FILES)],
+                    cwd=local_path,
+                    capture_output=True,
+                    text=True,
+                    timeout=300
+                )
+        except subprocess.TimeoutExpired:
+            return CloneResult(
+                success=False,
+                local_path=None,
+                repo_name=repo_name,
+                error="Clone operation timed out"
+            )
+        except Exception as e:
+            return CloneResult(
+                success=False,
+                local_path=None,
+                repo_name=repo_name,
+                error=str(e)
+            )
+        
+        if result.returncode != 0:
+            return CloneResult(
+                success=False,
+                local_path=None,
+                repo_name=repo_name,
+                error=result.stderr
+            )
+        
+        return CloneResult(
+            success=True,
+            local_path=str(local_path),
+            repo_name=repo_name
+        )
+    
+    def list_tree(self, local_path: str) -> List[Dict]:
+        """
+        List every path at HEAD without needing a working tree.
+        
+        Works on blobless/sparse clones, since trees are always fetched.
+        The entries have the shape GitHubAnalyzer.analyze_from_tree expects.
+        
+        Returns:
+            List of {'path': ..., 'type': 'blob' | 'tree'} dicts
+        """
+        result = subprocess.run(
+            ["git", "ls-tree", "-r", "-t", "--full-tree", "HEAD"],
+            cwd=local_path,
+            capture_output=True,
+            text=True
+        )
+        if result.returncode != 0:
+            return []
+        
+        entries = []
+        for line in result.stdout.splitlines():
+            # "<mode> <type> <object>\t<path>"
+            meta, _, path = line.partition('\t')
+            parts = meta.split()
+            if len(parts) == 3 and parts[1] in ('blob', 'tree'):
+                entries.append({'path': path, 'type': parts[1]})
+        return entries
+    
     def _parse_repo(self, repo: str) -> tuple[Optional[str], str]:
         """
         Parse a repository identifier into URL and name.
@@ -145,46 +317,20 @@ class GitHubCloner:
         Returns:
             Tuple of (clone_url, repo_name)
         """
-        # Already a full URL
-        if repo.startswith("https://"):
-            # Extract repo name from URL
-            match = re.search(r'github\.com/([^/]+/[^/]+?)(?:\.git)?$', repo)
-            if match:
-                full_name = match.group(1)
-                repo_name = full_name.split('/')[-1]
-                # Ensure .git suffix for cloning
-                if not repo.endswith('.git'):
-                    repo = repo + '.git'
-                return repo, repo_name
-            return None, repo
-        
-        # SSH URL
-        if repo.startswith("git@"):
-            match = re.search(r'github\.com[:/]([^/]+/[^/]+?)(?:\.git)?$', repo)
-            if match:
-                full_name = match.group(1)
-                repo_name = full_name.split('/')[-1]
-                return repo, repo_name
-            return None, repo
-        
-        # owner/repo format
-        if '/' in repo and not repo.startswith('/'):
-            parts = repo.split('/')
-            if len(parts) == 2:
-                owner, name = parts
-                url = f"https://github.com/{owner}/{name}.git"
-                return url, name
-        
-        return None, repo
+        return _parse_repo_cached(repo)
     
     def _pull(self, local_path: Path, branch: str = None) -> bool:
         """Pull latest changes in an existing repo."""
         try:
-            # Fetch
+            # Fetch only what the reset below needs; the output is never read
+            fetch_cmd = ["git", "fetch", "origin"]
+            if branch:
+                fetch_cmd.append(branch)
             subprocess.run(
-                ["git", "fetch", "--all"],
+                fetch_cmd,
                 cwd=local_path,
-                capture_output=True,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
                 timeout=60
             )
             
@@ -193,8 +339,8 @@ class GitHubCloner:
             result = subprocess.run(
                 ["git", "reset", "--hard", target],
                 cwd=local_path,
-                capture_output=True,
-                text=True,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
                 timeout=60
             )
             
@@ -223,10 +369,13 @@ class GitHubCloner:
     
     def list_cloned(self) -> list[str]:
         """List all cloned repositories."""
-        if not self.workspace_dir.exists():
+        # One listing; DirEntry.is_dir uses the cached d_type, so the only
+        # per-entry syscall left is the .git check
+        try:
+            with os.scandir(self.workspace_dir) as it:
+                return [
+                    entry.name for entry in it
+                    if entry.is_dir() and os.path.exists(os.path.join(entry.path, ".git"))
+                ]
+        except OSError:
             return []
-        
-        return [
-            d.name for d in self.workspace_dir.iterdir() 
-            if d.is_dir() and (d / ".git").exists()
-        ]
@@ -1,5 +1,17 @@
-from .device_frame import DeviceFrame
-from .background import BackgroundGenerator
-from .composer import MockupComposer
+from importlib import import_module
 
 __all__ = ['DeviceFrame', 'BackgroundGenerator', 'MockupComposer']
+
+# Exports are imported on first access, so loading a light submodule
+# (e.g. presets) doesn't drag in PIL and the compositor
+_EXPORTS = {
+    'DeviceFrame': '.device_frame',
+    'BackgroundGenerator': '.background',
+    'MockupComposer': '.composer',
+}
+
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        return getattr(import_module(_EXPORTS[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
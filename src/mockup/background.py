@@ -3,11 +3,31 @@ Abstract background generator for mockups.
 Creates flowing gradients and organic shapes that complement the app colors.
 """
 
-from PIL import Image, ImageDraw, ImageFilter
+from PIL import Image, ImageDraw, ImageFilter, ImageOps
 from typing import List, Tuple, Optional
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import functools
+import hashlib
 import math
 import random
 
+try:
+    import numba
+except ImportError:  # Optional: compiled kernel for the mesh gradient
+    numba = None
+
+
+# Blurs at least this wide run on a 1/BLUR_DOWNSCALE canvas and are scaled
+# back up; their output is smooth enough that nothing is lost
+SOFT_BLUR_MIN_RADIUS = 20
+BLUR_DOWNSCALE = 4
+
+# Backgrounds kept per generator for repeat requests (same style, colors and,
+# for 'expand', source image); a 2400x2400 background takes ~23 MB
+BACKGROUND_CACHE_SIZE = 4
+
 
 class BackgroundGenerator:
     """Generate beautiful abstract backgrounds for device mockups."""
@@ -15,11 +35,26 @@ class BackgroundGenerator:
     def __init__(self, width: int = 2400, height: int = 2400):
         self.width = width
         self.height = height
+        self._cache = OrderedDict()
+    
+    @functools.cached_property
+    def _axes(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Pixel row and column coordinates, shaped (H, 1) and (1, W) to broadcast."""
+        ys = np.arange(self.height, dtype=np.float32)[:, None]
+        xs = np.arange(self.width, dtype=np.float32)[None, :]
+        return ys, xs
+    
+    @functools.cached_property
+    def _unit_axes(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Row and column coordinates scaled to [0, 1): y / height, x / width."""
+        ys, xs = self._axes
+        return ys / self.height, xs / self.width
     
     def generate(self,
                 colors: List[Tuple[int, int, int]],
                 style: str = "mesh",
-                source_image: Image.Image = None) -> Image.Image:
+                source_image: Image.Image = None,
+                copy: bool = True) -> Image.Image:
         """
         Generate a background with the given color palette.
 
@@ -27,10 +62,54 @@ class BackgroundGenerator:
             colors: List of RGB colors to use
             style: Background style - 'mesh', 'gradient', 'aurora', 'soft', 'flowing', 'waves', 'expand'
             source_image: Optional source image for 'expand' style
+            copy: Return a private copy. Pass False to get the cached image
+                itself, which callers must not modify (e.g. to convert it)
 
         Returns:
-            Generated background image
+            Generated background image (opaque RGBA)
         """
+        key = self._cache_key(colors, style, source_image)
+        cached = self._cache.get(key)
+        if cached is None:
+            # Seed from the request so the random layout is reproducible:
+            # the same inputs give the same background, cached or not. A
+            # private generator, so the caller's random state is left alone
+            rng = random.Random(int.from_bytes(
+                hashlib.blake2b(repr(key).encode(), digest_size=8).digest(), 'big'))
+            
+            # Work on a list copy; palettes may be shared (frozen) tuples
+            cached = self._generate_style(list(colors), style, source_image, rng)
+            
+            # Hand out opaque RGBA so callers can composite onto it as is;
+            # putalpha fills the alpha band in place instead of converting
+            if cached.mode != 'RGBA':
+                cached.putalpha(255)
+            self._cache[key] = cached
+            if len(self._cache) > BACKGROUND_CACHE_SIZE:
+                self._cache.popitem(last=False)
+        else:
+            self._cache.move_to_end(key)
+        
+        # Callers may draw on the result; keep the cached copy clean
+        return cached.copy() if copy else cached
+    
+    def _cache_key(self,
+                   colors: List[Tuple[int, int, int]],
+                   style: str,
+                   source_image: Optional[Image.Image]) -> tuple:
+        """Key identifying a generate() request, hashing the source for 'expand'."""
+        source_key = None
+        if style == "expand" and source_image:
+            digest = hashlib.blake2b(source_image.tobytes(), digest_size=16).digest()
+            source_key = (source_image.mode, source_image.size, digest)
+        return (style, tuple(tuple(int(v) for v in c) for c in colors), source_key)
+    
+    def _generate_style(self,
+                        colors: List[Tuple[int, int, int]],
+                        style: str,
+                        source_image: Optional[Image.Image],
+                        rng: Optional[random.Random] = None) -> Image.Image:
+        """Dispatch to the generator for a style (mesh if unknown)."""
         if style == "expand" and source_image:
             return self._generate_expand(source_image, colors)
         elif style == "mesh":
@@ -38,11 +117,11 @@ class BackgroundGenerator:
         elif style == "gradient":
             return self._generate_gradient(colors)
         elif style == "aurora":
-            return self._generate_aurora(colors)
+            return self._generate_aurora(colors, rng)
         elif style == "soft":
             return self._generate_soft(colors)
         elif style == "glass":
-            return self._generate_glass(colors)
+            return self._generate_glass(colors, rng)
         elif style == "sunset":
             return self._generate_sunset(colors)
         elif style == "ocean":
@@ -59,15 +138,25 @@ class BackgroundGenerator:
         # Start with a gradient base
         img = self._generate_gradient(colors[:2] if len(colors) >= 2 else colors + colors)
         
-        # Add flowing organic shapes
-        for i, color in enumerate(colors[:4]):
-            # Create multiple layers of flowing shapes
-            shape_layer = self._create_flowing_shape(
-                color=(*color, 60 + i * 20),  # Varying opacity
-                seed=i * 42,
-                scale=0.8 - (i * 0.15)
+        # Add flowing organic shapes. The layers are independent and PIL
+        # releases the GIL while blurring and resizing, so build them in
+        # parallel, then composite in order
+        shape_specs = [
+            (
+                (*color, 60 + i * 20),  # Varying opacity
+                i * 42,
+                0.8 - (i * 0.15),
             )
-            img = Image.alpha_composite(img.convert('RGBA'), shape_layer)
+            for i, color in enumerate(colors[:4])
+        ]
+        with ThreadPoolExecutor(max_workers=max(1, len(shape_specs))) as executor:
+            shape_layers = list(executor.map(
+                lambda spec: self._create_flowing_shape(*spec), shape_specs))
+        
+        for shape_layer in shape_layers:
+            # The base is opaque: a masked paste blends exactly like
+            # alpha_composite, without the RGBA round trip
+            img.paste(shape_layer, (0, 0), shape_layer)
         
         # Apply subtle blur for softness
         img = img.filter(ImageFilter.GaussianBlur(radius=3))
@@ -79,66 +168,60 @@ class BackgroundGenerator:
                              seed: int = 0,
                              scale: float = 1.0) -> Image.Image:
         """Create a single flowing organic shape."""
-        random.seed(seed)
+        # A private generator: layers are built concurrently, and seeding
+        # the shared one would also reset it for the caller
+        rng = random.Random(seed)
         
-        layer = Image.new('RGBA', (self.width, self.height), (0, 0, 0, 0))
-        draw = ImageDraw.Draw(layer)
+        k = BLUR_DOWNSCALE
+        mask = self._new_mask()
+        draw = ImageDraw.Draw(mask)
         
         # Generate bezier-like flowing path
-        center_x = self.width * (0.3 + random.random() * 0.4)
-        center_y = self.height * (0.3 + random.random() * 0.4)
+        center_x = self.width * (0.3 + rng.random() * 0.4)
+        center_y = self.height * (0.3 + rng.random() * 0.4)
         
         # Create organic blob using multiple overlapping ellipses
-        num_ellipses = random.randint(8, 15)
+        num_ellipses = rng.randint(8, 15)
         
         for _ in range(num_ellipses):
             # Random position around center
-            offset_x = (random.random() - 0.5) * self.width * 0.5 * scale
-            offset_y = (random.random() - 0.5) * self.height * 0.5 * scale
+            offset_x = (rng.random() - 0.5) * self.width * 0.5 * scale
+            offset_y = (rng.random() - 0.5) * self.height * 0.5 * scale
             
             x = center_x + offset_x
             y = center_y + offset_y
             
             # Random ellipse dimensions
-            w = random.randint(int(200 * scale), int(600 * scale))
-            h = random.randint(int(300 * scale), int(800 * scale))
+            w = rng.randint(int(200 * scale), int(600 * scale))
+            h = rng.randint(int(300 * scale), int(800 * scale))
             
             # Draw ellipse
             draw.ellipse(
-                [x - w, y - h, x + w, y + h],
-                fill=color
+                [(x - w) / k, (y - h) / k, (x + w) / k, (y + h) / k],
+                fill=255
             )
         
         # Heavy blur to blend shapes together
-        layer = layer.filter(ImageFilter.GaussianBlur(radius=80))
-        
-        return layer
+        return self._layer_from_mask(mask, 80, color)
     
     def _generate_gradient(self, colors: List[Tuple[int, int, int]]) -> Image.Image:
         """Generate a smooth gradient background."""
-        img = Image.new('RGB', (self.width, self.height))
-        
         if len(colors) < 2:
             colors = colors + [(255, 255, 255)]
         
-        c1, c2 = colors[0], colors[1]
-        
-        # Create diagonal gradient
-        for y in range(self.height):
-            for x in range(self.width):
-                # Diagonal interpolation factor
-                factor = (x / self.width + y / self.height) / 2
-                
-                r = int(c1[0] + (c2[0] - c1[0]) * factor)
-                g = int(c1[1] + (c2[1] - c1[1]) * factor)
-                b = int(c1[2] + (c2[2] - c1[2]) * factor)
-                
-                img.putpixel((x, y), (r, g, b))
+        # Diagonal interpolation factor, broadcast from a column and a row
+        # and quantized to a grayscale ramp; colorize maps that ramp onto
+        # c1..c2 with a lookup table instead of blending every pixel
+        ys, xs = self._unit_axes
+        factor = Image.fromarray(((xs + ys) * 127.5).astype(np.uint8))
         
-        return img
+        return ImageOps.colorize(factor, colors[0], colors[1])
     
-    def _generate_blobs(self, colors: List[Tuple[int, int, int]]) -> Image.Image:
+    def _generate_blobs(self,
+                        colors: List[Tuple[int, int, int]],
+                        rng: Optional[random.Random] = None) -> Image.Image:
         """Generate soft blob shapes."""
+        rng = rng or random.Random()
         # Start with lightest color as base
         base_color = self._lighten_color(colors[0], 0.8) if colors else (240, 240, 240)
         img = Image.new('RGBA', (self.width, self.height), (*base_color, 255))
@@ -147,9 +230,9 @@ class BackgroundGenerator:
         for i, color in enumerate(colors[:5]):
             blob = self._create_blob(
                 color=(*color, 40 + i * 15),
-                x=random.randint(0, self.width),
-                y=random.randint(0, self.height),
-                size=random.randint(400, 1000)
+                x=rng.randint(0, self.width),
+                y=rng.randint(0, self.height),
+                size=rng.randint(400, 1000)
             )
             img = Image.alpha_composite(img, blob)
         
@@ -169,22 +252,30 @@ class BackgroundGenerator:
         )
         
         # Blur to soften
-        layer = layer.filter(ImageFilter.GaussianBlur(radius=size // 3))
+        layer = self._soft_blur(layer, size // 3)
         
         return layer
     
     def _generate_waves(self, colors: List[Tuple[int, int, int]]) -> Image.Image:
         """Generate wave-like flowing patterns."""
-        img = Image.new('RGBA', (self.width, self.height), (255, 255, 255, 255))
+        img = Image.new('RGB', (self.width, self.height), (255, 255, 255))
         
-        for i, color in enumerate(colors[:3]):
-            wave_layer = self._create_wave_layer(
-                color=(*color, 80),
-                frequency=0.005 + i * 0.002,
-                amplitude=200 + i * 50,
-                phase=i * math.pi / 3
+        # Independent layers, built in parallel like the flowing shapes
+        wave_specs = [
+            (
+                (*color, 80),
+                0.005 + i * 0.002,  # frequency
+                200 + i * 50,  # amplitude
+                i * math.pi / 3,  # phase
             )
-            img = Image.alpha_composite(img, wave_layer)
+            for i, color in enumerate(colors[:3])
+        ]
+        with ThreadPoolExecutor(max_workers=max(1, len(wave_specs))) as executor:
+            wave_layers = list(executor.map(
+                lambda spec: self._create_wave_layer(*spec), wave_specs))
+        
+        for wave_layer in wave_layers:
+            img.paste(wave_layer, (0, 0), wave_layer)
         
         img = img.filter(ImageFilter.GaussianBlur(radius=5))
         return img
@@ -195,27 +286,68 @@ class BackgroundGenerator:
                           amplitude: float,
                           phase: float) -> Image.Image:
         """Create a single wave layer."""
-        layer = Image.new('RGBA', (self.width, self.height), (0, 0, 0, 0))
-        draw = ImageDraw.Draw(layer)
+        k = BLUR_DOWNSCALE
+        mask = self._new_mask()
+        draw = ImageDraw.Draw(mask)
         
-        # Create wave polygon
-        points = []
-        
-        # Top edge follows wave
-        for x in range(0, self.width + 10, 10):
-            y = self.height // 2 + int(math.sin(x * frequency + phase) * amplitude)
-            points.append((x, y))
+        # Create wave polygon; its top edge follows the wave, sampled every
+        # 10 px in one vectorized pass and scaled down to the mask
+        xs = np.arange(0, self.width + 10, 10)
+        ys = self.height // 2 + (np.sin(xs * frequency + phase) * amplitude).astype(int)
+        points = list(zip((xs / k).tolist(), (ys / k).tolist()))
         
         # Complete polygon by going to bottom
-        points.append((self.width, self.height))
-        points.append((0, self.height))
+        points.append((self.width / k, self.height / k))
+        points.append((0, self.height / k))
         
-        draw.polygon(points, fill=color)
+        draw.polygon(points, fill=255)
         
         # Blur for softness
-        layer = layer.filter(ImageFilter.GaussianBlur(radius=30))
+        return self._layer_from_mask(mask, 30, color)
+    
+    def _new_mask(self) -> Image.Image:
+        """Blank one-channel mask at 1/BLUR_DOWNSCALE of the canvas size."""
+        return Image.new('L', (max(1, self.width // BLUR_DOWNSCALE),
+                               max(1, self.height // BLUR_DOWNSCALE)), 0)
+    
+    def _layer_from_mask(self,
+                         mask: Image.Image,
+                         radius: float,
+                         color: Tuple[int, int, int, int]) -> Image.Image:
+        """
+        Blur a _new_mask() shape by radius (in canvas pixels), scale it to the
+        canvas and fill it with color.
         
-        return layer
+        Single-color shapes under a heavy blur lose everything finer than a
+        few pixels, so they are drawn and blurred at reduced size and only
+        the final upscale runs at full size.
+        """
+        mask = mask.filter(ImageFilter.GaussianBlur(radius=radius / BLUR_DOWNSCALE))
+        mask = mask.resize((self.width, self.height), Image.Resampling.BILINEAR)
+        
+        # Blurring a transparent layer mixes its transparent black into the
+        # color too, so every channel, not just alpha, scales with the mask
+        return Image.merge('RGBA', [
+            mask.point(lambda v, c=c: v * c // 255) for c in color
+        ])
+    
+    def _stretch(self, img: Image.Image) -> Image.Image:
+        """
+        Repeat a one-pixel-wide column or one-pixel-tall row across the canvas.
+        The copy happens inside PIL, so no canvas-sized array is built (and
+        copied again) in NumPy.
+        """
+        return img.resize((self.width, self.height), Image.Resampling.NEAREST)
+    
+    def _soft_blur(self, img: Image.Image, radius: float) -> Image.Image:
+        """Gaussian blur, run at reduced size for large radii."""
+        if radius < SOFT_BLUR_MIN_RADIUS:
+            return img.filter(ImageFilter.GaussianBlur(radius=radius))
+        
+        # Box-average down (reduce is the cheapest resize), blur, scale back
+        small = img.reduce(BLUR_DOWNSCALE)
+        small = small.filter(ImageFilter.GaussianBlur(radius=radius / BLUR_DOWNSCALE))
+        return small.resize(img.size, Image.Resampling.BILINEAR)
     
     def _lighten_color(self, color: Tuple[int, int, int], factor: float) -> Tuple[int, int, int]:
         """Lighten a color by mixing with white."""
@@ -263,20 +395,26 @@ class BackgroundGenerator:
 
         # Apply very heavy blur to remove all detail
         blur_radius = min(self.width, self.height) // 8  # ~150px for 1200px canvas
-        expanded = expanded.filter(ImageFilter.GaussianBlur(radius=blur_radius))
-        expanded = expanded.filter(ImageFilter.GaussianBlur(radius=blur_radius // 2))  # Second pass
+        # Two Gaussian passes (blur_radius, then half of it) compose into one
+        # whose radius is their hypotenuse
+        expanded = self._soft_blur(expanded, math.hypot(blur_radius, blur_radius // 2))
+
+        # The overlays are flat colors over an opaque image, so each is a
+        # per-channel v * keep + offset; both fold into one lookup table and
+        # a single pass over the pixels
 
         # Optional: Add subtle darkening overlay so the sharp device pops
-        overlay = Image.new('RGBA', (self.width, self.height), (0, 0, 0, 40))
-        expanded = Image.alpha_composite(expanded.convert('RGBA'), overlay)
+        keep = 1 - 40 / 255
+        offsets = (0.0, 0.0, 0.0)
 
         # Optional: Add subtle color tint from extracted colors for cohesion
         if colors:
-            tint_color = colors[0]
-            tint = Image.new('RGBA', (self.width, self.height), (*tint_color, 20))
-            expanded = Image.alpha_composite(expanded, tint)
+            tint_alpha = 20 / 255
+            keep *= 1 - tint_alpha
+            offsets = tuple(c * tint_alpha for c in colors[0])
 
-        return expanded.convert('RGB')
+        lut = [int(v * keep + offset + 0.5) for offset in offsets for v in range(256)]
+        return expanded.point(lut)
 
     def _generate_mesh(self, colors: List[Tuple[int, int, int]]) -> Image.Image:
         """Generate a smooth mesh gradient - clean, professional look."""
@@ -284,8 +422,6 @@ class BackgroundGenerator:
         while len(colors) < 4:
             colors = colors + [self._lighten_color(colors[0], 0.3)]
 
-        img = Image.new('RGB', (self.width, self.height))
-
         # Create smooth multi-point gradient using distance-based blending
         # Place color points at corners and edges
         points = [
@@ -296,33 +432,38 @@ class BackgroundGenerator:
             (self.width // 2, self.height // 2, self._lighten_color(colors[0], 0.4)),
         ]
 
-        for y in range(self.height):
-            for x in range(self.width):
-                # Calculate weighted average based on distance to each point
-                total_weight = 0
-                r, g, b = 0.0, 0.0, 0.0
-
-                for px, py, color in points:
-                    # Use inverse distance weighting with power for smoothness
-                    dist = math.sqrt((x - px) ** 2 + (y - py) ** 2) + 1
-                    weight = 1 / (dist ** 1.5)
-                    total_weight += weight
-                    r += color[0] * weight
-                    g += color[1] * weight
-                    b += color[2] * weight
-
-                img.putpixel((x, y), (
-                    int(r / total_weight),
-                    int(g / total_weight),
-                    int(b / total_weight)
-                ))
+        if numba is not None:
+            point_xs = np.array([p[0] for p in points], dtype=np.float64)
+            point_ys = np.array([p[1] for p in points], dtype=np.float64)
+            point_colors = np.array([p[2] for p in points], dtype=np.float64)
+            img = Image.fromarray(
+                _mesh_kernel(self.height, self.width, point_xs, point_ys, point_colors))
+        else:
+            # Weighted average of the point colors, accumulated one point at
+            # a time so the temporaries stay canvas-sized
+            ys, xs = self._axes
+            total_weight = np.zeros((self.height, self.width), dtype=np.float32)
+            rgb = np.zeros((self.height, self.width, 3), dtype=np.float32)
+
+            for px, py, color in points:
+                # Use inverse distance weighting with power for smoothness
+                dist = np.hypot(xs - px, ys - py) + 1
+                weight = 1 / (dist * np.sqrt(dist))
+                total_weight += weight
+                rgb += weight[:, :, None] * np.array(color, dtype=np.float32)
+
+            rgb /= total_weight[:, :, None]
+            img = Image.fromarray(rgb.astype(np.uint8))
 
         # Subtle blur for extra smoothness
         img = img.filter(ImageFilter.GaussianBlur(radius=2))
         return img
 
-    def _generate_aurora(self, colors: List[Tuple[int, int, int]]) -> Image.Image:
+    def _generate_aurora(self,
+                         colors: List[Tuple[int, int, int]],
+                         rng: Optional[random.Random] = None) -> Image.Image:
         """Generate aurora/northern lights style - smooth vertical bands."""
+        rng = rng or random.Random()
         # Light base color
         base = self._lighten_color(colors[0], 0.85) if colors else (245, 245, 250)
         img = Image.new('RGB', (self.width, self.height), base)
@@ -331,27 +472,27 @@ class BackgroundGenerator:
         num_bands = 3
         band_width = self.width // num_bands
 
-        for i, color in enumerate(colors[:num_bands]):
-            band_img = Image.new('RGBA', (self.width, self.height), (0, 0, 0, 0))
-            draw = ImageDraw.Draw(band_img)
+        # Gaussian falloff from each band's center, widened by the radius-50
+        # blur the bands used to get: the blur of a Gaussian profile is a
+        # wider, lower Gaussian, and a band is constant down each column
+        falloff = band_width * 0.4
+        spread = math.hypot(falloff, 50)
+        peak = 60 * falloff / spread
+        xs = self._axes[1][0]
 
+        for i, color in enumerate(colors[:num_bands]):
             # Position band with some randomness
-            center_x = int(band_width * (i + 0.5) + (random.random() - 0.5) * band_width * 0.3)
-
-            # Draw vertical gradient band
-            for x in range(self.width):
-                # Gaussian falloff from center
-                dist = abs(x - center_x)
-                alpha = int(60 * math.exp(-(dist ** 2) / (2 * (band_width * 0.4) ** 2)))
+            center_x = int(band_width * (i + 0.5) + (rng.random() - 0.5) * band_width * 0.3)
 
-                if alpha > 0:
-                    draw.line([(x, 0), (x, self.height)], fill=(*color, alpha))
+            # One row holds the band's alpha profile; every row is the same
+            row = np.empty((1, self.width, 4), dtype=np.uint8)
+            row[..., :3] = color
+            row[..., 3] = peak * np.exp(-(xs - center_x) ** 2 / (2 * spread ** 2))
 
-            # Heavy vertical blur
-            band_img = band_img.filter(ImageFilter.GaussianBlur(radius=50))
-            img = Image.alpha_composite(img.convert('RGBA'), band_img)
+            band_img = self._stretch(Image.fromarray(row))
+            img.paste(band_img, (0, 0), band_img)
 
-        return img.convert('RGB')
+        return img
 
     def _generate_soft(self, colors: List[Tuple[int, int, int]]) -> Image.Image:
         """Generate a soft, subtle background - minimal and clean."""
@@ -370,39 +511,44 @@ class BackgroundGenerator:
             overlay = Image.new('RGBA', (self.width, self.height), (0, 0, 0, 0))
             draw = ImageDraw.Draw(overlay)
 
-            # Subtle corner accent
-            for i in range(self.width // 2):
-                alpha = int(25 * (1 - i / (self.width // 2)))
-                if alpha > 0:
-                    # Bottom right corner glow
-                    draw.ellipse([
-                        self.width - i * 3,
-                        self.height - i * 3,
-                        self.width + i,
-                        self.height + i
-                    ], fill=(*accent, alpha))
-
-            overlay = overlay.filter(ImageFilter.GaussianBlur(radius=100))
-            img = Image.alpha_composite(img.convert('RGBA'), overlay).convert('RGB')
+            # Subtle corner accent. The glow's circles each contain the one
+            # before and draw replaces (doesn't blend) pixels, so the largest
+            # circle with a visible alpha alone decides the layer
+            steps = self.width // 2
+            i = steps - 1
+            while i >= 0 and int(25 * (1 - i / steps)) <= 0:
+                i -= 1
+            if i >= 0:
+                alpha = int(25 * (1 - i / steps))
+                # Bottom right corner glow
+                draw.ellipse([
+                    self.width - i * 3,
+                    self.height - i * 3,
+                    self.width + i,
+                    self.height + i
+                ], fill=(*accent, alpha))
+
+            overlay = self._soft_blur(overlay, 100)
+            img.paste(overlay, (0, 0), overlay)
 
         return img
 
-    def _generate_glass(self, colors: List[Tuple[int, int, int]]) -> Image.Image:
+    def _generate_glass(self,
+                        colors: List[Tuple[int, int, int]],
+                        rng: Optional[random.Random] = None) -> Image.Image:
         """Generate frosted glass effect - modern and elegant."""
+        rng = rng or random.Random()
         # Create base with primary color, very light
         base = self._lighten_color(colors[0], 0.7) if colors else (230, 235, 240)
         img = Image.new('RGB', (self.width, self.height), base)
 
-        # Add noise texture for frosted effect
-        noise = Image.new('RGB', (self.width, self.height))
-        for y in range(self.height):
-            for x in range(self.width):
-                variation = random.randint(-8, 8)
-                noise.putpixel((x, y), (
-                    max(0, min(255, base[0] + variation)),
-                    max(0, min(255, base[1] + variation)),
-                    max(0, min(255, base[2] + variation))
-                ))
+        # Add noise texture for frosted effect: one variation per pixel, the
+        # same for all three channels. Seeded from rng so a seeded rng still
+        # makes the output repeatable.
+        noise_rng = np.random.default_rng(rng.getrandbits(64))
+        variation = noise_rng.integers(-8, 9, size=(self.height, self.width, 1), dtype=np.int16)
+        noise_arr = np.clip(np.array(base, dtype=np.int16) + variation, 0, 255)
+        noise = Image.fromarray(noise_arr.astype(np.uint8))
 
         noise = noise.filter(ImageFilter.GaussianBlur(radius=3))
 
@@ -411,14 +557,14 @@ class BackgroundGenerator:
             draw = ImageDraw.Draw(overlay)
 
             for i, color in enumerate(colors[:3]):
-                x = random.randint(0, self.width)
-                y = random.randint(0, self.height)
-                size = random.randint(600, 1200)
+                x = rng.randint(0, self.width)
+                y = rng.randint(0, self.height)
+                size = rng.randint(600, 1200)
                 draw.ellipse([x - size, y - size, x + size, y + size],
                             fill=(*color, 20))
 
-            overlay = overlay.filter(ImageFilter.GaussianBlur(radius=200))
-            noise = Image.alpha_composite(noise.convert('RGBA'), overlay).convert('RGB')
+            overlay = self._soft_blur(overlay, 200)
+            noise.paste(overlay, (0, 0), overlay)
 
         return noise
 
@@ -434,22 +580,10 @@ class BackgroundGenerator:
         if colors:
             sunset_colors[0] = self._blend_colors(sunset_colors[0], colors[0], 0.3)
 
-        img = Image.new('RGB', (self.width, self.height))
-
-        for y in range(self.height):
-            factor = y / self.height
-            if factor < 0.33:
-                t = factor / 0.33
-                color = self._blend_colors(sunset_colors[0], sunset_colors[1], t)
-            elif factor < 0.66:
-                t = (factor - 0.33) / 0.33
-                color = self._blend_colors(sunset_colors[1], sunset_colors[2], t)
-            else:
-                t = (factor - 0.66) / 0.34
-                color = self._blend_colors(sunset_colors[2], sunset_colors[3], t)
-
-            for x in range(self.width):
-                img.putpixel((x, y), color)
+        # Vertical gradient: blend one column, then repeat it across
+        factor = self._unit_axes[0]
+        column = self._blend_stops(sunset_colors, factor).astype(np.uint8)
+        img = self._stretch(Image.fromarray(column))
 
         img = img.filter(ImageFilter.GaussianBlur(radius=2))
         return img
@@ -466,23 +600,14 @@ class BackgroundGenerator:
         if colors:
             ocean_colors[1] = self._blend_colors(ocean_colors[1], colors[0], 0.3)
 
-        img = Image.new('RGB', (self.width, self.height))
-
-        for y in range(self.height):
-            for x in range(self.width):
-                factor = (x / self.width * 0.3 + y / self.height * 0.7)
-
-                if factor < 0.33:
-                    t = factor / 0.33
-                    color = self._blend_colors(ocean_colors[0], ocean_colors[1], t)
-                elif factor < 0.66:
-                    t = (factor - 0.33) / 0.33
-                    color = self._blend_colors(ocean_colors[1], ocean_colors[2], t)
-                else:
-                    t = (factor - 0.66) / 0.34
-                    color = self._blend_colors(ocean_colors[2], ocean_colors[3], t)
-
-                img.putpixel((x, y), color)
+        # The color depends only on the diagonal factor: quantize it to a
+        # grayscale ramp and map that through a 256-entry table per channel,
+        # so only 256 colors are blended instead of one per pixel
+        ys, xs = self._unit_axes
+        factor = Image.fromarray(((xs * 0.3 + ys * 0.7) * 255 + 0.5).astype(np.uint8))
+        levels = np.arange(256, dtype=np.float32) / 255
+        lut = self._blend_stops(ocean_colors, levels).astype(np.uint8)
+        img = Image.merge('RGB', [factor.point(lut[:, c].tolist()) for c in range(3)])
 
         img = img.filter(ImageFilter.GaussianBlur(radius=2))
         return img
@@ -495,3 +620,50 @@ class BackgroundGenerator:
             int(c1[1] + (c2[1] - c1[1]) * factor),
             int(c1[2] + (c2[2] - c1[2]) * factor)
         )
+
+    def _blend_stops(self, stops: List[Tuple[int, int, int]],
+                     factor: np.ndarray) -> np.ndarray:
+        """
+        Blend four color stops, placed at 0, 0.33 and 0.66 (ending at 1),
+        at every factor in an array; returns factor.shape + (3,) floats.
+        """
+        stops = np.array(stops, dtype=np.float32)
+        starts = np.array([0.0, 0.33, 0.66], dtype=np.float32)
+        widths = np.array([0.33, 0.33, 0.34], dtype=np.float32)
+        # Per-segment color change, with the 1 / width of t folded in
+        slopes = (stops[1:] - stops[:-1]) / widths[:, None]
+
+        # Segment each factor falls in, and how far into it
+        segment = (factor >= 0.33).astype(np.intp) + (factor >= 0.66)
+        offset = (factor - starts[segment])[..., None]
+
+        return stops[segment] + slopes[segment] * offset
+
+
+if numba is not None:
+    # Serial for the same reason as the color extractor's kernel: numba's
+    # parallel threading layers can hang once cmd_batch has forked workers
+    @numba.njit(fastmath=True, cache=True)
+    def _mesh_kernel(height, width, point_xs, point_ys, point_colors):
+        """Compiled inverse-distance blend of the mesh points, one pixel per iteration."""
+        out = np.empty((height, width, 3), np.uint8)
+        n = point_xs.shape[0]
+        for y in range(height):
+            for x in range(width):
+                total_weight = 0.0
+                r = 0.0
+                g = 0.0
+                b = 0.0
+                for j in range(n):
+                    dx = x - point_xs[j]
+                    dy = y - point_ys[j]
+                    dist = np.sqrt(dx * dx + dy * dy) + 1.0
+                    weight = 1.0 / (dist * np.sqrt(dist))
+                    total_weight += weight
+                    r += point_colors[j, 0] * weight
+                    g += point_colors[j, 1] * weight
+                    b += point_colors[j, 2] * weight
+                out[y, x, 0] = int(r / total_weight)
+                out[y, x, 1] = int(g / total_weight)
+                out[y, x, 2] = int(b / total_weight)
+        return out
@@ -3,49 +3,75 @@ Mockup composer - brings together device frames, screenshots, and backgrounds.
 """
 
 from PIL import Image
-from typing import Tuple, Optional, List, Dict
+from typing import Tuple, Optional, List
 from pathlib import Path
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+import hashlib
+import os
+import threading
 
 from .device_frame import DeviceFrame
 from .background import BackgroundGenerator
-from ..analysis.color_extractor import ColorExtractor
+from .presets import PLATFORM_PRESETS
+from ..analysis.color_extractor import ColorExtractor, resolve_colors
 
 
-# Platform-optimized presets
-PLATFORM_PRESETS: Dict[str, Dict] = {
-    "twitter": {
-        "size": (1200, 1500),  # 4:5 aspect ratio - fills mobile feed
-        "device_scale": 0.82,  # Larger phone for visibility
-        "description": "Optimized for Twitter/X single image (4:5)"
-    },
-    "twitter4": {
-        "size": (1200, 1200),  # 1:1 aspect ratio - for 4-image grid
-        "device_scale": 0.72,  # Smaller to fit full phone in square
-        "description": "Twitter/X 4-image grid (1:1, full phone visible)"
-    },
-    "instagram": {
-        "size": (1080, 1350),  # 4:5 aspect ratio - Instagram optimal
-        "device_scale": 0.82,
-        "description": "Optimized for Instagram feed (4:5)"
-    },
-    "square": {
-        "size": (1200, 1200),  # 1:1 - universal
-        "device_scale": 0.75,
-        "description": "Square format - works everywhere (1:1)"
-    },
-    "story": {
-        "size": (1080, 1920),  # 9:16 - stories/reels
-        "device_scale": 0.70,
-        "description": "Stories/Reels format (9:16)"
-    },
-    "wide": {
-        "size": (1600, 900),  # 16:9 - desktop/YouTube thumbnails
-        "device_scale": 0.85,
-        "description": "Wide format for desktop/thumbnails (16:9)"
-    },
+# Most devices create_multi_device_mockup decodes and renders in parallel;
+# Pillow releases the GIL while decoding, resizing, blurring and rotating
+MAX_RENDER_WORKERS = 4
+
+# Framed, shadowed, scaled and rotated devices kept per composer, so rendering
+# a screenshot again (e.g. with another background style) skips all of that
+DEVICE_SPRITE_CACHE_SIZE = 8
+
+# Rotations up to this many degrees resample with BILINEAR; the difference
+# from BICUBIC is invisible on a small, shadow-softened device
+BILINEAR_ROTATION_MAX_ANGLE = 20
+
+# Multi-device layouts: (layout, device count) -> (positions, scales, angles).
+# Positions are device centers as canvas fractions, scales are device height
+# as a canvas fraction, angles are degrees. Counts above 3 use the 3 entry.
+DEVICE_LAYOUTS = {
+    ("stacked", 1): (((0.5, 0.5),), (0.75,), (0,)),
+    ("stacked", 2): (((0.3, 0.6), (0.7, 0.4)), (0.55, 0.55), (-5, 5)),
+    ("stacked", 3): (((0.2, 0.7), (0.5, 0.4), (0.8, 0.6)), (0.4, 0.4, 0.4), (-8, 0, 8)),
+    ("side-by-side", 1): (((0.5, 0.5),), (0.75,), (0,)),
+    ("side-by-side", 2): (((0.3, 0.5), (0.7, 0.5)), (0.5, 0.5), (0, 0)),
+    ("side-by-side", 3): (((0.2, 0.5), (0.5, 0.5), (0.8, 0.5)), (0.4, 0.4, 0.4), (0, 0, 0)),
+    ("carousel", 1): (((0.5, 0.5),), (0.75,), (0,)),
+    ("carousel", 2): (((0.35, 0.5), (0.65, 0.5)), (0.5, 0.5), (0, 0)),
+    ("carousel", 3): (((0.15, 0.55), (0.5, 0.45), (0.85, 0.55)), (0.4, 0.5, 0.4), (-15, 0, 15)),
 }
 
 
+def _load_screenshot(path: str) -> Image.Image:
+    """Decode a screenshot as RGBA."""
+    return Image.open(path).convert('RGBA')
+
+
+def _rotate(image: Image.Image, angle: float) -> Image.Image:
+    """Rotate a device mockup, expanding the canvas to fit it."""
+    # Unrotated devices (single mockups, middle of three) skip the resample
+    if angle % 360 == 0:
+        return image
+    if abs(angle) <= BILINEAR_ROTATION_MAX_ANGLE:
+        resample = Image.Resampling.BILINEAR
+    else:
+        resample = Image.Resampling.BICUBIC
+    return image.rotate(angle, expand=True, resample=resample)
+
+
+def _composite_at(background: Image.Image, overlay: Image.Image, position: Tuple[int, int]) -> None:
+    """Alpha-composite overlay onto background in place, clipped to the canvas."""
+    x, y = position
+    left, top = max(0, -x), max(0, -y)
+    right = min(overlay.size[0], background.size[0] - x)
+    bottom = min(overlay.size[1], background.size[1] - y)
+    if right > left and bottom > top:
+        background.alpha_composite(overlay, dest=(x + left, y + top), source=(left, top, right, bottom))
+
+
 class MockupComposer:
     """
     Composes final mockup images from screenshots.
@@ -82,6 +108,8 @@ class MockupComposer:
 
         self.device_frame = DeviceFrame(device=device, assets_path=assets_path)
         self.background_gen = BackgroundGenerator(*self.output_size)
+        self._device_sprite_cache = OrderedDict()
+        self._device_sprite_lock = threading.Lock()
     
     def create_mockup(self,
                      screenshot_path: str = None,
@@ -119,6 +147,9 @@ class MockupComposer:
         # Extract colors from screenshot
         if custom_colors:
             colors = custom_colors
+        elif screenshot_path:
+            # Memoized and cached on disk by content hash, so reruns are free
+            colors = resolve_colors(screenshot_path=screenshot_path)
         else:
             extractor = ColorExtractor(image=screenshot)
             colors = extractor.get_complementary_colors()
@@ -129,36 +160,21 @@ class MockupComposer:
             style=background_style,
             source_image=screenshot if background_style == "expand" else None
         )
-        background = background.convert('RGBA')
         
-        # Create device mockup with screenshot
-        device_mockup = self.device_frame.composite_screenshot(
-            screenshot,
-            add_shadow=True,
+        # Create device mockup with screenshot at its on-canvas size
+        device_height = int(self.output_size[1] * device_scale)
+        device_mockup = self._render_device(
+            screenshot, device_height, device_angle,
             shadow_offset=(40, 50),
             shadow_blur=80
         )
         
-        # Scale device to fit
-        device_height = int(self.output_size[1] * device_scale)
-        aspect_ratio = device_mockup.size[0] / device_mockup.size[1]
-        device_width = int(device_height * aspect_ratio)
-        device_mockup = device_mockup.resize((device_width, device_height), Image.Resampling.LANCZOS)
-        
-        # Rotate if needed
-        if device_angle != 0:
-            device_mockup = device_mockup.rotate(
-                device_angle, 
-                expand=True, 
-                resample=Image.Resampling.BICUBIC
-            )
-        
         # Calculate position
         pos_x = int((self.output_size[0] - device_mockup.size[0]) * device_position[0])
         pos_y = int((self.output_size[1] - device_mockup.size[1]) * device_position[1])
         
         # Composite device onto background
-        background.paste(device_mockup, (pos_x, pos_y), device_mockup)
+        _composite_at(background, device_mockup, (pos_x, pos_y))
         
         return background
     
@@ -181,106 +197,90 @@ class MockupComposer:
             raise ValueError("At least one screenshot required")
         
         # Extract colors from first screenshot for consistent background
-        extractor = ColorExtractor(image_path=screenshots[0])
-        colors = extractor.get_complementary_colors()
+        colors = resolve_colors(screenshot_path=screenshots[0])
         
         # Generate background
         background = self.background_gen.generate(colors, style=background_style)
-        background = background.convert('RGBA')
         
         # Position devices based on layout
-        positions = self._get_layout_positions(len(screenshots), layout)
-        scales = self._get_layout_scales(len(screenshots), layout)
-        angles = self._get_layout_angles(len(screenshots), layout)
+        positions, scales, angles = self._get_layout(len(screenshots), layout)
         
-        for i, screenshot_path in enumerate(screenshots):
-            screenshot = Image.open(screenshot_path).convert('RGBA')
-            
-            # Create device mockup
-            device_mockup = self.device_frame.composite_screenshot(
-                screenshot,
-                add_shadow=True,
+        def render(i: int, screenshot_path: str) -> Image.Image:
+            device_height = int(self.output_size[1] * scales[i])
+            return self._render_device(
+                _load_screenshot(screenshot_path), device_height, angles[i],
                 shadow_offset=(30, 40),
                 shadow_blur=60
             )
-            
-            # Scale
-            scale = scales[i]
-            device_height = int(self.output_size[1] * scale)
-            aspect_ratio = device_mockup.size[0] / device_mockup.size[1]
-            device_width = int(device_height * aspect_ratio)
-            device_mockup = device_mockup.resize((device_width, device_height), Image.Resampling.LANCZOS)
-            
-            # Rotate
-            if angles[i] != 0:
-                device_mockup = device_mockup.rotate(
-                    angles[i],
-                    expand=True,
-                    resample=Image.Resampling.BICUBIC
-                )
-            
+        
+        # Decode and render the devices in parallel, then composite them in order
+        workers = min(len(screenshots), MAX_RENDER_WORKERS, os.cpu_count() or 1)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            sprites = list(executor.map(render, range(len(screenshots)), screenshots))
+        
+        for i, device_mockup in enumerate(sprites):
             # Position
             pos = positions[i]
             pos_x = int((self.output_size[0] - device_mockup.size[0]) * pos[0])
             pos_y = int((self.output_size[1] - device_mockup.size[1]) * pos[1])
             
             # Composite
-            background.paste(device_mockup, (pos_x, pos_y), device_mockup)
+            _composite_at(background, device_mockup, (pos_x, pos_y))
         
         return background
     
-    def _get_layout_positions(self, count: int, layout: str) -> List[Tuple[float, float]]:
-        """Get device positions for a layout."""
-        if layout == "stacked":
-            if count == 1:
-                return [(0.5, 0.5)]
-            elif count == 2:
-                return [(0.3, 0.6), (0.7, 0.4)]
-            else:
-                return [(0.2, 0.7), (0.5, 0.4), (0.8, 0.6)]
-        elif layout == "side-by-side":
-            if count == 1:
-                return [(0.5, 0.5)]
-            elif count == 2:
-                return [(0.3, 0.5), (0.7, 0.5)]
-            else:
-                return [(0.2, 0.5), (0.5, 0.5), (0.8, 0.5)]
-        elif layout == "carousel":
-            if count == 1:
-                return [(0.5, 0.5)]
-            elif count == 2:
-                return [(0.35, 0.5), (0.65, 0.5)]
-            else:
-                return [(0.15, 0.55), (0.5, 0.45), (0.85, 0.55)]
-        return [(0.5, 0.5)] * count
-    
-    def _get_layout_scales(self, count: int, layout: str) -> List[float]:
-        """Get device scales for a layout."""
-        if count == 1:
-            return [0.75]
-        elif count == 2:
-            if layout == "stacked":
-                return [0.55, 0.55]
-            return [0.5, 0.5]
-        else:
-            if layout == "carousel":
-                return [0.4, 0.5, 0.4]
-            return [0.4, 0.4, 0.4]
+    def _render_device(self, screenshot: Image.Image, device_height: int, angle: float,
+                       shadow_offset: Tuple[int, int], shadow_blur: int) -> Image.Image:
+        """
+        Frame, shadow, scale and rotate a screenshot into a device sprite.
+        
+        Sprites are cached by screenshot content and render settings; the
+        result may be shared, so callers must not modify it.
+        """
+        digest = hashlib.blake2b(screenshot.tobytes(), digest_size=16).digest()
+        key = (screenshot.mode, screenshot.size, digest, device_height, angle, shadow_offset, shadow_blur)
+        with self._device_sprite_lock:
+            sprite = self._device_sprite_cache.get(key)
+            if sprite is not None:
+                self._device_sprite_cache.move_to_end(key)
+                return sprite
+        
+        sprite = self.device_frame.composite_screenshot(
+            screenshot,
+            add_shadow=True,
+            shadow_offset=shadow_offset,
+            shadow_blur=shadow_blur,
+            target_height=device_height
+        )
+        
+        # Scale device to fit (only needed when enlarging past native size)
+        if sprite.size[1] != device_height:
+            aspect_ratio = sprite.size[0] / sprite.size[1]
+            device_width = int(device_height * aspect_ratio)
+            sprite = sprite.resize((device_width, device_height), Image.Resampling.LANCZOS)
+        
+        # Rotate if needed
+        sprite = _rotate(sprite, angle)
+        
+        with self._device_sprite_lock:
+            self._device_sprite_cache[key] = sprite
+            if len(self._device_sprite_cache) > DEVICE_SPRITE_CACHE_SIZE:
+                self._device_sprite_cache.popitem(last=False)
+        return sprite
     
-    def _get_layout_angles(self, count: int, layout: str) -> List[float]:
-        """Get device rotation angles for a layout."""
-        if layout == "stacked":
-            if count == 2:
-                return [-5, 5]
-            elif count >= 3:
-                return [-8, 0, 8]
-        elif layout == "carousel":
-            if count >= 3:
-                return [-15, 0, 15]
-        return [0] * count
+    def _get_layout(self, count: int, layout: str) -> Tuple[tuple, tuple, tuple]:
+        """Get device positions, scales and rotation angles for a layout."""
+        key = (layout, min(count, 3))
+        if key in DEVICE_LAYOUTS:
+            return DEVICE_LAYOUTS[key]
+        
+        # Unknown layout: centered, unrotated devices at the side-by-side sizes
+        scales = DEVICE_LAYOUTS[("side-by-side", min(count, 3))][1]
+        return ((0.5, 0.5),) * count, scales, (0,) * count
     
     def save(self, image: Image.Image, output_path: str, 
-             format: str = "PNG", quality: int = 95) -> str:
+             format: str = "PNG", quality: int = 95,
+             compress_level: int = 1) -> str:
         """
         Save the mockup to a file.
         
@@ -289,6 +289,8 @@ class MockupComposer:
             output_path: Path to save to
             format: Image format (PNG, JPEG, WEBP)
             quality: Quality for lossy formats
+            compress_level: PNG zlib level, 0-9. The default 1 encodes several
+                times faster than Pillow's 6 for files about 1.5x larger
         
         Returns:
             Path to saved file
@@ -300,5 +302,19 @@ class MockupComposer:
             # Convert to RGB for JPEG
             image = image.convert('RGB')
         
-        image.save(output, format=format, quality=quality)
+        # Write then rename, so a file at output_path is always complete even
+        # if the process dies mid-save (the pipelines reuse existing outputs)
+        tmp_path = output.with_name(f".{output.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            if format.upper() == "PNG":
+                image.save(tmp_path, format=format, compress_level=compress_level)
+            elif format.upper() == "WEBP":
+                # method=0 is libwebp's fastest encoder setting
+                image.save(tmp_path, format=format, quality=quality, method=0)
+            else:
+                image.save(tmp_path, format=format, quality=quality)
+            os.replace(tmp_path, output)
+        finally:
+            if tmp_path.exists():
+                tmp_path.unlink()
         return str(output)
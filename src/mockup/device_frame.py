@@ -7,7 +7,12 @@ from PIL import Image, ImageDraw, ImageFilter
 from pathlib import Path
 from typing import Tuple, Optional
 from dataclasses import dataclass
+import functools
 import math
+import os
+import threading
+
+import numpy as np
 
 
 @dataclass
@@ -24,6 +29,22 @@ class DeviceSpec:
 # Default assets directory
 ASSETS_DIR = Path(__file__).parent.parent.parent / "assets" / "frames"
 
+# Serializes frame loading so threads rendering at once share one load
+_FRAME_LOCK = threading.Lock()
+
+# (device, assets path) pairs whose frame source has been reported; the
+# report comes from first use, so the silent background preload prints nothing
+_ANNOUNCED_FRAMES = set()
+
+# Devices whose PNG frames are decoded in the background at import, so the
+# first mockup doesn't wait on it (procedural frames are built on first use)
+PRELOAD_DEVICES = ("iphone_16_pro_max", "iphone_17_pro_max")
+
+# Shadows blurred at least this much are blurred at 1/SHADOW_DOWNSCALE size;
+# a wide Gaussian has no fine detail, so upscaling the result is invisible
+SHADOW_DOWNSCALE = 4
+SHADOW_DOWNSCALE_MIN_RADIUS = 20
+
 
 # iPhone 15 Pro Max - for use with real PNG frame
 # Screen coordinates are for the webmobilefirst.com mockup (938x1926 frame)
@@ -68,30 +89,30 @@ class DeviceFrame:
     """Handles device frame rendering and screenshot compositing."""
     
     def __init__(self, device: str = "iphone_17_pro_max", assets_path: str = None):
-        self.device_spec = DEVICE_CATALOG.get(device, IPHONE_17_PRO_MAX)
+        self.device = device if device in DEVICE_CATALOG else "iphone_17_pro_max"
+        self.device_spec = DEVICE_CATALOG[self.device]
         self.assets_path = Path(assets_path) if assets_path else ASSETS_DIR
         self._frame_image = None
         self._using_png_frame = False
 
-    def get_frame(self) -> Image.Image:
-        """Get or generate the device frame."""
-        if self._frame_image:
-            return self._frame_image.copy()
-
-        # Check for PNG frame asset
-        if self.device_spec.frame_path:
-            frame_file = self.assets_path / self.device_spec.frame_path
-            if frame_file.exists():
-                print(f"Loading device frame: {frame_file}")
-                self._frame_image = Image.open(frame_file).convert('RGBA')
-                self._using_png_frame = True
-                return self._frame_image.copy()
-
-        # Generate procedural frame as fallback
-        print("Using procedural device frame (no PNG found)")
-        self._frame_image = self._generate_frame()
-        self._using_png_frame = False
-        return self._frame_image.copy()
+    def get_frame(self, readonly: bool = False) -> Image.Image:
+        """
+        Get or generate the device frame.
+        
+        Args:
+            readonly: Return the shared frame itself instead of a copy; the
+                caller must not modify it
+        """
+        if self._frame_image is None:
+            with _FRAME_LOCK:
+                self._frame_image, self._using_png_frame = _load_frame(self.device, self.assets_path)
+                if (self.device, self.assets_path) not in _ANNOUNCED_FRAMES:
+                    _ANNOUNCED_FRAMES.add((self.device, self.assets_path))
+                    if self._using_png_frame:
+                        print(f"Loading device frame: {self.assets_path / self.device_spec.frame_path}")
+                    else:
+                        print("Using procedural device frame (no PNG found)")
+        return self._frame_image if readonly else self._frame_image.copy()
 
     @property
     def using_png_frame(self) -> bool:
@@ -101,7 +122,9 @@ class DeviceFrame:
     def composite_screenshot(self, screenshot: Image.Image, 
                             add_shadow: bool = True,
                             shadow_offset: Tuple[int, int] = (30, 40),
-                            shadow_blur: int = 60) -> Image.Image:
+                            shadow_blur: int = 60,
+                            target_height: Optional[int] = None,
+                            high_quality_shadow: bool = False) -> Image.Image:
         """
         Place a screenshot into the device frame.
         
@@ -110,29 +133,61 @@ class DeviceFrame:
             add_shadow: Whether to add a drop shadow
             shadow_offset: X, Y offset for shadow
             shadow_blur: Blur radius for shadow
+            target_height: Height of the finished mockup (shadow included). When
+                smaller than the native size, everything is composited at that
+                size instead of being resized afterwards.
+            high_quality_shadow: Blur the shadow at full resolution
         
         Returns:
             Device mockup with screenshot composited
         """
-        frame = self.get_frame()
+        frame = self.get_frame(readonly=True)
         spec = self.device_spec
+        screen_size = spec.screen_size
+        screen_offset = spec.screen_offset
+        corner_radius = spec.corner_radius - 10
         
-        # Resize screenshot to fit screen area
-        screenshot_resized = screenshot.resize(spec.screen_size, Image.Resampling.LANCZOS)
+        padding = shadow_blur * 3 if add_shadow else 0
+        scale = target_height / (frame.size[1] + padding * 2) if target_height else 1
+        if scale < 1:
+            frame = _scaled_frame(self.device, self.assets_path, round(frame.size[1] * scale))
+            scale_x = frame.size[0] / self._frame_image.size[0]
+            scale_y = frame.size[1] / self._frame_image.size[1]
+            screen_size = (round(screen_size[0] * scale_x), round(screen_size[1] * scale_y))
+            screen_offset = (round(screen_offset[0] * scale_x), round(screen_offset[1] * scale_y))
+            corner_radius = round(corner_radius * scale_y)
+            shadow_offset = (round(shadow_offset[0] * scale_x), round(shadow_offset[1] * scale_y))
+            shadow_blur = max(1, round(shadow_blur * scale_y))
         
-        # Apply corner radius mask to screenshot
-        screenshot_masked = self._apply_corner_mask(screenshot_resized, spec.corner_radius - 10)
+        # Resize screenshot to fit screen area
+        screenshot_resized = screenshot.resize(screen_size, Image.Resampling.LANCZOS)
         
-        # Composite screenshot into frame
-        frame.paste(screenshot_masked, spec.screen_offset, screenshot_masked)
+        if self._using_png_frame:
+            # The PNG's alpha already cuts out the screen, so slide the screenshot behind it
+            base = Image.new('RGBA', frame.size, (0, 0, 0, 0))
+            base.paste(screenshot_resized, screen_offset)
+            frame = Image.alpha_composite(base, frame)
+        else:
+            # Apply corner radius mask to screenshot
+            screenshot_masked = self._apply_corner_mask(screenshot_resized, corner_radius)
+            
+            # Composite screenshot over a copy of the (shared) frame
+            frame = frame.copy()
+            frame.alpha_composite(screenshot_masked, dest=screen_offset)
         
         if add_shadow:
-            frame = self._add_shadow(frame, shadow_offset, shadow_blur)
+            frame = self._add_shadow(frame, shadow_offset, shadow_blur, high_quality_shadow)
         
         return frame
     
-    def _generate_frame(self) -> Image.Image:
-        """Generate a realistic procedural iPhone device frame."""
+    def _generate_frame(self, transparent_screen: bool = False) -> Image.Image:
+        """
+        Generate a realistic procedural iPhone device frame.
+        
+        Args:
+            transparent_screen: Leave the screen area transparent instead of
+                black, for overlaying the frame on top of a video
+        """
         spec = self.device_spec
 
         # Calculate frame dimensions with proper bezel proportions
@@ -190,7 +245,7 @@ class DeviceFrame:
             [screen_left, screen_top,
              screen_left + spec.screen_size[0] - 1, screen_top + spec.screen_size[1] - 1],
             radius=spec.corner_radius - 18,
-            fill=(0, 0, 0, 255)
+            fill=(0, 0, 0, 0) if transparent_screen else (0, 0, 0, 255)
         )
 
         # Add Dynamic Island (proportional to screen size)
@@ -252,35 +307,19 @@ class DeviceFrame:
     def _add_edge_reflections(self, frame: Image.Image, body_left: int,
                                frame_width: int, frame_height: int, spec: DeviceSpec) -> None:
         """Add subtle edge reflections for metallic look."""
-        # Create a gradient overlay for the top edge
-        overlay = Image.new('RGBA', frame.size, (0, 0, 0, 0))
-        draw = ImageDraw.Draw(overlay)
-
-        # Top highlight gradient (subtle)
-        for i in range(8):
-            alpha = int(25 - i * 3)
-            if alpha > 0:
-                y = i
-                color = (255, 255, 255, alpha)
-                draw.line(
-                    [(body_left + spec.corner_radius, y),
-                     (frame_width - spec.corner_radius, y)],
-                    fill=color,
-                    width=1
-                )
+        # Top highlight gradient (subtle): one white row per line, fading out
+        left = body_left + spec.corner_radius
+        width = frame_width - spec.corner_radius - left + 1
+        alphas = np.clip(25 - np.arange(8) * 3, 0, 255).astype(np.uint8)
+        strip = np.full((len(alphas), width, 4), 255, dtype=np.uint8)
+        strip[:, :, 3] = alphas[:, None]
 
         # Composite overlay
-        frame.alpha_composite(overlay)
+        frame.alpha_composite(Image.fromarray(strip, 'RGBA'), dest=(left, 0))
     
     def _apply_corner_mask(self, image: Image.Image, radius: int) -> Image.Image:
         """Apply rounded corner mask to an image."""
-        mask = Image.new('L', image.size, 0)
-        draw = ImageDraw.Draw(mask)
-        draw.rounded_rectangle(
-            [0, 0, image.size[0] - 1, image.size[1] - 1],
-            radius=radius,
-            fill=255
-        )
+        mask = _rounded_mask(image.size[0], image.size[1], radius)
         
         # Apply mask
         output = image.copy()
@@ -289,30 +328,111 @@ class DeviceFrame:
     
     def _add_shadow(self, image: Image.Image,
                    offset: Tuple[int, int],
-                   blur_radius: int) -> Image.Image:
+                   blur_radius: int,
+                   high_quality: bool = False) -> Image.Image:
         """Add a simple floating drop shadow behind the device."""
         # Generous padding so shadow can taper naturally
         padding = blur_radius * 3
         new_width = image.size[0] + padding * 2
         new_height = image.size[1] + padding * 2
 
-        # Create canvas
-        result = Image.new('RGBA', (new_width, new_height), (0, 0, 0, 0))
-
-        # Create shadow from device alpha channel
-        shadow_shape = Image.new('RGBA', image.size, (0, 0, 0, 40))
+        # Shadow strength from the device alpha channel: capped at 40, then
+        # weighted by itself (as pasting the shadow through its own alpha did).
+        # The shadow is black, so only its alpha plane needs building and blurring
         if image.mode == 'RGBA':
-            shadow_shape.putalpha(
-                Image.eval(image.split()[3], lambda a: min(a, 40))
-            )
-
+            device_alpha = np.minimum(np.asarray(image.getchannel('A')), 40).astype(np.uint16)
+        else:
+            device_alpha = np.full((image.size[1], image.size[0]), 40, dtype=np.uint16)
+        weighted = device_alpha * device_alpha + 128
+        
         # Place shadow with offset
-        result.paste(shadow_shape, (padding + offset[0], padding + offset[1]), shadow_shape)
-
-        # Blur for soft falloff
-        result = result.filter(ImageFilter.GaussianBlur(blur_radius))
+        alpha = np.zeros((new_height, new_width), dtype=np.uint8)
+        left, top = padding + offset[0], padding + offset[1]
+        alpha[top:top + image.size[1], left:left + image.size[0]] = (weighted + (weighted >> 8)) >> 8
+        shadow = Image.fromarray(alpha, 'L')
+
+        # Blur for soft falloff (at reduced size unless high quality is asked for)
+        if high_quality or blur_radius < SHADOW_DOWNSCALE_MIN_RADIUS:
+            shadow = shadow.filter(ImageFilter.GaussianBlur(blur_radius))
+        else:
+            small = shadow.reduce(SHADOW_DOWNSCALE)
+            small = small.filter(ImageFilter.GaussianBlur(blur_radius / SHADOW_DOWNSCALE))
+            shadow = small.resize(shadow.size, Image.Resampling.BILINEAR)
 
         # Place device on top
-        result.paste(image, (padding, padding), image)
+        result = Image.new('RGBA', shadow.size, (0, 0, 0, 0))
+        result.putalpha(shadow)
+        if image.mode != 'RGBA':
+            image = image.convert('RGBA')
+        result.alpha_composite(image, dest=(padding, padding))
 
         return result
+
+
+@functools.lru_cache(maxsize=8)
+def _load_frame(device: str, assets_path: Path) -> Tuple[Image.Image, bool]:
+    """
+    Load a device's PNG frame, or generate the procedural one, once per process.
+    Silent, so the import-time preload doesn't print; get_frame reports it.
+    
+    Returns:
+        The frame (shared, so callers must not modify it) and whether it is a PNG
+    """
+    spec = DEVICE_CATALOG[device]
+
+    # Check for PNG frame asset
+    if spec.frame_path:
+        frame_file = assets_path / spec.frame_path
+        if frame_file.exists():
+            return Image.open(frame_file).convert('RGBA'), True
+
+    # Generate procedural frame as fallback
+    return DeviceFrame(device, str(assets_path))._generate_frame(), False
+
+
+@functools.lru_cache(maxsize=8)
+def _scaled_frame(device: str, assets_path: Path, height: int) -> Image.Image:
+    """Downscale a device's frame to a height, once per process. Don't modify it."""
+    frame, _ = _load_frame(device, assets_path)
+    width = round(frame.size[0] * height / frame.size[1])
+    return frame.resize((width, height), Image.Resampling.LANCZOS)
+
+
+@functools.lru_cache(maxsize=8)
+def _rounded_mask(width: int, height: int, radius: int) -> Image.Image:
+    """Build (once per size) an anti-aliased rounded-rectangle 'L' mask. Don't modify it."""
+    radius = max(0, min(radius, width // 2, height // 2))
+    mask = np.full((height, width), 255, dtype=np.uint8)
+
+    # Coverage of the top-left corner tile from the distance to the corner circle's center
+    centers = radius - np.arange(radius) - 0.5
+    distance = np.hypot(centers[:, None], centers[None, :])
+    corner = (255 * np.clip(radius - distance + 0.5, 0, 1)).astype(np.uint8)
+
+    # Mirror it into all four corners
+    if radius:
+        mask[:radius, :radius] = corner
+        mask[:radius, -radius:] = corner[:, ::-1]
+        mask[-radius:, :radius] = corner[::-1, :]
+        mask[-radius:, -radius:] = corner[::-1, ::-1]
+    return Image.fromarray(mask, 'L')
+
+
+def _preload_frames() -> None:
+    """Decode the common devices' PNG frames into the frame cache."""
+    for device in PRELOAD_DEVICES:
+        frame_path = DEVICE_CATALOG[device].frame_path
+        if frame_path and (ASSETS_DIR / frame_path).exists():
+            with _FRAME_LOCK:
+                _load_frame(device, ASSETS_DIR)
+
+
+def _reset_frame_lock() -> None:
+    """Give a forked child a fresh lock; the preload thread doesn't survive the fork."""
+    global _FRAME_LOCK
+    _FRAME_LOCK = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_frame_lock)
+threading.Thread(target=_preload_frames, name="frame-preload", daemon=True).start()
@@ -0,0 +1,41 @@
+"""
+Platform presets for mockup output sizes.
+Kept free of image-processing imports so the CLI can list them cheaply.
+"""
+
+from typing import Dict
+
+
+# Platform-optimized presets
+PLATFORM_PRESETS: Dict[str, Dict] = {
+    "twitter": {
+        "size": (1200, 1500),  # 4:5 aspect ratio - fills mobile feed
+        "device_scale": 0.82,  # Larger phone for visibility
+        "description": "Optimized for Twitter/X single image (4:5)"
+    },
+    "twitter4": {
+        "size": (1200, 1200),  # 1:1 aspect ratio - for 4-image grid
+        "device_scale": 0.72,  # Smaller to fit full phone in square
+        "description": "Twitter/X 4-image grid (1:1, full phone visible)"
+    },
+    "instagram": {
+        "size": (1080, 1350),  # 4:5 aspect ratio - Instagram optimal
+        "device_scale": 0.82,
+        "description": "Optimized for Instagram feed (4:5)"
+    },
+    "square": {
+        "size": (1200, 1200),  # 1:1 - universal
+        "device_scale": 0.75,
+        "description": "Square format - works everywhere (1:1)"
+    },
+    "story": {
+        "size": (1080, 1920),  # 9:16 - stories/reels
+        "device_scale": 0.70,
+        "description": "Stories/Reels format (9:16)"
+    },
+    "wide": {
+        "size": (1600, 900),  # 16:9 - desktop/YouTube thumbnails
+        "device_scale": 0.85,
+        "description": "Wide format for desktop/thumbnails (16:9)"
+    },
+}
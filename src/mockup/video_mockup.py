@@ -2,26 +2,178 @@
 Video mockup generator - creates phone mockup videos from screen recordings.
 """
 
+import functools
+import os
+import re
 import subprocess
 import tempfile
 import shutil
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Tuple, Optional
+from typing import Tuple, Optional, Union
 from PIL import Image
 
+try:
+    import pic_scale
+except ImportError:  # Optional: SIMD Lanczos for scaling the device frame
+    pic_scale = None
+
 from .device_frame import DeviceFrame
 from .background import BackgroundGenerator
 from .composer import PLATFORM_PRESETS
 from ..analysis.color_extractor import ColorExtractor, resolve_colors
 
 
+# ffmpeg binaries, resolved once (absolute paths also skip the PATH search on
+# every subprocess launch); a missing ffprobe only matters for its fallback
+_FFMPEG = shutil.which("ffmpeg")
+_FFPROBE = shutil.which("ffprobe") or "ffprobe"
+
+# First video stream's size in ffmpeg's input summary, e.g.
+# "Stream #0:0[0x1](und): Video: h264 (High) (avc1 / 0x31637661), yuv420p, 590x1278 [SAR 1:1 ..."
+VIDEO_SIZE_PATTERN = re.compile(r"Stream #\S+.*?: Video: .*?\b(\d{2,5})x(\d{2,5})\b")
+# Container duration in the same summary, e.g. "Duration: 00:00:12.48, start: ..."
+DURATION_PATTERN = re.compile(r"Duration: (\d+):(\d{2}):(\d{2}(?:\.\d+)?)")
+
+# Output of stream mode: uncompressed video and audio in NUT, which carries
+# the stream parameters so a downstream ffmpeg needs no -video_size etc.
+STREAM_OUTPUT_ARGS = [
+    "-c:v", "rawvideo", "-pix_fmt", "yuv420p",
+    "-c:a", "pcm_s16le",
+    "-f", "nut",
+]
+
+# Longest side of the first frame when it is only used for color extraction
+# (the extractor clusters a 256px thumbnail anyway)
+COLOR_FRAME_MAX_DIM = 256
+
+
+@functools.lru_cache(maxsize=None)
+def _nvenc_available() -> bool:
+    """Check once whether ffmpeg can filter on CUDA and encode with NVENC here."""
+    try:
+        filters = subprocess.run(
+            [_FFMPEG, "-hide_banner", "-filters"],
+            capture_output=True, text=True, check=True
+        ).stdout
+        if "scale_cuda" not in filters or "overlay_cuda" not in filters:
+            return False
+
+        # The encoder being compiled in doesn't mean there is a GPU; try one frame
+        subprocess.run(
+            [_FFMPEG, "-hide_banner", "-v", "error",
+             "-f", "lavfi", "-i", "color=black:s=256x256",
+             "-frames:v", "1", "-c:v", "h264_nvenc", "-f", "null", "-"],
+            capture_output=True, check=True
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return False
+    return True
+
+
+@functools.lru_cache(maxsize=32)
+def _build_frame_overlay(device: str,
+                         output_size: Tuple[int, int],
+                         device_scale: float) -> Tuple[bytes, Tuple[int, int], Tuple[int, int],
+                                                       Tuple[int, int], Tuple[int, int]]:
+    """
+    Render the phone frame overlay for a canvas, once per process.
+
+    Only the scaled frame itself is rendered; ffmpeg places it on the canvas,
+    so the overlay filter blends the device's area instead of the full frame.
+
+    Returns:
+        (frame_overlay_rgba, frame_size, frame_position, screen_position, screen_size)
+    """
+    device_frame = DeviceFrame(device=device)
+
+    # Create frame without screenshot (transparent screen area)
+    frame = device_frame._generate_frame(transparent_screen=True)
+
+    # Get device spec for screen dimensions (generating the frame sets its offset)
+    spec = device_frame.device_spec
+
+    # Calculate scaled size for output
+    device_height = int(output_size[1] * device_scale)
+    aspect_ratio = frame.size[0] / frame.size[1]
+    device_width = int(device_height * aspect_ratio)
+
+    # Scale the frame (premultiplied, so the screen cutout's edges don't darken)
+    if pic_scale:
+        frame_scaled = pic_scale.resize(
+            frame, (device_width, device_height), pic_scale.Resampling.LANCZOS,
+            premultiply_alpha=True, workers=0
+        )
+    else:
+        frame_scaled = frame.resize((device_width, device_height), Image.Resampling.LANCZOS)
+
+    # Calculate position (centered)
+    pos_x = (output_size[0] - device_width) // 2
+    pos_y = (output_size[1] - device_height) // 2
+
+    # Calculate where the screen area is in the final output
+    scale_factor = device_height / frame.size[1]
+    screen_x = pos_x + int(spec.screen_offset[0] * scale_factor)
+    screen_y = pos_y + int(spec.screen_offset[1] * scale_factor)
+    screen_w = int(spec.screen_size[0] * scale_factor)
+    screen_h = int(spec.screen_size[1] * scale_factor)
+
+    return (frame_scaled.tobytes(), frame_scaled.size, (pos_x, pos_y),
+            (screen_x, screen_y), (screen_w, screen_h))
+
+
+@functools.lru_cache(maxsize=128)
+def _probe_dims(path: str, mtime: float, size: int) -> Tuple[int, int]:
+    """ffprobe a video's width and height (mtime and size invalidate the cache)."""
+    cmd = [
+        _FFPROBE,
+        "-v", "error",
+        "-select_streams", "v:0",
+        "-show_entries", "stream=width,height",
+        "-of", "csv=p=0",
+        path
+    ]
+    result = subprocess.run(cmd, capture_output=True, text=True, check=True)
+    width, height = result.stdout.strip().split(",")
+    return int(width), int(height)
+
+
+def _still_input(path: str, size: Tuple[int, int], duration: Optional[float] = None) -> list:
+    """
+    ffmpeg input args that loop a raw RGBA still for the length of the video.
+
+    With a known duration the loop stops there; otherwise the output needs
+    -shortest to end with the video.
+    """
+    limit = ["-t", f"{duration:.3f}"] if duration else []
+    return [
+        "-f", "rawvideo", "-pixel_format", "rgba",
+        "-video_size", f"{size[0]}x{size[1]}",
+        "-stream_loop", "-1", *limit, "-i", path
+    ]
+
+
 class VideoMockupGenerator:
     """Generate video mockups with phone frames and backgrounds."""
 
     def __init__(self,
                  device: str = "iphone_17_pro_max",
-                 platform: str = "twitter"):
+                 platform: str = "twitter",
+                 encode_preset: str = "veryfast",
+                 encode_crf: int = 22):
+        """
+        Args:
+            device: Device frame to composite the video into
+            platform: Platform preset for the output canvas
+            encode_preset: libx264 preset, from fastest/largest to
+                slowest/smallest: ultrafast, superfast, veryfast, faster, fast,
+                medium, slow, slower, veryslow, placebo
+            encode_crf: libx264 constant rate factor (lower is higher quality)
+        """
         self.device = device
+        self.encode_preset = encode_preset
+        self.encode_crf = encode_crf
         self.platform = platform
         self.preset = PLATFORM_PRESETS.get(platform, PLATFORM_PRESETS["twitter"])
         self.output_size = self.preset["size"]
@@ -31,14 +183,23 @@ class VideoMockupGenerator:
         self.background_gen = BackgroundGenerator(*self.output_size)
 
         # Check ffmpeg is available
-        if not shutil.which("ffmpeg"):
+        if not _FFMPEG:
             raise RuntimeError("ffmpeg is required for video mockups. Install with: brew install ffmpeg")
 
+        # Decode, scale, overlay and encode on an NVIDIA GPU when there is one
+        self.use_gpu = _nvenc_available()
+
+        # libx264 frame threads for the CPU encode
+        self.encode_threads = os.cpu_count() or 4
+
     def create_video_mockup(self,
                            input_video: str,
                            output_path: str = None,
                            background_style: str = "expand",
-                           colors: list = None) -> str:
+                           colors: list = None,
+                           encode_preset: Optional[str] = None,
+                           encode_crf: Optional[int] = None,
+                           stream: bool = False) -> Union[str, subprocess.Popen]:
         """
         Create a video mockup from a screen recording.
 
@@ -47,26 +208,57 @@ class VideoMockupGenerator:
             output_path: Output video path (optional)
             background_style: Background style to use
             colors: Custom colors (optional)
+            encode_preset: libx264 preset for this video (defaults to the
+                generator's; "veryfast" suits UI recordings, "medium" and
+                slower trade encode time for smaller files)
+            encode_crf: libx264 CRF for this video (defaults to the generator's)
+            stream: Skip encoding and return the running ffmpeg process, whose
+                stdout carries raw yuv420p video (and PCM audio) in NUT.
+                Chain it into another ffmpeg with ``-f nut -i pipe:0``.
 
         Returns:
-            Path to output video
+            Path to output video, or the ffmpeg process when streaming
         """
         input_path = Path(input_video)
         if not input_path.exists():
             raise FileNotFoundError(f"Video not found: {input_video}")
 
-        if not output_path:
+        if not output_path and not stream:
             output_path = input_path.parent / f"{input_path.stem}_mockup.mp4"
 
-        with tempfile.TemporaryDirectory() as temp_dir:
-            temp_path = Path(temp_dir)
+        # The stills must outlive this call when ffmpeg is still streaming
+        temp_dir = tempfile.TemporaryDirectory()
+        streaming = False
+        try:
+            temp_path = Path(temp_dir.name)
+
+            # Extract first frame for color extraction and expand background;
+            # the same ffmpeg run reports the video dimensions. The expand
+            # background is scaled to cover the canvas and blurred, so it never
+            # needs more than canvas resolution; colors need only a thumbnail
+            if background_style == "expand":
+                max_dim = max(self.output_size)
+            else:
+                max_dim = COLOR_FRAME_MAX_DIM
+            # BMP is written and read back without any compression pass
+            first_frame_path = temp_path / "first_frame.bmp"
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                extraction = executor.submit(
+                    self._extract_frame, input_video, str(first_frame_path),
+                    time=0, max_dim=max_dim
+                )
+
+                # Generate phone frame overlay (with transparent screen) while
+                # ffmpeg runs; it only depends on the device and canvas
+                (frame_overlay_rgba, frame_size, frame_position,
+                 screen_position, screen_size) = self._create_frame_overlay()
+                frame_overlay_path = temp_path / "frame_overlay.rgba"
+                frame_overlay_path.write_bytes(frame_overlay_rgba)
 
-            # Extract first frame for color extraction and expand background
-            first_frame_path = temp_path / "first_frame.png"
-            self._extract_frame(input_video, str(first_frame_path), time=0)
+                video_size, duration = extraction.result()
 
-            # Get video dimensions
-            video_width, video_height = self._get_video_dimensions(input_video)
+            # Get video dimensions (ask ffprobe if ffmpeg's summary didn't parse)
+            video_width, video_height = video_size or self._get_video_dimensions(input_video)
 
             # Resolve colors from first frame
             if not colors:
@@ -76,20 +268,32 @@ class VideoMockupGenerator:
             first_frame = Image.open(first_frame_path)
             if background_style == "expand":
                 background = self.background_gen.generate(
-                    colors, style="expand", source_image=first_frame
+                    colors, style="expand", source_image=first_frame, copy=False
                 )
             else:
-                background = self.background_gen.generate(colors, style=background_style)
+                background = self.background_gen.generate(colors, style=background_style, copy=False)
+
+            # Hand the stills to ffmpeg as raw RGBA, so neither side spends
+            # time on PNG compression for images that are read only once
+            background_path = temp_path / "background.rgba"
+            background_path.write_bytes(background.tobytes())
+
+            if stream:
+                cmd = self._cpu_composite_command(
+                    input_video, str(background_path), str(frame_overlay_path), "pipe:1",
+                    frame_size, frame_position, screen_position, screen_size,
+                    (video_width, video_height), duration, output_args=STREAM_OUTPUT_ARGS
+                )
+                process = subprocess.Popen(cmd, stdout=subprocess.PIPE)
 
-            background_path = temp_path / "background.png"
-            background.save(background_path)
+                # Remove the stills once ffmpeg is done reading them
+                def cleanup():
+                    process.wait()
+                    temp_dir.cleanup()
 
-            # Generate phone frame overlay (with transparent screen)
-            frame_overlay, screen_position, screen_size = self._create_frame_overlay(
-                video_width, video_height
-            )
-            frame_overlay_path = temp_path / "frame_overlay.png"
-            frame_overlay.save(frame_overlay_path)
+                threading.Thread(target=cleanup, daemon=True).start()
+                streaming = True
+                return process
 
             # Use ffmpeg to composite everything
             self._composite_video(
@@ -97,118 +301,235 @@ class VideoMockupGenerator:
                 background_path=str(background_path),
                 frame_overlay_path=str(frame_overlay_path),
                 output_path=str(output_path),
+                frame_size=frame_size,
+                frame_position=frame_position,
                 screen_position=screen_position,
-                screen_size=screen_size
+                screen_size=screen_size,
+                video_size=(video_width, video_height),
+                duration=duration,
+                encode_preset=encode_preset or self.encode_preset,
+                encode_crf=self.encode_crf if encode_crf is None else encode_crf
             )
+        finally:
+            if not streaming:
+                temp_dir.cleanup()
 
         return str(output_path)
 
-    def _extract_frame(self, video_path: str, output_path: str, time: float = 0):
-        """Extract a single frame from video."""
-        cmd = [
-            "ffmpeg", "-y",
-            "-ss", str(time),
+    def _extract_frame(self, video_path: str, output_path: str,
+                       time: float = 0,
+                       max_dim: Optional[int] = None) -> Tuple[Optional[Tuple[int, int]],
+                                                               Optional[float]]:
+        """
+        Extract a single frame from video.
+
+        Args:
+            video_path: Path to input video file
+            output_path: Image path to write the frame to
+            time: Timestamp of the frame in seconds
+            max_dim: Downscale (never upscale) so neither side exceeds this
+
+        Returns:
+            (video_size, duration) from ffmpeg's input summary; either is None
+            if it couldn't be parsed
+        """
+        cmd = [_FFMPEG, "-y", "-hide_banner", "-fflags", "+fastseek"]
+        if time:
+            cmd += ["-ss", str(time)]  # The first frame needs no seek
+        cmd += [
             "-i", video_path,
+            "-an", "-sn", "-dn",  # Don't set up audio, subtitle or data streams
             "-vframes", "1",
             "-q:v", "2",
-            output_path
         ]
-        subprocess.run(cmd, capture_output=True, check=True)
+        if max_dim:
+            cmd += ["-vf", f"scale='min(iw,{max_dim})':'min(ih,{max_dim})'"
+                           ":force_original_aspect_ratio=decrease"]
+        cmd.append(output_path)
+        result = subprocess.run(cmd, capture_output=True, check=True)
+        summary = result.stderr.decode(errors="replace")
+
+        match = VIDEO_SIZE_PATTERN.search(summary)
+        video_size = (int(match.group(1)), int(match.group(2))) if match else None
+
+        match = DURATION_PATTERN.search(summary)
+        duration = None
+        if match:
+            hours, minutes, seconds = match.groups()
+            duration = int(hours) * 3600 + int(minutes) * 60 + float(seconds)
+        return video_size, duration
 
     def _get_video_dimensions(self, video_path: str) -> Tuple[int, int]:
         """Get video width and height."""
-        cmd = [
-            "ffprobe",
-            "-v", "error",
-            "-select_streams", "v:0",
-            "-show_entries", "stream=width,height",
-            "-of", "csv=p=0",
-            video_path
-        ]
-        result = subprocess.run(cmd, capture_output=True, text=True, check=True)
-        width, height = result.stdout.strip().split(",")
-        return int(width), int(height)
+        stat = os.stat(video_path)
+        return _probe_dims(video_path, stat.st_mtime, stat.st_size)
 
-    def _create_frame_overlay(self,
-                              video_width: int,
-                              video_height: int) -> Tuple[Image.Image, Tuple[int, int], Tuple[int, int]]:
+    def _create_frame_overlay(self) -> Tuple[bytes, Tuple[int, int], Tuple[int, int],
+                                             Tuple[int, int], Tuple[int, int]]:
         """
-        Create the phone frame overlay positioned for the output canvas.
+        Create the phone frame overlay and its placement on the output canvas.
+
+        The video is fitted into the screen area later, so the overlay only
+        depends on the device and canvas and is rendered once per layout.
 
         Returns:
-            (frame_overlay_image, screen_position, screen_size)
+            (frame_overlay_rgba, frame_size, frame_position, screen_position, screen_size)
         """
-        # Get device spec for screen dimensions
-        spec = self.device_frame.device_spec
-
-        # Create frame without screenshot (transparent screen area)
-        frame = self.device_frame._generate_frame()
-
-        # Calculate scaled size for output
-        device_height = int(self.output_size[1] * self.device_scale)
-        aspect_ratio = frame.size[0] / frame.size[1]
-        device_width = int(device_height * aspect_ratio)
-
-        # Scale the frame
-        frame_scaled = frame.resize((device_width, device_height), Image.Resampling.LANCZOS)
-
-        # Calculate position (centered)
-        pos_x = (self.output_size[0] - device_width) // 2
-        pos_y = (self.output_size[1] - device_height) // 2
-
-        # Create full canvas with transparent frame overlay
-        overlay = Image.new('RGBA', self.output_size, (0, 0, 0, 0))
-        overlay.paste(frame_scaled, (pos_x, pos_y), frame_scaled)
-
-        # Calculate where the screen area is in the final output
-        scale_factor = device_height / frame.size[1]
-        screen_x = pos_x + int(spec.screen_offset[0] * scale_factor)
-        screen_y = pos_y + int(spec.screen_offset[1] * scale_factor)
-        screen_w = int(spec.screen_size[0] * scale_factor)
-        screen_h = int(spec.screen_size[1] * scale_factor)
-
-        return overlay, (screen_x, screen_y), (screen_w, screen_h)
+        return _build_frame_overlay(self.device, self.output_size, self.device_scale)
 
     def _composite_video(self,
                         input_video: str,
                         background_path: str,
                         frame_overlay_path: str,
                         output_path: str,
+                        frame_size: Tuple[int, int],
+                        frame_position: Tuple[int, int],
                         screen_position: Tuple[int, int],
-                        screen_size: Tuple[int, int]):
+                        screen_size: Tuple[int, int],
+                        video_size: Tuple[int, int],
+                        duration: Optional[float] = None,
+                        encode_preset: str = "veryfast",
+                        encode_crf: int = 22):
         """Use ffmpeg to composite background + video + frame overlay."""
+        if self.use_gpu:
+            cmd = self._gpu_composite_command(
+                input_video, background_path, frame_overlay_path, output_path,
+                frame_size, frame_position, screen_position, screen_size, video_size,
+                duration
+            )
+            try:
+                subprocess.run(cmd, check=True)
+                return
+            except subprocess.CalledProcessError:
+                print("GPU encode failed, falling back to libx264")
+
+        cmd = self._cpu_composite_command(
+            input_video, background_path, frame_overlay_path, output_path,
+            frame_size, frame_position, screen_position, screen_size,
+            video_size, duration, encode_preset, encode_crf
+        )
+        subprocess.run(cmd, check=True)
+
+    def _cpu_composite_command(self,
+                               input_video: str,
+                               background_path: str,
+                               frame_overlay_path: str,
+                               output_path: str,
+                               frame_size: Tuple[int, int],
+                               frame_position: Tuple[int, int],
+                               screen_position: Tuple[int, int],
+                               screen_size: Tuple[int, int],
+                               video_size: Tuple[int, int],
+                               duration: Optional[float] = None,
+                               encode_preset: str = "veryfast",
+                               encode_crf: int = 22,
+                               output_args: Optional[list] = None) -> list:
+        """
+        ffmpeg command that filters with swscale and encodes with libx264.
+
+        output_args replaces the codec and container arguments, e.g. to
+        stream raw video instead of encoding it.
+        """
         screen_x, screen_y = screen_position
         screen_w, screen_h = screen_size
+        threads = self.encode_threads
+        lookahead = min(threads, max(2, threads // 4))
 
         # Complex filter to:
         # 1. Scale input video to fit screen area
         # 2. Overlay scaled video onto background at screen position
         # 3. Overlay phone frame on top
+        # A recording already at the screen area's size overlays as-is
+        if tuple(video_size) == (screen_w, screen_h):
+            fit_video = "[1:v]null[scaled];"
+        else:
+            fit_video = (
+                f"[1:v]scale={screen_w}:{screen_h}:force_original_aspect_ratio=decrease,"
+                f"pad={screen_w}:{screen_h}:(ow-iw)/2:(oh-ih)/2:color=black@0[scaled];"
+            )
         filter_complex = (
-            f"[1:v]scale={screen_w}:{screen_h}:force_original_aspect_ratio=decrease,"
-            f"pad={screen_w}:{screen_h}:(ow-iw)/2:(oh-ih)/2:color=black@0[scaled];"
+            fit_video +
             f"[0:v][scaled]overlay={screen_x}:{screen_y}[with_video];"
-            f"[with_video][2:v]overlay=0:0[out]"
+            f"[with_video][2:v]overlay={frame_position[0]}:{frame_position[1]}[out]"
         )
 
-        cmd = [
-            "ffmpeg", "-y",
-            "-loop", "1", "-i", background_path,      # Input 0: background
+        return [
+            _FFMPEG, "-y",
+            *_still_input(background_path, self.output_size, duration),  # Input 0: background
             "-i", input_video,                         # Input 1: video
-            "-loop", "1", "-i", frame_overlay_path,   # Input 2: frame overlay
+            *_still_input(frame_overlay_path, frame_size, duration),  # Input 2: frame overlay
             "-filter_complex", filter_complex,
             "-map", "[out]",
             "-map", "1:a?",  # Keep audio if present
-            "-c:v", "libx264",
-            "-preset", "medium",
-            "-crf", "23",
-            "-c:a", "aac",
-            "-shortest",
-            "-pix_fmt", "yuv420p",
+            *([] if duration else ["-shortest"]),
+            *(output_args or [
+                "-c:v", "libx264",
+                "-preset", encode_preset,
+                "-crf", str(encode_crf),
+                "-c:a", "aac",
+                "-pix_fmt", "yuv420p",
+                # Frame threads on every core, with enough lookahead threads
+                # to keep them fed (slice threads trade compression for latency)
+                "-x264-params", f"threads={threads}:lookahead-threads={lookahead}"
+                                ":sliced-threads=0",
+                "-movflags", "+faststart",  # moov atom first, for web playback
+            ]),
             output_path
         ]
 
-        subprocess.run(cmd, check=True)
+    def _gpu_composite_command(self,
+                               input_video: str,
+                               background_path: str,
+                               frame_overlay_path: str,
+                               output_path: str,
+                               frame_size: Tuple[int, int],
+                               frame_position: Tuple[int, int],
+                               screen_position: Tuple[int, int],
+                               screen_size: Tuple[int, int],
+                               video_size: Tuple[int, int],
+                               duration: Optional[float] = None) -> list:
+        """ffmpeg command that decodes, filters and encodes on the GPU (NVDEC/CUDA/NVENC)."""
+        screen_x, screen_y = screen_position
+        screen_w, screen_h = screen_size
+
+        # There is no CUDA pad filter, so fit the video into the screen area
+        # here (even dimensions for 4:2:0) and center it with the overlay offset
+        fit = min(screen_w / video_size[0], screen_h / video_size[1])
+        video_w = int(video_size[0] * fit) // 2 * 2
+        video_h = int(video_size[1] * fit) // 2 * 2
+        video_x = screen_x + (screen_w - video_w) // 2
+        video_y = screen_y + (screen_h - video_h) // 2
+
+        # The stills are uploaded once; overlay_cuda takes an opaque yuv420p
+        # main layer and a yuva420p layer with alpha on top
+        filter_complex = (
+            f"[0:v]format=yuv420p,hwupload_cuda[bg];"
+            f"[2:v]format=yuva420p,hwupload_cuda[frame];"
+            f"[1:v]scale_cuda={video_w}:{video_h}:format=yuv420p[scaled];"
+            f"[bg][scaled]overlay_cuda={video_x}:{video_y}[with_video];"
+            f"[with_video][frame]overlay_cuda={frame_position[0]}:{frame_position[1]}[out]"
+        )
+
+        return [
+            _FFMPEG, "-y",
+            "-init_hw_device", "cuda=cu:0", "-filter_hw_device", "cu",
+            *_still_input(background_path, self.output_size, duration),  # Input 0: background
+            "-hwaccel", "cuda", "-hwaccel_output_format", "cuda",
+            "-i", input_video,                         # Input 1: video
+            *_still_input(frame_overlay_path, frame_size, duration),  # Input 2: frame overlay
+            "-filter_complex", filter_complex,
+            "-map", "[out]",
+            "-map", "1:a?",  # Keep audio if present
+            "-c:v", "h264_nvenc",
+            "-preset", "p4",
+            "-tune", "hq",
+            "-rc", "vbr",
+            "-cq", "23",
+            "-c:a", "aac",
+            *([] if duration else ["-shortest"]),
+            "-movflags", "+faststart",  # moov atom first, for web playback
+            output_path
+        ]
 
 
 def quick_video_mockup(input_video: str,
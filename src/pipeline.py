@@ -4,17 +4,44 @@ Coordinates project analysis, screenshot capture, and mockup generation.
 """
 
 from pathlib import Path
-from typing import List, Optional, Dict
+from typing import TYPE_CHECKING, List, Optional, Dict, Callable, Tuple
 from dataclasses import dataclass, field
 from datetime import datetime
+from concurrent.futures import Future, ProcessPoolExecutor
+import functools
+import hashlib
+import os
 
 from .analysis.project_analyzer import ProjectAnalyzer, ProjectInfo
-from .analysis.color_extractor import ColorExtractor
-from .capture.ios_simulator import IOSSimulatorCapture
+from .analysis.color_extractor import resolve_colors, batch_resolve_colors
 from .mockup.composer import MockupComposer
 from .github.cloner import GitHubCloner, CloneResult
 from .github.analyzer import GitHubAnalyzer, GitHubProjectInfo
 
+if TYPE_CHECKING:
+    # Imported where a capture is set up, so runs that never touch the
+    # simulator don't load its tooling
+    from .capture.ios_simulator import IOSSimulatorCapture
+
+
+# Image types picked up from screenshot directories
+_SCREENSHOT_EXTS = frozenset({'.png', '.jpg', '.jpeg'})
+
+# Repo directories searched, in order, for existing screenshots
+SCREENSHOT_DIRS = (
+    'screenshots', 'Screenshots',
+    'assets/screenshots', 'docs/screenshots',
+    'fastlane/screenshots', 'metadata/screenshots'
+)
+
+# Part of every mockup's output name. Bump MOCKUP_VERSION whenever rendering
+# changes, so reruns stop reusing mockups drawn by the old code.
+MOCKUP_VERSION = "1"
+
+# Fewer screenshots than this render in this process; a worker pool only pays
+# off once it can run two renders side by side
+PARALLEL_MIN_SCREENSHOTS = 2
+
 
 @dataclass
 class MockupOutput:
@@ -26,6 +53,154 @@ class MockupOutput:
     project_info: ProjectInfo
 
 
+def _list_screenshots(dir_path) -> List[str]:
+    """
+    Screenshot files in a directory from a single scandir pass (empty if missing).
+
+    Entries resolving to a file already listed (symlinks) are dropped, so the
+    same image isn't rendered twice.
+    """
+    try:
+        with os.scandir(dir_path) as it:
+            paths = [
+                entry.path for entry in it
+                if entry.is_file() and os.path.splitext(entry.name)[1].lower() in _SCREENSHOT_EXTS
+            ]
+    except OSError:
+        return []
+
+    seen = set()
+    screenshots = []
+    for path in paths:
+        real = os.path.normcase(os.path.realpath(path))
+        if real not in seen:
+            seen.add(real)
+            screenshots.append(path)
+    return screenshots
+
+
+@functools.lru_cache(maxsize=8)
+def _shared_composer(device: str, platform: Optional[str] = None) -> MockupComposer:
+    """
+    Composer reused by every render in this process (worker processes get
+    their own), so identical backgrounds and device sprites are rendered once
+    per run instead of once per mockup.
+    """
+    return MockupComposer(device=device, platform=platform)
+
+
+def _mockup_key(screenshot_paths: List[str],
+                background_style: str,
+                device: str,
+                colors: Optional[List[tuple]] = None) -> str:
+    """
+    Short hash of everything a mockup is rendered from (screenshot contents,
+    style, device, colors), used in its output filename so a rerun with the
+    same inputs finds the mockup it already rendered.
+    """
+    h = hashlib.blake2b(digest_size=8)
+    h.update(repr((MOCKUP_VERSION, background_style, device,
+                   [tuple(color) for color in colors or ()])).encode())
+    for path in screenshot_paths:
+        h.update(Path(path).read_bytes())
+    return h.hexdigest()
+
+
+def _render_mockup(screenshot_path: str,
+                   output_path: str,
+                   background_style: str,
+                   device: str,
+                   colors: Optional[List[tuple]]) -> Tuple[str, List[tuple]]:
+    """
+    Render and save one mockup (module-level so worker processes can pickle it).
+    An existing output_path is kept as is: output names carry a _mockup_key,
+    so it was rendered from the same inputs, and MockupComposer.save only
+    renames finished files into place, so it is complete.
+
+    Returns:
+        (output_path, colors), with colors extracted from the screenshot
+        when none were given
+    """
+    if not colors:
+        # Memoized per file version and cached on disk by content hash, so
+        # reruns on the same screenshots skip extraction
+        colors = resolve_colors(screenshot_path=screenshot_path)
+    if os.path.exists(output_path):
+        return output_path, colors
+
+    composer = _shared_composer(device)
+    mockup = composer.create_mockup(
+        screenshot_path=screenshot_path,
+        background_style=background_style,
+        custom_colors=colors if colors else None
+    )
+    composer.save(mockup, output_path)
+    return output_path, colors
+
+
+def _submit_render(executor: ProcessPoolExecutor, *task) -> Future:
+    """
+    Submit a _render_mockup task, or finish it here when its output already
+    exists, so a rerun doesn't start worker processes just to find that out.
+    """
+    if os.path.exists(task[1]):
+        future = Future()
+        future.set_result(_render_mockup(*task))
+        return future
+    return executor.submit(_render_mockup, *task)
+
+
+def _existing_outputs(paths: List[str]) -> List[bool]:
+    """
+    Which of paths already exist, answered from one listing per directory
+    instead of a stat per file (output paths share a directory).
+    """
+    listings = {}
+    existing = []
+    for path in paths:
+        parent, name = os.path.split(path)
+        if parent not in listings:
+            try:
+                listings[parent] = set(os.listdir(parent or '.'))
+            except OSError:
+                listings[parent] = set()
+        existing.append(name in listings[parent])
+    return existing
+
+
+def _render_mockups(tasks: List[tuple],
+                    alongside: Optional[Callable] = None) -> Tuple[List[Tuple[str, List[tuple]]], object]:
+    """
+    Run _render_mockup for each task, across processes when there are enough.
+
+    Args:
+        tasks: Argument tuples for _render_mockup
+        alongside: Optional callable run in this process while the workers
+            render (e.g. the multi-device mockup, which needs every screenshot)
+
+    Returns:
+        (results in task order, result of alongside)
+    """
+    # Mockups rendered by an earlier run are reused, so only count the rest
+    rendered = _existing_outputs([task[1] for task in tasks])
+    pending = rendered.count(False)
+    workers = min(pending, os.cpu_count() or 1)
+    if pending < PARALLEL_MIN_SCREENSHOTS or workers < 2:
+        results = []
+        for i, task in enumerate(tasks):
+            print(f"  Generating mockup {i + 1}/{len(tasks)}...")
+            results.append(_render_mockup(*task))
+        return results, alongside() if alongside else None
+
+    print(f"  Generating {pending} mockups in {workers} processes...")
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [None if done else executor.submit(_render_mockup, *task)
+                   for task, done in zip(tasks, rendered)]
+        extra = alongside() if alongside else None
+        return [future.result() if future else _render_mockup(*task)
+                for task, future in zip(tasks, futures)], extra
+
+
 class GitHubToSocialPipeline:
     """
     Main pipeline for generating social media content from GitHub projects.
@@ -53,11 +228,14 @@ class GitHubToSocialPipeline:
             project_path=str(self.project_path) if self.project_path else None,
             github_repo=github_repo
         )
-        self.composer = MockupComposer(device=device)
+        # Shared with in-process renders, so the multi-device mockup can reuse
+        # a background they already rendered
+        self.composer = _shared_composer(device)
         
         # iOS capture (only if local project)
         self.ios_capture = None
         if self.project_path:
+            from .capture.ios_simulator import IOSSimulatorCapture
             self.ios_capture = IOSSimulatorCapture(
                 project_path=str(self.project_path),
                 output_dir=str(self.output_dir / "screenshots")
@@ -87,122 +265,140 @@ class GitHubToSocialPipeline:
         print(f"  Name: {project_info.name}")
         print(f"  Language: {project_info.language}")
         
-        # 2. Get screenshots
-        screenshots = self._get_screenshots(
-            project_info,
-            capture_new=capture_screenshots,
-            count=screenshot_count
-        )
-        
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+
+        def task(i: int, screenshot_path: str, colors: List[tuple] = None) -> tuple:
+            colors = colors or project_info.colors
+            key = _mockup_key([screenshot_path], background_style, self.device, colors)
+            output_filename = f"mockup_{project_info.name}_{i + 1}_{key}.png"
+            return (
+                screenshot_path, str(self.output_dir / output_filename),
+                background_style, self.device, colors
+            )
+
+        def multi(screenshots: List[str]) -> Optional[Callable]:
+            """The multi-device mockup's render, if there are multiple screenshots."""
+            if len(screenshots) < 2:
+                return None
+
+            def render_multi():
+                print("Generating multi-device mockup...")
+                return self._generate_multi_mockup(
+                    screenshots[:3],  # Use up to 3
+                    project_info,
+                    background_style
+                )
+            return render_multi
+
+        # 2. Get screenshots, and 3. generate mockups for each, with the
+        # multi-device mockup rendered in this process while the workers
+        # render the single mockups
+        screenshots = self._get_existing_screenshots(project_info, screenshot_count)
+        results = []
+        multi_output = None
+        if screenshots:
+            print(f"Found {len(screenshots)} screenshots")
+            palettes = [None] * len(screenshots)
+            if not project_info.colors:
+                # Extract every screenshot's palette up front, decoding in
+                # threads and writing the palette cache once, instead of
+                # once per render
+                print("Extracting colors...")
+                palettes = batch_resolve_colors(screenshots)
+            tasks = [task(i, path, colors)
+                     for i, (path, colors) in enumerate(zip(screenshots, palettes))]
+            results, multi_output = _render_mockups(tasks, multi(screenshots))
+        elif capture_screenshots:
+            # Newly captured screenshots start rendering as soon as each one
+            # lands, overlapping the capture delay (workers only start on
+            # first submit)
+            workers = max(1, min(screenshot_count, os.cpu_count() or 1))
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                renders = []
+
+                def render(screenshot_path: str):
+                    renders.append((screenshot_path, _submit_render(
+                        executor, *task(len(renders), screenshot_path)
+                    )))
+
+                captured = self._capture_new_screenshots(
+                    project_info,
+                    screenshot_count,
+                    on_capture=render
+                )
+                if captured:
+                    print(f"Found {len(captured)} screenshots")
+                    render_multi = multi(captured)
+                    multi_output = render_multi() if render_multi else None
+                for i, (_, future) in enumerate(renders):
+                    results.append(future.result())
+                    print(f"  Generated mockup {i + 1}/{len(renders)}")
+                screenshots = [screenshot_path for screenshot_path, _ in renders]
+
         if not screenshots:
             print("No screenshots available. Please provide screenshots or enable capture.")
             return outputs
-        
-        print(f"Found {len(screenshots)} screenshots")
-        
-        # 3. Generate mockups for each screenshot
-        self.output_dir.mkdir(parents=True, exist_ok=True)
-        
-        for i, screenshot_path in enumerate(screenshots):
-            print(f"Generating mockup {i + 1}/{len(screenshots)}...")
-            
-            output = self._generate_single_mockup(
+
+        for screenshot_path, (output_path, colors) in zip(screenshots, results):
+            outputs.append(MockupOutput(
+                mockup_path=output_path,
                 screenshot_path=screenshot_path,
-                project_info=project_info,
                 background_style=background_style,
-                index=i
-            )
-            outputs.append(output)
-        
-        # 4. Generate multi-device mockup if multiple screenshots
-        if len(screenshots) >= 2:
-            print("Generating multi-device mockup...")
-            multi_output = self._generate_multi_mockup(
-                screenshots[:3],  # Use up to 3
-                project_info,
-                background_style
-            )
+                colors_used=colors,
+                project_info=project_info
+            ))
+        if multi_output:
             outputs.append(multi_output)
         
         print(f"\nGenerated {len(outputs)} mockups in {self.output_dir}")
         return outputs
     
-    def _get_screenshots(self,
-                        project_info: ProjectInfo,
-                        capture_new: bool,
-                        count: int) -> List[str]:
-        """Get screenshots - either existing or newly captured."""
-        screenshots = []
-        
-        # Check for existing screenshots
+    def _get_existing_screenshots(self,
+                                  project_info: ProjectInfo,
+                                  count: int) -> List[str]:
+        """Get the project's existing screenshots, up to count."""
         if project_info.has_existing_screenshots and project_info.screenshots_path:
-            screenshot_dir = Path(project_info.screenshots_path)
-            for ext in ['*.png', '*.jpg', '*.jpeg']:
-                screenshots.extend([str(p) for p in screenshot_dir.glob(ext)])
-        
-        # If no existing screenshots and capture is enabled
-        if not screenshots and capture_new:
-            if project_info.type == 'ios' and self.ios_capture:
-                try:
-                    print("Capturing screenshots from iOS Simulator...")
-                    screenshots = self.ios_capture.full_capture_flow(
-                        screenshot_count=count
-                    )
-                except Exception as e:
-                    print(f"Failed to capture screenshots: {e}")
-        
+            return _list_screenshots(project_info.screenshots_path)[:count]
+        return []
+
+    def _capture_new_screenshots(self,
+                                 project_info: ProjectInfo,
+                                 count: int,
+                                 on_capture: Callable[[str], None] = None) -> List[str]:
+        """
+        Capture new screenshots from the iOS Simulator (iOS projects only).
+
+        on_capture is called with each screenshot as soon as it is saved.
+        """
+        screenshots = []
+        if project_info.type == 'ios' and self.ios_capture:
+            try:
+                print("Capturing screenshots from iOS Simulator...")
+                screenshots = self.ios_capture.full_capture_flow(
+                    screenshot_count=count,
+                    on_capture=on_capture
+                )
+            except Exception as e:
+                print(f"Failed to capture screenshots: {e}")
+
         return screenshots[:count]  # Limit to requested count
-    
-    def _generate_single_mockup(self,
-                               screenshot_path: str,
-                               project_info: ProjectInfo,
-                               background_style: str,
-                               index: int) -> MockupOutput:
-        """Generate a single mockup from a screenshot."""
-        # Extract colors if not in project info
-        colors = project_info.colors
-        if not colors:
-            extractor = ColorExtractor(image_path=screenshot_path)
-            colors = extractor.get_complementary_colors()
-        
-        # Generate mockup
-        mockup = self.composer.create_mockup(
-            screenshot_path=screenshot_path,
-            background_style=background_style,
-            custom_colors=colors if colors else None
-        )
-        
-        # Save mockup
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        output_filename = f"mockup_{project_info.name}_{index + 1}_{timestamp}.png"
-        output_path = self.output_dir / output_filename
-        
-        self.composer.save(mockup, str(output_path))
-        
-        return MockupOutput(
-            mockup_path=str(output_path),
-            screenshot_path=screenshot_path,
-            background_style=background_style,
-            colors_used=colors,
-            project_info=project_info
-        )
-    
+
     def _generate_multi_mockup(self,
                               screenshots: List[str],
                               project_info: ProjectInfo,
                               background_style: str) -> MockupOutput:
-        """Generate a multi-device mockup."""
-        mockup = self.composer.create_multi_device_mockup(
-            screenshots=screenshots,
-            background_style=background_style,
-            layout="stacked"
-        )
-        
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        output_filename = f"mockup_{project_info.name}_multi_{timestamp}.png"
+        """Generate a multi-device mockup, reusing one rendered from the same inputs."""
+        key = _mockup_key(screenshots, background_style, self.device)
+        output_filename = f"mockup_{project_info.name}_multi_{key}.png"
         output_path = self.output_dir / output_filename
-        
-        self.composer.save(mockup, str(output_path))
+
+        if not output_path.exists():
+            mockup = self.composer.create_multi_device_mockup(
+                screenshots=screenshots,
+                background_style=background_style,
+                layout="stacked"
+            )
+            self.composer.save(mockup, str(output_path))
         
         return MockupOutput(
             mockup_path=str(output_path),
@@ -259,7 +455,7 @@ def quick_mockup(screenshot_path: str,
     Returns:
         Path to the generated mockup
     """
-    composer = MockupComposer(device=device, platform=platform)
+    composer = _shared_composer(device, platform)
     mockup = composer.create_mockup(
         screenshot_path=screenshot_path,
         background_style=background_style,
@@ -302,12 +498,14 @@ class GitHubMockupPipeline:
 
         # Initialize components
         self.cloner = GitHubCloner(workspace_dir=str(self.workspace_dir))
-        self.composer = MockupComposer(device=device)
+        # Shared with in-process renders, so the multi-device mockup can reuse
+        # a background they already rendered
+        self.composer = _shared_composer(device)
 
         # Will be set after cloning
         self.local_path: Optional[Path] = None
         self.project_info: Optional[GitHubProjectInfo] = None
-        self.ios_capture: Optional[IOSSimulatorCapture] = None
+        self.ios_capture: Optional['IOSSimulatorCapture'] = None
 
     def run(self,
             background_style: str = "flowing",
@@ -350,7 +548,16 @@ class GitHubMockupPipeline:
             print("Step 2: Analyzing project...")
             print(f"{'='*60}")
 
-            analyzer = GitHubAnalyzer.from_local(str(self.local_path))
+            # The clone's origin is the URL just parsed, so read owner/repo
+            # from it instead of asking git (SSH URLs still go through git)
+            try:
+                repo_url, _ = self.cloner._parse_repo(self.github_url)
+                analyzer = GitHubAnalyzer.from_url(repo_url or "")
+            except ValueError:
+                analyzer = GitHubAnalyzer.from_local(str(self.local_path))
+
+            # Cached on disk by HEAD commit, so a rerun on an unchanged clone
+            # skips the analysis
             self.project_info = analyzer.analyze_local(str(self.local_path))
 
             print(f"  Name: {self.project_info.name}")
@@ -362,47 +569,70 @@ class GitHubMockupPipeline:
             if self.project_info.description:
                 print(f"  Description: {self.project_info.description[:100]}...")
 
-            # Step 3: Capture screenshots
-            print(f"\n{'='*60}")
-            print("Step 3: Capturing screenshots...")
-            print(f"{'='*60}")
-
-            screenshots = self._capture_screenshots(
-                scheme=scheme,
-                simulator_device=simulator_device,
-                count=screenshot_count
-            )
-
-            if not screenshots:
-                print("No screenshots captured. Cannot generate mockups.")
-                return outputs
-
-            print(f"Captured {len(screenshots)} screenshots")
-
-            # Step 4: Generate mockups
-            print(f"\n{'='*60}")
-            print("Step 4: Generating mockups...")
-            print(f"{'='*60}")
-
+            # Use brand colors if available
+            colors = self.project_info.brand_colors if self.project_info else None
+            name = self.project_info.name if self.project_info else "project"
             self.output_dir.mkdir(parents=True, exist_ok=True)
 
-            for i, screenshot_path in enumerate(screenshots):
-                print(f"  Generating mockup {i + 1}/{len(screenshots)}...")
-                output = self._generate_mockup(
-                    screenshot_path=screenshot_path,
-                    background_style=background_style,
-                    index=i
+            # Each screenshot starts rendering as soon as it has been captured,
+            # overlapping the capture delay; even one worker process does that
+            workers = max(1, min(screenshot_count, os.cpu_count() or 1))
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                renders = []
+
+                def render(screenshot_path: str):
+                    key = _mockup_key([screenshot_path], background_style, self.device, colors)
+                    output_filename = f"mockup_{name}_{len(renders) + 1}_{key}.png"
+                    renders.append((screenshot_path, _submit_render(
+                        executor, screenshot_path, str(self.output_dir / output_filename),
+                        background_style, self.device, colors
+                    )))
+
+                # Step 3: Capture screenshots
+                print(f"\n{'='*60}")
+                print("Step 3: Capturing screenshots...")
+                print(f"{'='*60}")
+
+                screenshots = self._capture_screenshots(
+                    scheme=scheme,
+                    simulator_device=simulator_device,
+                    count=screenshot_count,
+                    on_capture=render
                 )
-                outputs.append(output)
 
-            # Generate multi-device mockup if we have multiple screenshots
-            if len(screenshots) >= 2:
-                print("  Generating multi-device mockup...")
-                multi_output = self._generate_multi_mockup(
-                    screenshots[:3],
-                    background_style
-                )
-                outputs.append(multi_output)
+                if not screenshots:
+                    print("No screenshots captured. Cannot generate mockups.")
+                    return outputs
+
+                print(f"Captured {len(screenshots)} screenshots")
+
+                # Step 4: Generate mockups
+                print(f"\n{'='*60}")
+                print("Step 4: Generating mockups...")
+                print(f"{'='*60}")
+
+                # Generate multi-device mockup if we have multiple screenshots,
+                # in this process while the workers finish the single mockups
+                multi_output = None
+                if len(screenshots) >= 2:
+                    print("  Generating multi-device mockup...")
+                    multi_output = self._generate_multi_mockup(
+                        screenshots[:3],
+                        background_style
+                    )
+
+                for i, (screenshot_path, future) in enumerate(renders):
+                    output_path, colors_used = future.result()
+                    print(f"  Generated mockup {i + 1}/{len(renders)}")
+                    outputs.append(MockupOutput(
+                        mockup_path=output_path,
+                        screenshot_path=screenshot_path,
+                        background_style=background_style,
+                        colors_used=colors_used,
+                        project_info=self._output_project_info(colors_used)
+                    ))
+                if multi_output:
+                    outputs.append(multi_output)
 
             print(f"\n{'='*60}")
             print(f"Complete! Generated {len(outputs)} mockups")
@@ -419,14 +649,23 @@ class GitHubMockupPipeline:
     def _capture_screenshots(self,
                             scheme: str = None,
                             simulator_device: str = "iPhone 17 Pro Max",
-                            count: int = 3) -> List[str]:
-        """Capture screenshots from the project."""
+                            count: int = 3,
+                            on_capture: Callable[[str], None] = None) -> List[str]:
+        """
+        Capture screenshots from the project.
+
+        on_capture is called with each screenshot path as soon as it is
+        available (existing screenshots are all available at once).
+        """
         screenshots = []
 
         # Check for existing screenshots first
         existing = self._find_existing_screenshots()
         if existing:
             print(f"Found {len(existing)} existing screenshots in repo")
+            if on_capture:
+                for path in existing[:count]:
+                    on_capture(path)
             return existing[:count]
 
         # Try iOS capture if it's an iOS project
@@ -435,6 +674,7 @@ class GitHubMockupPipeline:
 
             print(f"iOS project detected at: {ios_path}")
 
+            from .capture.ios_simulator import IOSSimulatorCapture
             self.ios_capture = IOSSimulatorCapture(
                 project_path=ios_path,
                 device_name=simulator_device,
@@ -444,7 +684,8 @@ class GitHubMockupPipeline:
             try:
                 screenshots = self.ios_capture.full_capture_flow(
                     scheme=scheme,
-                    screenshot_count=count
+                    screenshot_count=count,
+                    on_capture=on_capture
                 )
             except Exception as e:
                 print(f"iOS capture failed: {e}")
@@ -464,51 +705,26 @@ class GitHubMockupPipeline:
         if not self.local_path:
             return []
 
-        screenshot_dirs = [
-            'screenshots', 'Screenshots',
-            'assets/screenshots', 'docs/screenshots',
-            'fastlane/screenshots', 'metadata/screenshots'
-        ]
-
-        for dir_name in screenshot_dirs:
-            dir_path = self.local_path / dir_name
-            if dir_path.exists():
-                screenshots = []
-                for ext in ['*.png', '*.jpg', '*.jpeg']:
-                    screenshots.extend([str(p) for p in dir_path.glob(ext)])
-                if screenshots:
-                    return screenshots
-
-        return []
-
-    def _generate_mockup(self,
-                        screenshot_path: str,
-                        background_style: str,
-                        index: int) -> MockupOutput:
-        """Generate a single mockup."""
-        # Use brand colors if available
-        colors = self.project_info.brand_colors if self.project_info else None
-
-        if not colors:
-            extractor = ColorExtractor(image_path=screenshot_path)
-            colors = extractor.get_complementary_colors()
-
-        mockup = self.composer.create_mockup(
-            screenshot_path=screenshot_path,
-            background_style=background_style,
-            custom_colors=colors if colors else None
-        )
+        # One listing of the repo root rules out most candidates without a
+        # failed open each
+        try:
+            top_level = set(os.listdir(self.local_path))
+        except OSError:
+            return []
 
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        name = self.project_info.name if self.project_info else "project"
-        output_filename = f"mockup_{name}_{index + 1}_{timestamp}.png"
-        output_path = self.output_dir / output_filename
+        for dir_name in SCREENSHOT_DIRS:
+            if dir_name.split('/', 1)[0] not in top_level:
+                continue
+            screenshots = _list_screenshots(self.local_path / dir_name)
+            if screenshots:
+                return screenshots
 
-        self.composer.save(mockup, str(output_path))
+        return []
 
-        # Create a minimal ProjectInfo for compatibility
-        project_info = ProjectInfo(
-            name=name,
+    def _output_project_info(self, colors: List[tuple]) -> ProjectInfo:
+        """Create a minimal ProjectInfo for compatibility."""
+        return ProjectInfo(
+            name=self.project_info.name if self.project_info else "project",
             type=self.project_info.project_type if self.project_info else "unknown",
             language=self.project_info.language if self.project_info else "unknown",
             description=self.project_info.description if self.project_info else None,
@@ -519,51 +735,31 @@ class GitHubMockupPipeline:
             recent_changes=[]
         )
 
-        return MockupOutput(
-            mockup_path=str(output_path),
-            screenshot_path=screenshot_path,
-            background_style=background_style,
-            colors_used=colors,
-            project_info=project_info
-        )
-
     def _generate_multi_mockup(self,
                               screenshots: List[str],
                               background_style: str) -> MockupOutput:
-        """Generate a multi-device mockup."""
-        mockup = self.composer.create_multi_device_mockup(
-            screenshots=screenshots,
-            background_style=background_style,
-            layout="stacked"
-        )
-
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        """Generate a multi-device mockup, reusing one rendered from the same inputs."""
+        key = _mockup_key(screenshots, background_style, self.device)
         name = self.project_info.name if self.project_info else "project"
-        output_filename = f"mockup_{name}_multi_{timestamp}.png"
+        output_filename = f"mockup_{name}_multi_{key}.png"
         output_path = self.output_dir / output_filename
 
-        self.composer.save(mockup, str(output_path))
+        if not output_path.exists():
+            mockup = self.composer.create_multi_device_mockup(
+                screenshots=screenshots,
+                background_style=background_style,
+                layout="stacked"
+            )
+            self.composer.save(mockup, str(output_path))
 
         colors = self.project_info.brand_colors if self.project_info else []
 
-        project_info = ProjectInfo(
-            name=name,
-            type=self.project_info.project_type if self.project_info else "unknown",
-            language=self.project_info.language if self.project_info else "unknown",
-            description=self.project_info.description if self.project_info else None,
-            colors=colors,
-            screenshots_path=None,
-            has_existing_screenshots=False,
-            key_features=[],
-            recent_changes=[]
-        )
-
         return MockupOutput(
             mockup_path=str(output_path),
             screenshot_path=screenshots[0],
             background_style=background_style,
             colors_used=colors,
-            project_info=project_info
+            project_info=self._output_project_info(colors)
         )
 
 
@@ -0,0 +1,26 @@
+"""Tests for background generation (run with `python -m pytest` from the repo root)."""
+
+import random
+
+from src.mockup.background import BackgroundGenerator
+
+
+COLORS = [(200, 50, 50), (50, 50, 200), (50, 200, 50)]
+
+
+def test_generate_leaves_global_random_state_alone():
+    generator = BackgroundGenerator(width=300, height=400)
+    random.seed(1234)
+    state = random.getstate()
+
+    for style in ("aurora", "glass", "mesh", "flowing"):
+        generator.generate(COLORS, style)
+
+    assert random.getstate() == state
+
+
+def test_generate_is_repeatable():
+    first = BackgroundGenerator(width=300, height=400).generate(COLORS, "glass")
+    second = BackgroundGenerator(width=300, height=400).generate(COLORS, "glass")
+
+    assert first.tobytes() == second.tobytes()
@@ -0,0 +1,60 @@
+"""Tests for palette extraction (run with `python -m pytest` from the repo root)."""
+
+import json
+
+from PIL import Image, ImageDraw
+
+from src.analysis import color_extractor
+from src.analysis.color_extractor import ColorExtractor
+
+
+def test_near_white_pixels_are_skipped():
+    # Light-mode screen: mostly white, with a blue header bar
+    img = Image.new('RGB', (300, 600), (255, 255, 255))
+    ImageDraw.Draw(img).rectangle([0, 0, 300, 80], fill=(4, 124, 252))
+
+    assert ColorExtractor(image=img).get_dominant_color() == (4, 124, 252)
+
+
+def test_transparent_pixels_are_skipped():
+    # Icon with transparent (black, alpha 0) corners
+    icon = Image.new('RGBA', (200, 200), (0, 0, 0, 0))
+    ImageDraw.Draw(icon).ellipse([10, 10, 190, 190], fill=(252, 92, 44, 255))
+
+    assert ColorExtractor(image=icon).get_palette(4) == [(252, 92, 44)]
+
+
+def test_all_white_image_falls_back_to_every_pixel():
+    img = Image.new('RGB', (50, 50), (255, 255, 255))
+
+    assert ColorExtractor(image=img).get_dominant_color() == (255, 255, 255)
+
+
+def _use_cache_file(monkeypatch, path):
+    """Point the palette cache at path, as a process that hasn't loaded it yet."""
+    monkeypatch.setattr(color_extractor, "PALETTE_CACHE_PATH", path)
+    monkeypatch.setattr(color_extractor, "_palette_cache", None)
+    monkeypatch.setattr(color_extractor, "_palette_cache_new", {})
+
+
+def test_flush_keeps_palettes_other_processes_stored(tmp_path, monkeypatch):
+    path = tmp_path / "palettes.json"
+    _use_cache_file(monkeypatch, path)
+    color_extractor._load_palette_cache()
+
+    # Another worker stores a palette after this process loaded the cache
+    path.write_text(json.dumps({"other": [[1, 2, 3]]}))
+    color_extractor._palette_cache_put("ours", [(4, 5, 6)])
+
+    assert json.loads(path.read_text()) == {"other": [[1, 2, 3]], "ours": [[4, 5, 6]]}
+
+
+def test_flush_keeps_only_the_newest_entries(tmp_path, monkeypatch):
+    path = tmp_path / "palettes.json"
+    _use_cache_file(monkeypatch, path)
+    monkeypatch.setattr(color_extractor, "PALETTE_CACHE_MAX_ENTRIES", 2)
+
+    for i in range(3):
+        color_extractor._palette_cache_put(f"key{i}", [(i, i, i)])
+
+    assert list(json.loads(path.read_text())) == ["key1", "key2"]
@@ -0,0 +1,26 @@
+"""Tests for mockup composition (run with `python -m pytest` from the repo root)."""
+
+import os
+
+import pytest
+from PIL import Image
+
+from src.mockup.composer import MockupComposer
+
+
+def test_save_writes_complete_file_and_no_temp(tmp_path):
+    output = tmp_path / "mockup.png"
+    MockupComposer().save(Image.new('RGBA', (40, 30), (10, 20, 30, 255)), str(output))
+
+    assert os.listdir(tmp_path) == ["mockup.png"]
+    with Image.open(output) as saved:
+        assert saved.size == (40, 30)
+
+
+def test_failed_save_leaves_nothing_at_output_path(tmp_path):
+    output = tmp_path / "mockup.bmp"
+    with pytest.raises(OSError):
+        # BMP can't store LA, so the encoder fails partway through the save
+        MockupComposer().save(Image.new('LA', (40, 30)), str(output), format="BMP")
+
+    assert os.listdir(tmp_path) == []